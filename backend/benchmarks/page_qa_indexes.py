@@ -0,0 +1,209 @@
+"""
+Benchmark page review and QA review list queries, checking with explain
+that each supported sort / filter combination is answered from an index
+without an in-memory sort.
+
+Run from the backend directory against a scratch mongo, eg.:
+
+    MONGO_DB_URL=mongodb://localhost:27017 python -m benchmarks.page_qa_indexes
+
+A separate database is created for the benchmark and dropped afterwards.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import motor.motor_asyncio
+
+from btrixcloud.models import PageQACompare
+from btrixcloud.pages import PageOps, get_page_qa_update
+
+
+DB_NAME = "btrix_bench_page_qa_indexes"
+
+CRAWL_ID = "bench-crawl"
+QA_RUN_ID = "bench-qa-run"
+
+NUM_PAGES = int(os.environ.get("BENCH_NUM_PAGES") or 20_000)
+NUM_OTHER_CRAWLS = int(os.environ.get("BENCH_NUM_OTHER_CRAWLS") or 4)
+PAGE_SIZE = 25
+
+CASES: List[Tuple[str, Dict[str, Any]]] = [
+    ("pages: default", {}),
+    ("pages: sort url", {"sort_by": "url", "sort_direction": 1}),
+    ("pages: sort title", {"sort_by": "title", "sort_direction": -1}),
+    ("pages: sort approved", {"sort_by": "approved", "sort_direction": -1}),
+    ("qa: default", {"qa_run_id": QA_RUN_ID}),
+    (
+        "qa: sort screenshotMatch",
+        {"qa_run_id": QA_RUN_ID, "sort_by": "screenshotMatch", "sort_direction": 1},
+    ),
+    (
+        "qa: sort textMatch",
+        {"qa_run_id": QA_RUN_ID, "sort_by": "textMatch", "sort_direction": -1},
+    ),
+    (
+        "qa: filter + sort screenshotMatch",
+        {
+            "qa_run_id": QA_RUN_ID,
+            "qa_filter_by": "screenshotMatch",
+            "qa_gte": 0.5,
+            "qa_lt": 0.9,
+            "sort_by": "screenshotMatch",
+            "sort_direction": 1,
+        },
+    ),
+    (
+        "qa: sort url",
+        {"qa_run_id": QA_RUN_ID, "sort_by": "url", "sort_direction": 1},
+    ),
+    (
+        "qa: sort approved",
+        {"qa_run_id": QA_RUN_ID, "sort_by": "approved", "sort_direction": -1},
+    ),
+    (
+        "qa: sort notes",
+        {"qa_run_id": QA_RUN_ID, "sort_by": "notes", "sort_direction": -1},
+    ),
+]
+
+
+# ============================================================================
+def get_stages(explain: Any) -> List[str]:
+    """return all plan stage names in explain output"""
+    stages = []
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "stage" and isinstance(value, str):
+                stages.append(value)
+            else:
+                stages.extend(get_stages(value))
+    elif isinstance(explain, list):
+        for value in explain:
+            stages.extend(get_stages(value))
+
+    return stages
+
+
+def get_execution_stats(explain: Any) -> Optional[Dict[str, Any]]:
+    """return first executionStats found in explain output"""
+    if isinstance(explain, dict):
+        if "executionStats" in explain:
+            return explain["executionStats"]
+        values = list(explain.values())
+    elif isinstance(explain, list):
+        values = explain
+    else:
+        return None
+
+    for value in values:
+        stats = get_execution_stats(value)
+        if stats:
+            return stats
+
+    return None
+
+
+# ============================================================================
+async def seed(ops: PageOps):
+    """add pages and QA run entries for benchmark crawl and other crawls"""
+    oid = uuid4()
+    for crawl_id in [CRAWL_ID] + [f"other-{i}" for i in range(NUM_OTHER_CRAWLS)]:
+        pages = []
+        qa_updates = []
+        for i in range(NUM_PAGES):
+            page = {
+                "_id": uuid4(),
+                "oid": oid,
+                "crawl_id": crawl_id,
+                "url": f"https://example.com/{random.randrange(NUM_PAGES)}/{i}",
+                "title": f"Page {random.randrange(NUM_PAGES)}",
+                "isFile": False,
+                "isError": False,
+            }
+            if i % 10 == 0:
+                page["approved"] = random.choice((True, False))
+            if i % 20 == 0:
+                page["notes"] = [{"id": uuid4(), "text": "note"}]
+
+            pages.append(page)
+            compare = PageQACompare(
+                screenshotMatch=random.random(),
+                textMatch=random.random(),
+                resourceCounts={},
+            )
+            qa_updates.append(get_page_qa_update(page, f"{QA_RUN_ID}", compare))
+
+        await ops.pages.insert_many(pages)
+        if crawl_id == CRAWL_ID:
+            await ops.page_qa.bulk_write(qa_updates, ordered=False)
+
+
+async def run_case(mdb, ops: PageOps, name: str, kwargs: Dict[str, Any]) -> bool:
+    """explain and time one list query, return true if index-only sorted"""
+    # pylint: disable=protected-access
+    query, sort = ops._get_list_pages_query(CRAWL_ID, **kwargs)
+    coll = ops.page_qa if kwargs.get("qa_run_id") else ops.pages
+
+    # same stages paginate_aggregate uses for first page with a next token
+    sort = dict(sort or {})
+    sort.setdefault("_id", next(iter(sort.values()), 1))
+    pipeline = [{"$match": query}, {"$sort": sort}, {"$limit": PAGE_SIZE + 1}]
+
+    explain = await mdb.command(
+        {
+            "explain": {"aggregate": coll.name, "pipeline": pipeline, "cursor": {}},
+            "verbosity": "executionStats",
+        }
+    )
+
+    stages = get_stages(explain)
+    stats = get_execution_stats(explain) or {}
+    uses_index = "IXSCAN" in stages and "SORT" not in stages
+
+    start = time.monotonic()
+    await ops.list_pages(
+        CRAWL_ID, page_size=PAGE_SIZE, next_token="", include_total=False, **kwargs
+    )
+    elapsed = (time.monotonic() - start) * 1000
+
+    print(
+        f"{'OK  ' if uses_index else 'FAIL'} {name:36} "
+        + f"keys: {stats.get('totalKeysExamined', '-'):>6} "
+        + f"docs: {stats.get('totalDocsExamined', '-'):>6} "
+        + f"list: {elapsed:7.1f} ms  stages: {','.join(stages)}",
+        flush=True,
+    )
+    return uses_index
+
+
+async def main() -> int:
+    """run benchmark, return exit code"""
+    client = motor.motor_asyncio.AsyncIOMotorClient(
+        os.environ.get("MONGO_DB_URL") or "mongodb://localhost:27017",
+        uuidRepresentation="standard",
+    )
+    await client.drop_database(DB_NAME)
+    mdb = client[DB_NAME]
+
+    ops = PageOps(mdb, None, None, None)
+
+    try:
+        await ops.init_index()
+        await seed(ops)
+        print(f"{NUM_PAGES} pages per crawl, {NUM_OTHER_CRAWLS + 1} crawls", flush=True)
+
+        results = [await run_case(mdb, ops, name, kwargs) for name, kwargs in CASES]
+    finally:
+        await client.drop_database(DB_NAME)
+
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,13 +1,24 @@
 """k8s background jobs"""
 
 import asyncio
-from datetime import datetime
-from typing import Optional, Tuple, Union, List, Dict, TYPE_CHECKING, cast
+import os
+import secrets
+from datetime import datetime, timedelta
+from typing import (
+    Awaitable,
+    Optional,
+    Tuple,
+    Union,
+    List,
+    Dict,
+    TYPE_CHECKING,
+    cast,
+)
 from uuid import UUID
 
 from urllib.parse import urlsplit
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from .storages import StorageOps
 from .crawlmanager import CrawlManager
@@ -19,23 +30,57 @@ from .models import (
     BgJobType,
     CreateReplicaJob,
     DeleteReplicaJob,
+    ReAddPagesJob,
+    DeleteCrawlsJob,
     PaginatedResponse,
     AnyJob,
     StorageRef,
     User,
 )
-from .pagination import DEFAULT_PAGE_SIZE, paginated_format
+from .pagination import DEFAULT_PAGE_SIZE, paginate_aggregate, paginated_format
 
 if TYPE_CHECKING:
     from .orgs import OrgOps
     from .basecrawls import BaseCrawlOps
     from .profiles import ProfileOps
+    from .pages import PageOps
 else:
-    OrgOps = CrawlManager = BaseCrawlOps = ProfileOps = object
+    OrgOps = CrawlManager = BaseCrawlOps = ProfileOps = PageOps = object
+
+
+# max number of crawls to re-add pages for at once in a single job
+DEFAULT_READD_PAGES_CONCURRENCY = 2
+
+# number of crawls deleted together, with progress saved after each batch
+DELETE_CRAWLS_JOB_BATCH_SIZE = 100
+
+# how often heartbeat of running in-process job attempt is updated
+JOB_HEARTBEAT_INTERVAL = 60
+
+# running in-process job attempt with no heartbeat for this long is
+# considered interrupted, eg. by pod restart, and is resumed
+JOB_STALE_SECS = 300
+
+# job types run as tasks in the backend, rather than as k8s jobs
+IN_PROCESS_JOB_TYPES = [BgJobType.READD_PAGES, BgJobType.DELETE_CRAWLS]
+
+
+# ============================================================================
+def get_job_remaining_crawl_ids(
+    job: Union[ReAddPagesJob, DeleteCrawlsJob]
+) -> List[str]:
+    """return crawls of job not yet completed, either failed or never
+    attempted, eg. if attempt was interrupted"""
+    completed = set(job.completed_crawl_ids)
+
+    # older jobs did not store full list of crawls
+    crawl_ids = job.crawl_ids or job.failed_crawl_ids
+
+    return [crawl_id for crawl_id in crawl_ids if crawl_id not in completed]
 
 
 # ============================================================================
-# pylint: disable=too-many-instance-attributes
+# pylint: disable=too-many-instance-attributes, too-many-public-methods
 class BackgroundJobOps:
     """k8s background job management"""
 
@@ -45,6 +90,7 @@ class BackgroundJobOps:
 
     base_crawl_ops: BaseCrawlOps
     profile_ops: ProfileOps
+    page_ops: PageOps
 
     # pylint: disable=too-many-locals, too-many-arguments, invalid-name
 
@@ -60,6 +106,13 @@ class BackgroundJobOps:
 
         self.base_crawl_ops = cast(BaseCrawlOps, None)
         self.profile_ops = cast(ProfileOps, None)
+        self.page_ops = cast(PageOps, None)
+
+        self.readd_pages_concurrency = int(
+            os.environ.get("READD_PAGES_CONCURRENCY") or DEFAULT_READD_PAGES_CONCURRENCY
+        )
+
+        self.bg_tasks: set[asyncio.Task] = set()
 
         self.router = APIRouter(
             prefix="/jobs",
@@ -72,6 +125,10 @@ class BackgroundJobOps:
         self.base_crawl_ops = base_crawl_ops
         self.profile_ops = profile_ops
 
+    def set_page_ops(self, page_ops: PageOps) -> None:
+        """set page ops, for re-adding pages"""
+        self.page_ops = page_ops
+
     def strip_bucket(self, endpoint_url: str) -> tuple[str, str]:
         """split the endpoint_url into the origin and return rest of endpoint as bucket path"""
         parts = urlsplit(endpoint_url)
@@ -268,6 +325,271 @@ class BackgroundJobOps:
                 status_code=400, detail=f"Error starting background job: {exc}"
             )
 
+    async def create_re_add_pages_job(
+        self, oid: UUID, crawl_id: Optional[str] = None
+    ) -> str:
+        """Create job to re-add pages from WACZs for one crawl, or for all
+        finished crawls in org, running in the background"""
+        job_type = BgJobType.READD_PAGES.value
+
+        if crawl_id:
+            crawl_ids = [crawl_id]
+        else:
+            crawl_ids = await self.page_ops.get_finished_crawl_ids(oid)
+
+        now = datetime.now()
+
+        job = ReAddPagesJob(
+            id=f"{job_type}-{secrets.token_hex(5)}",
+            oid=oid,
+            started=now,
+            crawl_id=crawl_id,
+            crawl_ids=crawl_ids,
+            crawls_total=len(crawl_ids),
+            heartbeat=now,
+        )
+
+        await self.jobs.insert_one(job.to_dict())
+
+        self._run_job_task(job.id, oid, self.re_add_pages(job.id, oid, crawl_ids))
+
+        return job.id
+
+    def _run_job_task(self, job_id: str, oid: UUID, coro: Awaitable[None]):
+        """run in-process job attempt in background task, keeping reference
+        to task, and updating job heartbeat while attempt is running"""
+
+        async def run_with_heartbeat():
+            heartbeat = asyncio.create_task(self._update_job_heartbeat(job_id, oid))
+            try:
+                await coro
+            finally:
+                heartbeat.cancel()
+
+        task = asyncio.create_task(run_with_heartbeat())
+        self.bg_tasks.add(task)
+        task.add_done_callback(self.bg_tasks.discard)
+
+    async def _update_job_heartbeat(self, job_id: str, oid: UUID):
+        while True:
+            await self.jobs.find_one_and_update(
+                {"_id": job_id, "oid": oid, "finished": None},
+                {"$set": {"heartbeat": datetime.now()}},
+            )
+            await asyncio.sleep(JOB_HEARTBEAT_INTERVAL)
+
+    async def _start_job_attempt(
+        self, job: Union[ReAddPagesJob, DeleteCrawlsJob], resume=False
+    ) -> bool:
+        """Atomically mark new attempt of in-process job as started.
+
+        Retry requires previous attempt to have finished, resume requires it to
+        be unfinished with stale heartbeat, ensuring only one attempt runs.
+        Return false if attempt could not be started"""
+        now = datetime.now()
+
+        query: Dict[str, object] = {"_id": job.id, "oid": job.oid}
+        if resume:
+            query["finished"] = None
+            query["$or"] = [
+                {"heartbeat": None},
+                {"heartbeat": {"$lt": now - timedelta(seconds=JOB_STALE_SECS)}},
+            ]
+        else:
+            query["finished"] = {"$ne": None}
+
+        previous_attempts = job.previousAttempts or []
+        previous_attempts.append({"started": job.started, "finished": job.finished})
+
+        res = await self.jobs.find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "started": now,
+                    "finished": None,
+                    "success": None,
+                    "heartbeat": now,
+                    "previousAttempts": previous_attempts,
+                }
+            },
+        )
+        return res is not None
+
+    async def re_add_pages(self, job_id: str, oid: UUID, crawl_ids: List[str]):
+        """Re-add pages for each crawl, up to readd_pages_concurrency crawls
+        at a time, recording each completed or failed crawl on the job"""
+        sem = asyncio.Semaphore(self.readd_pages_concurrency)
+
+        async def re_add_crawl_pages(crawl_id: str):
+            async with sem:
+                success = False
+                try:
+                    success = await self.page_ops.re_add_crawl_pages(crawl_id, oid)
+                # pylint: disable=broad-exception-caught
+                except Exception as exc:
+                    print(f"Error re-adding pages for {crawl_id}: {exc}", flush=True)
+
+                if success:
+                    update = {
+                        "$addToSet": {"completed_crawl_ids": crawl_id},
+                        "$pull": {"failed_crawl_ids": crawl_id},
+                    }
+                else:
+                    update = {"$addToSet": {"failed_crawl_ids": crawl_id}}
+
+                await self.jobs.find_one_and_update({"_id": job_id, "oid": oid}, update)
+
+        await asyncio.gather(*[re_add_crawl_pages(crawl_id) for crawl_id in crawl_ids])
+
+        job = await self.get_background_job(job_id, oid)
+        success = not cast(ReAddPagesJob, job).failed_crawl_ids
+
+        await self.jobs.find_one_and_update(
+            {"_id": job_id, "oid": oid},
+            {"$set": {"success": success, "finished": datetime.now()}},
+        )
+
+        print(f"Re-add pages job {job_id} finished, success: {success}", flush=True)
+
+    async def retry_re_add_pages_job(self, job: ReAddPagesJob, resume=False):
+        """Retry or resume re-adding pages for all crawls of job that are not
+        in the completed checkpoint, skipped if another attempt is running"""
+        if not await self._start_job_attempt(job, resume):
+            if resume:
+                return
+
+            raise HTTPException(status_code=400, detail="job_not_finished")
+
+        crawl_ids = get_job_remaining_crawl_ids(job)
+        self._run_job_task(
+            job.id, job.oid, self.re_add_pages(job.id, job.oid, crawl_ids)
+        )
+
+    async def resume_interrupted_jobs(self):
+        """Resume in-process job attempts with stale heartbeat,
+        eg. interrupted by pod restart"""
+        cutoff = datetime.now() - timedelta(seconds=JOB_STALE_SECS)
+        query = {
+            "type": {"$in": IN_PROCESS_JOB_TYPES},
+            "finished": None,
+            "$or": [{"heartbeat": None}, {"heartbeat": {"$lt": cutoff}}],
+        }
+
+        async for job_data in self.jobs.find(query):
+            job_id = job_data["_id"]
+            try:
+                if job_data["type"] == BgJobType.READD_PAGES:
+                    job = ReAddPagesJob.from_dict(job_data)
+                    await self.retry_re_add_pages_job(job, resume=True)
+
+                elif job_data["type"] == BgJobType.DELETE_CRAWLS:
+                    org = await self.org_ops.get_org_by_id(job_data["oid"])
+                    await self.retry_delete_crawls_job(
+                        DeleteCrawlsJob.from_dict(job_data), org, resume=True
+                    )
+
+                print(f"Resumed interrupted job {job_id}", flush=True)
+
+            # pylint: disable=broad-exception-caught
+            except Exception as exc:
+                print(f"Error resuming job {job_id}: {exc}", flush=True)
+
+    async def run_resume_interrupted_jobs_loop(self, db_inited: dict):
+        """Periodically resume interrupted in-process jobs,
+        once database is ready"""
+        while not db_inited.get("inited"):
+            await asyncio.sleep(5)
+
+        while True:
+            await self.resume_interrupted_jobs()
+            await asyncio.sleep(JOB_STALE_SECS)
+
+    async def create_delete_crawls_job(
+        self, org: Organization, crawl_ids: List[str]
+    ) -> str:
+        """Create job to delete list of crawls and uploads, already checked
+        for permissions, running in the background"""
+        job_type = BgJobType.DELETE_CRAWLS.value
+
+        now = datetime.now()
+
+        job = DeleteCrawlsJob(
+            id=f"{job_type}-{secrets.token_hex(5)}",
+            oid=org.id,
+            started=now,
+            crawl_ids=crawl_ids,
+            crawls_total=len(crawl_ids),
+            heartbeat=now,
+        )
+
+        await self.jobs.insert_one(job.to_dict())
+
+        self._run_job_task(job.id, org.id, self.delete_crawls(job.id, org, crawl_ids))
+
+        return job.id
+
+    async def delete_crawls(self, job_id: str, org: Organization, crawl_ids: List[str]):
+        """Delete crawls in batches of DELETE_CRAWLS_JOB_BATCH_SIZE, recording
+        deleted and failed crawls on the job after each batch"""
+        for inx in range(0, len(crawl_ids), DELETE_CRAWLS_JOB_BATCH_SIZE):
+            batch = crawl_ids[inx : inx + DELETE_CRAWLS_JOB_BATCH_SIZE]
+
+            errors: Dict[str, Exception] = {}
+            try:
+                crawls = await self.base_crawl_ops.get_crawls_to_delete(
+                    org, batch, allow_missing=True
+                )
+                _, _, errors = await self.base_crawl_ops.delete_crawls_by_type(
+                    org, crawls
+                )
+            # pylint: disable=broad-exception-caught
+            except Exception as exc:
+                print(f"Error deleting crawls for job {job_id}: {exc}", flush=True)
+                errors = {crawl_id: exc for crawl_id in batch}
+
+            # crawls no longer found are already deleted
+            completed = [crawl_id for crawl_id in batch if crawl_id not in errors]
+            failed = list(errors)
+
+            await self.jobs.find_one_and_update(
+                {"_id": job_id, "oid": org.id},
+                {
+                    "$addToSet": {
+                        "completed_crawl_ids": {"$each": completed},
+                        "failed_crawl_ids": {"$each": failed},
+                    }
+                },
+            )
+            if completed:
+                await self.jobs.find_one_and_update(
+                    {"_id": job_id, "oid": org.id},
+                    {"$pull": {"failed_crawl_ids": {"$in": completed}}},
+                )
+
+        job = await self.get_background_job(job_id, org.id)
+        success = not cast(DeleteCrawlsJob, job).failed_crawl_ids
+
+        await self.jobs.find_one_and_update(
+            {"_id": job_id, "oid": org.id},
+            {"$set": {"success": success, "finished": datetime.now()}},
+        )
+
+        print(f"Delete crawls job {job_id} finished, success: {success}", flush=True)
+
+    async def retry_delete_crawls_job(
+        self, job: DeleteCrawlsJob, org: Organization, resume=False
+    ):
+        """Retry or resume deleting all crawls of job that are not in the
+        completed checkpoint, skipped if another attempt is running"""
+        if not await self._start_job_attempt(job, resume):
+            if resume:
+                return
+
+            raise HTTPException(status_code=400, detail="job_not_finished")
+
+        crawl_ids = get_job_remaining_crawl_ids(job)
+        self._run_job_task(job.id, org.id, self.delete_crawls(job.id, org, crawl_ids))
+
     async def job_finished(
         self,
         job_id: str,
@@ -312,7 +634,7 @@ class BackgroundJobOps:
 
     async def get_background_job(
         self, job_id: str, oid: UUID
-    ) -> Union[CreateReplicaJob, DeleteReplicaJob]:
+    ) -> Union[CreateReplicaJob, DeleteReplicaJob, ReAddPagesJob, DeleteCrawlsJob]:
         """Get background job"""
         query: dict[str, object] = {"_id": job_id, "oid": oid}
         res = await self.jobs.find_one(query)
@@ -326,6 +648,12 @@ class BackgroundJobOps:
         if data["type"] == BgJobType.CREATE_REPLICA:
             return CreateReplicaJob.from_dict(data)
 
+        if data["type"] == BgJobType.READD_PAGES:
+            return ReAddPagesJob.from_dict(data)
+
+        if data["type"] == BgJobType.DELETE_CRAWLS:
+            return DeleteCrawlsJob.from_dict(data)
+
         return DeleteReplicaJob.from_dict(data)
 
         # return BackgroundJob.from_dict(data)
@@ -339,12 +667,11 @@ class BackgroundJobOps:
         job_type: Optional[str] = None,
         sort_by: Optional[str] = None,
         sort_direction: Optional[int] = -1,
-    ) -> Tuple[List[BackgroundJob], int]:
+        next_token: Optional[str] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[BackgroundJob], Optional[int], Optional[str]]:
         """List all background jobs"""
         # pylint: disable=duplicate-code
-        # Zero-index page for query
-        page = page - 1
-        skip = page_size * page
 
         query: dict[str, object] = {"oid": org.id}
 
@@ -356,6 +683,7 @@ class BackgroundJobOps:
 
         aggregate = [{"$match": query}]
 
+        sort = None
         if sort_by:
             SORT_FIELDS = ("success", "type", "started", "finished")
             if sort_by not in SORT_FIELDS:
@@ -363,36 +691,21 @@ class BackgroundJobOps:
             if sort_direction not in (1, -1):
                 raise HTTPException(status_code=400, detail="invalid_sort_direction")
 
-            aggregate.extend([{"$sort": {sort_by: sort_direction}}])
+            sort = {sort_by: sort_direction}
 
-        aggregate.extend(
-            [
-                {
-                    "$facet": {
-                        "items": [
-                            {"$skip": skip},
-                            {"$limit": page_size},
-                        ],
-                        "total": [{"$count": "count"}],
-                    }
-                },
-            ]
+        items, total, next_token = await paginate_aggregate(
+            self.jobs,
+            aggregate,
+            sort,
+            page,
+            page_size,
+            next_token,
+            include_total,
         )
 
-        # Get total
-        cursor = self.jobs.aggregate(aggregate)
-        results = await cursor.to_list(length=1)
-        result = results[0]
-        items = result["items"]
-
-        try:
-            total = int(result["total"][0]["count"])
-        except (IndexError, ValueError):
-            total = 0
-
         jobs = [self._get_job_by_type_from_data(data) for data in items]
 
-        return jobs, total
+        return jobs, total, next_token
 
     async def get_replica_job_file(
         self, job: Union[CreateReplicaJob, DeleteReplicaJob], org: Organization
@@ -426,7 +739,15 @@ class BackgroundJobOps:
         if job.success:
             raise HTTPException(status_code=400, detail="job_already_succeeded")
 
-        file = await self.get_replica_job_file(job, org)
+        if job.type == BgJobType.READD_PAGES:
+            await self.retry_re_add_pages_job(cast(ReAddPagesJob, job))
+            return {"success": True}
+
+        if job.type == BgJobType.DELETE_CRAWLS:
+            await self.retry_delete_crawls_job(cast(DeleteCrawlsJob, job), org)
+            return {"success": True}
+
+        file = await self.get_replica_job_file(cast(CreateReplicaJob, job), org)
 
         if job.type == BgJobType.CREATE_REPLICA:
             primary_storage = self.storage_ops.get_org_storage_by_ref(org, file.storage)
@@ -555,9 +876,11 @@ def init_background_jobs_api(
         jobType: Optional[str] = None,
         sortBy: Optional[str] = None,
         sortDirection: Optional[int] = -1,
+        nextToken: Optional[str] = Query(default=None, alias="next"),
+        includeTotal: bool = False,
     ):
         """Retrieve paginated list of background jobs"""
-        jobs, total = await ops.list_background_jobs(
+        jobs, total, next_token = await ops.list_background_jobs(
             org,
             page_size=pageSize,
             page=page,
@@ -565,8 +888,10 @@ def init_background_jobs_api(
             job_type=jobType,
             sort_by=sortBy,
             sort_direction=sortDirection,
+            next_token=nextToken,
+            include_total=includeTotal,
         )
-        return paginated_format(jobs, total, page, pageSize)
+        return paginated_format(jobs, total, page, pageSize, next_token)
 
     org_ops.router.include_router(router)
 
@@ -1,13 +1,26 @@
 """ base crawl type """
 
+# pylint: disable=too-many-lines
+
 import os
 from datetime import timedelta
-from typing import Optional, List, Union, Dict, Any, Type, TYPE_CHECKING, cast
+from typing import (
+    Optional,
+    List,
+    Tuple,
+    Union,
+    Dict,
+    Any,
+    Type,
+    TYPE_CHECKING,
+    cast,
+)
 from uuid import UUID
 import urllib.parse
 
 import asyncio
-from fastapi import HTTPException, Depends
+from fastapi import HTTPException, Depends, Query, Request
+from pymongo import UpdateOne
 
 from .models import (
     CrawlFile,
@@ -25,7 +38,7 @@ from .models import (
     SUCCESSFUL_STATES,
     QARun,
 )
-from .pagination import paginated_format, DEFAULT_PAGE_SIZE
+from .pagination import paginated_format, paginate_aggregate, DEFAULT_PAGE_SIZE
 from .utils import dt_now
 
 if TYPE_CHECKING:
@@ -47,9 +60,12 @@ else:
 PRESIGN_MINUTES_MAX = 10079
 PRESIGN_MINUTES_DEFAULT = PRESIGN_MINUTES_MAX
 
+# max number of crawls deleted at once when deleting a list of crawls
+DEFAULT_DELETE_CRAWLS_CONCURRENCY = 4
+
 
 # ============================================================================
-# pylint: disable=too-many-instance-attributes
+# pylint: disable=too-many-instance-attributes, too-many-public-methods
 class BaseCrawlOps:
     """operations that apply to all crawls"""
 
@@ -79,6 +95,8 @@ class BaseCrawlOps:
         background_job_ops: BackgroundJobOps,
     ):
         self.crawls = mdb["crawls"]
+        self.crawl_errors = mdb["crawl_errors"]
+        self.crawl_log_index = mdb["crawl_log_index"]
         self.crawl_configs = crawl_configs
         self.user_manager = users
         self.orgs = orgs
@@ -99,6 +117,11 @@ class BaseCrawlOps:
         # renew when <25% of time remaining
         self.expire_at_duration_seconds = int(self.presign_duration_seconds * 0.75)
 
+        self.delete_crawls_concurrency = int(
+            os.environ.get("DELETE_CRAWLS_CONCURRENCY")
+            or DEFAULT_DELETE_CRAWLS_CONCURRENCY
+        )
+
     def set_page_ops(self, page_ops):
         """set page ops reference"""
         self.page_ops = page_ops
@@ -169,7 +192,6 @@ class BaseCrawlOps:
         res = await self.get_crawl_raw(crawlid, org, type_)
 
         files = res.pop("files", None)
-        res.pop("errors", None)
 
         if not skip_resources:
             coll_ids = res.get("collectionIds")
@@ -190,6 +212,37 @@ class BaseCrawlOps:
 
         return crawl
 
+    async def download_crawl_as_single_wacz(
+        self,
+        crawl_id: str,
+        org: Organization,
+        range_header: Optional[str] = None,
+        if_range: Optional[str] = None,
+    ):
+        """Download all WACZs in crawl or upload as streaming nested WACZ,
+        or requested byte range of it"""
+        crawl = await self.get_base_crawl(crawl_id, org)
+
+        if not crawl.files:
+            raise HTTPException(status_code=404, detail="no_crawl_resources")
+
+        # files are read from storage directly, so no need to presign urls
+        files = [
+            CrawlFileOut(
+                name=file_.filename,
+                path=file_.filename,
+                hash=file_.hash,
+                crc32=file_.crc32,
+                size=file_.size,
+                crawlId=crawl.id,
+            )
+            for file_ in crawl.files
+        ]
+
+        return await self.storage_ops.download_streaming_wacz(
+            org, files, f"{crawl.id}.wacz", range_header, if_range
+        )
+
     async def get_internal_crawl_out(self, crawl_id):
         """add internal prefix for relative paths"""
         crawl_out = await self.get_crawl_out(crawl_id)
@@ -287,89 +340,212 @@ class BaseCrawlOps:
     async def shutdown_crawl(self, crawl_id: str, org: Organization, graceful: bool):
         """placeholder, implemented in crawls, base version does nothing"""
 
+    async def get_crawls_to_delete(
+        self,
+        org: Organization,
+        crawl_ids: List[str],
+        user: Optional[User] = None,
+        allow_missing: bool = False,
+    ) -> List[BaseCrawl]:
+        """Get crawls in list in a single query, ensuring user has permission
+        to delete all of them.
+
+        Raise 404 if any crawl is not found in org, unless allow_missing is set,
+        eg. when resuming a delete job where crawls may already be deleted"""
+        crawls = [
+            BaseCrawl.from_dict(res)
+            async for res in self.crawls.find(
+                {"_id": {"$in": crawl_ids}, "oid": org.id}
+            )
+        ]
+
+        if not allow_missing and len(crawls) < len(set(crawl_ids)):
+            raise HTTPException(status_code=404, detail="crawl_not_found")
+
+        # Ensure user has appropriate permissions for all crawls in list:
+        # - Crawler users can delete their own crawls
+        # - Org owners can delete any crawls in org
+        if user and not org.is_owner(user):
+            for crawl in crawls:
+                if crawl.userid != user.id:
+                    raise HTTPException(status_code=403, detail="not_allowed")
+
+        return crawls
+
     async def delete_crawls(
         self,
         org: Organization,
         delete_list: DeleteCrawlList,
         type_: str,
         user: Optional[User] = None,
-    ) -> tuple[int, dict[UUID, dict[str, int]], bool]:
+    ) -> tuple[int, bool]:
         """Delete a list of crawls by id for given org"""
-        cids_to_update: dict[UUID, dict[str, int]] = {}
+        crawls = await self.get_crawls_to_delete(org, delete_list.crawl_ids, user)
+        crawls = [crawl for crawl in crawls if crawl.type == type_]
 
-        size = 0
+        count, quota_reached, errors = await self._delete_crawls(org, crawls, type_)
+        if errors:
+            raise next(iter(errors.values()))
 
-        for crawl_id in delete_list.crawl_ids:
-            crawl = await self.get_base_crawl(crawl_id, org)
-            if crawl.type != type_:
+        return count, quota_reached
+
+    async def delete_crawls_by_type(
+        self, org: Organization, crawls: List[BaseCrawl]
+    ) -> tuple[int, bool, dict[str, Exception]]:
+        """Delete crawls and uploads, already checked for permissions,
+        returning count deleted, quota reached and errors by crawl id"""
+        count = 0
+        quota_reached = False
+        errors: dict[str, Exception] = {}
+
+        for type_ in ("crawl", "upload"):
+            type_crawls = [crawl for crawl in crawls if crawl.type == type_]
+            if not type_crawls:
                 continue
 
-            # Ensure user has appropriate permissions for all crawls in list:
-            # - Crawler users can delete their own crawls
-            # - Org owners can delete any crawls in org
-            if user and (crawl.userid != user.id) and not org.is_owner(user):
-                raise HTTPException(status_code=403, detail="not_allowed")
-
-            if type_ == "crawl" and not crawl.finished:
-                try:
-                    await self.shutdown_crawl(crawl_id, org, graceful=False)
-                except Exception as exc:
-                    # pylint: disable=raise-missing-from
-                    raise HTTPException(
-                        status_code=400, detail=f"Error Stopping Crawl: {exc}"
-                    )
+            deleted, quota_reached, type_errors = await self._delete_crawls(
+                org, type_crawls, type_
+            )
+            count += deleted
+            errors.update(type_errors)
+
+        return count, quota_reached, errors
+
+    async def _delete_crawls(
+        self, org: Organization, crawls: List[BaseCrawl], type_: str
+    ) -> tuple[int, bool, dict[str, Exception]]:
+        """Delete crawls of given type, up to delete_crawls_concurrency at a time.
+
+        Crawls are then removed with a single delete_many, and org bytes and
+        workflow stats and org metrics updated once for all crawls deleted
+        successfully. Returns count deleted, quota reached and errors by crawl id"""
+        # pylint: disable=too-many-statements
+        sem = asyncio.Semaphore(self.delete_crawls_concurrency)
+
+        async def delete_crawl(crawl: BaseCrawl) -> int:
+            async with sem:
+                if type_ == "crawl" and not crawl.finished:
+                    try:
+                        await self.shutdown_crawl(crawl.id, org, graceful=False)
+                    except Exception as exc:
+                        # pylint: disable=raise-missing-from
+                        raise HTTPException(
+                            status_code=400, detail=f"Error Stopping Crawl: {exc}"
+                        )
+
+                if type_ == "crawl":
+                    await self.page_ops.delete_crawl_pages(crawl.id, org.id)
+                    await self.crawl_errors.delete_many({"crawl_id": crawl.id})
+                    await self.crawl_log_index.delete_many({"crawl_id": crawl.id})
+                    await self.delete_all_crawl_qa_files(crawl.id, org)
+
+                return await self._delete_crawl_files(crawl, org)
+
+        results = await asyncio.gather(
+            *[delete_crawl(crawl) for crawl in crawls], return_exceptions=True
+        )
 
-            if type_ == "crawl":
-                await self.page_ops.delete_crawl_pages(crawl_id, org.id)
-                await self.delete_all_crawl_qa_files(crawl_id, org)
+        cids_to_update: dict[UUID, dict[str, int]] = {}
+        deleted_ids = []
+        errors: dict[str, Exception] = {}
+        size = 0
+
+        for crawl, result in zip(crawls, results):
+            if isinstance(result, Exception):
+                print(f"Error deleting {type_} {crawl.id}: {result}", flush=True)
+                errors[crawl.id] = result
+                continue
 
-            crawl_size = await self._delete_crawl_files(crawl, org)
-            size += crawl_size
+            if isinstance(result, BaseException):
+                raise result
+
+            deleted_ids.append(crawl.id)
+            size += result
 
             cid = crawl.cid
             if cid:
                 if cids_to_update.get(cid):
                     cids_to_update[cid]["inc"] += 1
-                    cids_to_update[cid]["size"] += crawl_size
+                    cids_to_update[cid]["size"] += result
                 else:
                     cids_to_update[cid] = {}
                     cids_to_update[cid]["inc"] = 1
-                    cids_to_update[cid]["size"] = crawl_size
+                    cids_to_update[cid]["size"] = result
 
             if type_ == "crawl":
                 asyncio.create_task(
                     self.event_webhook_ops.create_crawl_deleted_notification(
-                        crawl_id, org
+                        crawl.id, org
                     )
                 )
             if type_ == "upload":
                 asyncio.create_task(
                     self.event_webhook_ops.create_upload_deleted_notification(
-                        crawl_id, org
+                        crawl.id, org
                     )
                 )
 
-        query = {"_id": {"$in": delete_list.crawl_ids}, "oid": org.id, "type": type_}
-        res = await self.crawls.delete_many(query)
+        count = 0
+        if deleted_ids:
+            query = {"_id": {"$in": deleted_ids}, "oid": org.id, "type": type_}
+            res = await self.crawls.delete_many(query)
+            count = res.deleted_count
+
+            archived = [
+                crawl
+                for crawl in crawls
+                if crawl.id in deleted_ids and crawl.state in SUCCESSFUL_STATES
+            ]
+            if archived:
+                await self.orgs.inc_org_item_counts(
+                    org.id,
+                    type_,
+                    -len(archived),
+                    -sum(crawl.stats.done for crawl in archived if crawl.stats),
+                )
 
         quota_reached = await self.orgs.inc_org_bytes_stored(org.id, -size, type_)
 
-        return res.deleted_count, cids_to_update, quota_reached
+        for cid, cid_dict in cids_to_update.items():
+            cid_size = cid_dict["size"]
+            cid_inc = cid_dict["inc"]
+            await self.crawl_configs.stats_recompute_last(cid, -cid_size, -cid_inc)
 
-    async def _delete_crawl_files(
-        self, crawl: Union[BaseCrawl, QARun], org: Organization
-    ):
+        return count, quota_reached, errors
+
+    async def _delete_crawl_files(self, crawl: BaseCrawl, org: Organization):
         """Delete files associated with crawl from storage."""
+        errors = await self.storage_ops.delete_crawl_file_objects(org, crawl.files)
+
         size = 0
         for file_ in crawl.files:
+            if file_.filename in errors:
+                continue
+
             size += file_.size
-            if not await self.storage_ops.delete_crawl_file_object(org, file_):
-                raise HTTPException(status_code=400, detail="file_deletion_error")
-            # Not replicating QA run WACZs yet
-            if not isinstance(crawl, QARun):
-                await self.background_job_ops.create_delete_replica_jobs(
-                    org, file_, crawl.id, crawl.type
+            await self.background_job_ops.create_delete_replica_jobs(
+                org, file_, crawl.id, crawl.type
+            )
+
+        if errors:
+            # keep only files not deleted, so that size stored is still
+            # accurate and deletion can be retried
+            if size:
+                await self.crawls.find_one_and_update(
+                    {"_id": crawl.id, "oid": org.id},
+                    {
+                        "$pull": {"files": {"filename": {"$nin": list(errors)}}},
+                        "$inc": {
+                            "fileCount": len(errors) - len(crawl.files),
+                            "fileSize": -size,
+                        },
+                    },
                 )
+                await self.orgs.inc_org_bytes_stored(org.id, -size, crawl.type)
+                if crawl.cid:
+                    await self.crawl_configs.stats_recompute_last(crawl.cid, -size, 0)
+
+            raise HTTPException(status_code=400, detail="file_deletion_error")
 
         return size
 
@@ -383,49 +559,107 @@ class BaseCrawlOps:
         """Delete files for all qa runs in a crawl"""
         crawl_raw = await self.get_crawl_raw(crawl_id)
         qa_finished = crawl_raw.get("qaFinished", {})
-        for qa_run_raw in qa_finished.values():
-            qa_run = QARun(**qa_run_raw)
-            await self._delete_crawl_files(qa_run, org)
+        qa_runs = {
+            qa_run_id: QARun(**qa_run_raw)
+            for qa_run_id, qa_run_raw in qa_finished.items()
+        }
+        await self._delete_qa_run_files(crawl_id, qa_runs, org)
+
+    async def _delete_qa_run_files(
+        self, crawl_id: str, qa_runs: Dict[str, QARun], org: Organization
+    ):
+        """Delete files of qa runs of crawl from storage together.
+
+        If some files could not be deleted, only those are kept listed on
+        their qa runs, so that deletion can be retried"""
+        # Not replicating QA run WACZs yet
+        qa_files = [file_ for qa_run in qa_runs.values() for file_ in qa_run.files]
+        errors = await self.storage_ops.delete_crawl_file_objects(org, qa_files)
+        if not errors:
+            return
+
+        pull = {
+            f"qaFinished.{qa_run_id}.files": {"filename": {"$nin": list(errors)}}
+            for qa_run_id, qa_run in qa_runs.items()
+            if any(file_.filename not in errors for file_ in qa_run.files)
+        }
+        if pull:
+            await self.crawls.find_one_and_update(
+                {"_id": crawl_id, "oid": org.id}, {"$pull": pull}
+            )
+
+        raise HTTPException(status_code=400, detail="file_deletion_error")
 
     async def _resolve_crawl_refs(
         self,
         crawl: Union[CrawlOut, CrawlOutWithResources],
         org: Optional[Organization],
         files: Optional[list[dict]],
-        add_first_seed: bool = True,
     ):
         """Resolve running crawl data"""
-        # pylint: disable=too-many-branches
-        config = None
-        if crawl.cid:
-            config = await self.crawl_configs.get_crawl_config(
-                crawl.cid, org.id if org else None, active_only=False
-            )
-
         if not org:
             org = await self.orgs.get_org_by_id(crawl.oid)
             if not org:
                 raise HTTPException(status_code=400, detail="missing_org")
 
-        if config and config.config.seeds:
-            if add_first_seed:
-                first_seed = config.config.seeds[0]
-                crawl.firstSeed = first_seed.url
-            crawl.seedCount = len(config.config.seeds)
+        await self._resolve_org_crawls_refs([(crawl, files)], org)
+        return crawl
+
+    async def _resolve_crawls_refs(
+        self,
+        crawls_with_files: List[
+            Tuple[Union[CrawlOut, CrawlOutWithResources], Optional[list[dict]]]
+        ],
+        org: Optional[Organization],
+    ):
+        """Resolve data for a page of crawls, grouped by org if no org provided"""
+        if org:
+            await self._resolve_org_crawls_refs(crawls_with_files, org)
+            return
+
+        by_oid: Dict[UUID, list] = {}
+        for crawl, files in crawls_with_files:
+            by_oid.setdefault(crawl.oid, []).append((crawl, files))
+
+        for oid, org_crawls_with_files in by_oid.items():
+            crawl_org = await self.orgs.get_org_by_id(oid)
+            if not crawl_org:
+                raise HTTPException(status_code=400, detail="missing_org")
 
-        if hasattr(crawl, "profileid") and crawl.profileid:
-            crawl.profileName = await self.crawl_configs.profiles.get_profile_name(
-                crawl.profileid, org
+            await self._resolve_org_crawls_refs(org_crawls_with_files, crawl_org)
+
+    async def _resolve_org_crawls_refs(
+        self,
+        crawls_with_files: List[
+            Tuple[Union[CrawlOut, CrawlOutWithResources], Optional[list[dict]]]
+        ],
+        org: Organization,
+    ):
+        """Resolve profile names and resources for crawls in one org,
+        looking up profile names for all crawls in a single query"""
+        profileids: List[UUID] = []
+        for crawl, _ in crawls_with_files:
+            profileid = getattr(crawl, "profileid", None)
+            if profileid and profileid not in profileids:
+                profileids.append(profileid)
+
+        profile_names: Dict[UUID, str] = {}
+        if profileids:
+            profile_names = await self.crawl_configs.profiles.get_profile_names(
+                profileids, org
             )
 
-        if (
-            files
-            and crawl.state in SUCCESSFUL_STATES
-            and isinstance(crawl, CrawlOutWithResources)
-        ):
-            crawl.resources = await self._files_to_resources(files, org, crawl.id)
+        for crawl, files in crawls_with_files:
+            profileid = getattr(crawl, "profileid", None)
+            if profileid:
+                crawl.profileName = profile_names.get(profileid)
 
-        return crawl
+            if (
+                files
+                and crawl.state in SUCCESSFUL_STATES
+                and isinstance(crawl, CrawlOutWithResources)
+            ):
+                crawl.resources = await self._files_to_resources(files, org, crawl.id)
 
     async def _resolve_signed_urls(
         self,
@@ -438,35 +672,51 @@ class BaseCrawlOps:
             print("no files")
             return []
 
-        delta = timedelta(seconds=self.expire_at_duration_seconds)
+        now = dt_now()
+        exp = now + timedelta(seconds=self.expire_at_duration_seconds)
 
-        out_files = []
+        expired = [
+            file_
+            for file_ in files
+            if not file_.presignedUrl or not file_.expireAt or now >= file_.expireAt
+        ]
 
-        for file_ in files:
-            presigned_url = file_.presignedUrl
-            now = dt_now()
+        if expired:
+            presigned = await self.storage_ops.get_presigned_urls(
+                org, expired, self.presign_duration_seconds, exp
+            )
 
-            if not presigned_url or now >= file_.expireAt:
-                exp = now + delta
-                presigned_url = await self.storage_ops.get_presigned_url(
-                    org, file_, self.presign_duration_seconds
+            prefix = "files"
+            if qa_run_id:
+                prefix = f"qaFinished.{qa_run_id}.{prefix}"
+
+            updates = []
+
+            for file_, (presigned_url, expire_at) in zip(expired, presigned):
+                file_.presignedUrl = presigned_url
+                file_.expireAt = expire_at
+
+                query: Dict[str, object] = {f"{prefix}.filename": file_.filename}
+                if crawl_id:
+                    query["_id"] = crawl_id
+
+                updates.append(
+                    UpdateOne(
+                        query,
+                        {
+                            "$set": {
+                                f"{prefix}.$.presignedUrl": presigned_url,
+                                f"{prefix}.$.expireAt": expire_at,
+                            }
+                        },
+                    )
                 )
 
-                prefix = "files"
-                if qa_run_id:
-                    prefix = f"qaFinished.{qa_run_id}.{prefix}"
+            await self.crawls.bulk_write(updates, ordered=False)
 
-                await self.crawls.find_one_and_update(
-                    {f"{prefix}.filename": file_.filename},
-                    {
-                        "$set": {
-                            f"{prefix}.$.presignedUrl": presigned_url,
-                            f"{prefix}.$.expireAt": exp,
-                        }
-                    },
-                )
-                file_.expireAt = exp
+        out_files = []
 
+        for file_ in files:
             expire_at_str = ""
             if file_.expireAt:
                 expire_at_str = file_.expireAt.isoformat()
@@ -474,13 +724,14 @@ class BaseCrawlOps:
             out_files.append(
                 CrawlFileOut(
                     name=file_.filename,
-                    path=presigned_url or "",
+                    path=file_.presignedUrl or "",
                     hash=file_.hash,
                     crc32=file_.crc32,
                     size=file_.size,
                     crawlId=crawl_id,
                     numReplicas=len(file_.replicas) if file_.replicas else 0,
                     expireAt=expire_at_str,
+                    members=file_.members,
                 )
             )
 
@@ -535,12 +786,10 @@ class BaseCrawlOps:
         page: int = 1,
         sort_by: Optional[str] = None,
         sort_direction: int = -1,
+        next_token: Optional[str] = None,
+        include_total: bool = True,
     ):
         """List crawls of all types from the db"""
-        # Zero-index page for query
-        page = page - 1
-        skip = page * page_size
-
         oid = org.id if org else None
 
         resources = False
@@ -563,69 +812,12 @@ class BaseCrawlOps:
         if cid:
             query["cid"] = cid
 
+        if first_seed:
+            query["firstSeed"] = first_seed
+
         aggregate = [
             {"$match": query},
-            {"$set": {"firstSeedObject": {"$arrayElemAt": ["$config.seeds", 0]}}},
-            {"$set": {"firstSeed": "$firstSeedObject.url"}},
-            {"$unset": ["firstSeedObject", "errors", "config"]},
-            {"$set": {"activeQAStats": "$qa.stats"}},
-            {
-                "$set": {
-                    "qaFinishedArray": {
-                        "$map": {
-                            "input": {"$objectToArray": "$qaFinished"},
-                            "in": "$$this.v",
-                        }
-                    }
-                }
-            },
-            # Add active QA run to array if exists prior to sorting, taking care not to
-            # pass null to $concatArrays so that our result isn't null
-            {
-                "$set": {
-                    "qaActiveArray": {"$cond": [{"$ne": ["$qa", None]}, ["$qa"], []]}
-                }
-            },
-            {
-                "$set": {
-                    "qaArray": {"$concatArrays": ["$qaFinishedArray", "$qaActiveArray"]}
-                }
-            },
-            {
-                "$set": {
-                    "sortedQARuns": {
-                        "$sortArray": {
-                            "input": "$qaArray",
-                            "sortBy": {"started": -1},
-                        }
-                    }
-                }
-            },
-            {"$set": {"lastQARun": {"$arrayElemAt": ["$sortedQARuns", 0]}}},
-            {"$set": {"lastQAState": "$lastQARun.state"}},
-            {"$set": {"lastQAStarted": "$lastQARun.started"}},
-            {
-                "$set": {
-                    "qaRunCount": {
-                        "$size": {
-                            "$cond": [
-                                {"$isArray": "$qaArray"},
-                                "$qaArray",
-                                [],
-                            ]
-                        }
-                    }
-                }
-            },
-            {
-                "$unset": [
-                    "lastQARun",
-                    "qaActiveArray",
-                    "qaFinishedArray",
-                    "qaArray",
-                    "sortedQARuns",
-                ]
-            },
+            {"$unset": ["config"]},
         ]
 
         if not resources:
@@ -634,15 +826,13 @@ class BaseCrawlOps:
         if name:
             aggregate.extend([{"$match": {"name": name}}])
 
-        if first_seed:
-            aggregate.extend([{"$match": {"firstSeed": first_seed}}])
-
         if description:
             aggregate.extend([{"$match": {"description": description}}])
 
         if collection_id:
             aggregate.extend([{"$match": {"collectionIds": {"$in": [collection_id]}}}])
 
+        sort_query: Optional[Dict[str, int]] = None
         if sort_by:
             if sort_by not in (
                 "started",
@@ -663,45 +853,32 @@ class BaseCrawlOps:
             if sort_by in ("lastQAStarted", "lastQAState"):
                 sort_query["type"] = 1
 
-            aggregate.extend([{"$sort": sort_query}])
-
-        aggregate.extend(
-            [
-                {
-                    "$facet": {
-                        "items": [
-                            {"$skip": skip},
-                            {"$limit": page_size},
-                        ],
-                        "total": [{"$count": "count"}],
-                    }
-                },
-            ]
+        items, total, next_token = await paginate_aggregate(
+            self.crawls,
+            aggregate,
+            sort_query,
+            page,
+            page_size,
+            next_token,
+            include_total,
         )
 
-        # Get total
-        cursor = self.crawls.aggregate(aggregate)
-        results = await cursor.to_list(length=1)
-        result = results[0]
-        items = result["items"]
-
-        try:
-            total = int(result["total"][0]["count"])
-        except (IndexError, ValueError):
-            total = 0
-
         crawls = []
+        to_resolve = []
         for res in items:
+            res["activeQAStats"] = (res.get("qa") or {}).get("stats")
             crawl = cls_type.from_dict(res)
 
             if resources or crawl.type == "crawl":
                 # pass files only if we want to include resolved resources
                 files = res.get("files") if resources else None
-                crawl = await self._resolve_crawl_refs(crawl, org, files=files)
+                to_resolve.append((crawl, files))
 
             crawls.append(crawl)
 
-        return crawls, total
+        await self._resolve_crawls_refs(to_resolve, org)
+
+        return crawls, total, next_token
 
     async def delete_crawls_all_types(
         self,
@@ -710,44 +887,15 @@ class BaseCrawlOps:
         user: Optional[User] = None,
     ):
         """Delete uploaded crawls"""
-        crawls: list[str] = []
-        uploads: list[str] = []
-
-        for crawl_id in delete_list.crawl_ids:
-            crawl = await self.get_base_crawl(crawl_id, org)
-            if crawl.type == "crawl":
-                crawls.append(crawl_id)
-            if crawl.type == "upload":
-                uploads.append(crawl_id)
-
-        crawls_length = len(crawls)
-        uploads_length = len(uploads)
-
-        if crawls_length + uploads_length == 0:
+        crawls = await self.get_crawls_to_delete(org, delete_list.crawl_ids, user)
+        if not crawls:
             raise HTTPException(status_code=400, detail="nothing_to_delete")
 
-        deleted_count = 0
-        # Value is set in delete calls, but initialize to keep linter happy.
-        quota_reached = False
-
-        if crawls_length:
-            crawl_delete_list = DeleteCrawlList(crawl_ids=crawls)
-            deleted, cids_to_update, quota_reached = await self.delete_crawls(
-                org, crawl_delete_list, "crawl", user
-            )
-            deleted_count += deleted
-
-            for cid, cid_dict in cids_to_update.items():
-                cid_size = cid_dict["size"]
-                cid_inc = cid_dict["inc"]
-                await self.crawl_configs.stats_recompute_last(cid, -cid_size, -cid_inc)
-
-        if uploads_length:
-            upload_delete_list = DeleteCrawlList(crawl_ids=uploads)
-            deleted, _, quota_reached = await self.delete_crawls(
-                org, upload_delete_list, "upload", user
-            )
-            deleted_count += deleted
+        deleted_count, quota_reached, errors = await self.delete_crawls_by_type(
+            org, crawls
+        )
+        if errors:
+            raise next(iter(errors.values()))
 
         if deleted_count < 1:
             raise HTTPException(status_code=404, detail="crawl_not_found")
@@ -764,30 +912,17 @@ class BaseCrawlOps:
 
         names = await self.crawls.distinct("name", match_query)
         descriptions = await self.crawls.distinct("description", match_query)
-        cids = (
-            await self.crawls.distinct("cid", match_query)
-            if not type_ or type_ == "crawl"
-            else []
-        )
+        first_seeds = await self.crawls.distinct("firstSeed", match_query)
 
         # Remove empty strings
         names = [name for name in names if name]
         descriptions = [description for description in descriptions if description]
-
-        first_seeds = set()
-        for cid in cids:
-            if not cid:
-                continue
-            config = await self.crawl_configs.get_crawl_config(cid, org.id)
-            if not config:
-                continue
-            first_seed = config.config.seeds[0]
-            first_seeds.add(first_seed.url)
+        first_seeds = [first_seed for first_seed in first_seeds if first_seed]
 
         return {
             "names": names,
             "descriptions": descriptions,
-            "firstSeeds": list(first_seeds),
+            "firstSeeds": first_seeds,
         }
 
 
@@ -820,6 +955,8 @@ def init_base_crawls_api(app, user_dep, *args):
         cid: Optional[UUID] = None,
         sortBy: Optional[str] = "finished",
         sortDirection: int = -1,
+        nextToken: Optional[str] = Query(default=None, alias="next"),
+        includeTotal: bool = False,
     ):
         states = state.split(",") if state else None
 
@@ -835,7 +972,7 @@ def init_base_crawls_api(app, user_dep, *args):
         if crawlType and crawlType not in ("crawl", "upload"):
             raise HTTPException(status_code=400, detail="invalid_crawl_type")
 
-        crawls, total = await ops.list_all_base_crawls(
+        crawls, total, next_token = await ops.list_all_base_crawls(
             org,
             userid=userid,
             name=name,
@@ -849,8 +986,10 @@ def init_base_crawls_api(app, user_dep, *args):
             page=page,
             sort_by=sortBy,
             sort_direction=sortDirection,
+            next_token=nextToken,
+            include_total=includeTotal,
         )
-        return paginated_format(crawls, total, page, pageSize)
+        return paginated_format(crawls, total, page, pageSize, next_token)
 
     @app.get("/orgs/{oid}/all-crawls/search-values", tags=["all-crawls"])
     async def get_all_crawls_search_values(
@@ -889,6 +1028,19 @@ def init_base_crawls_api(app, user_dep, *args):
     async def get_crawl_out(crawl_id, org: Organization = Depends(org_viewer_dep)):
         return await ops.get_crawl_out(crawl_id, org)
 
+    @app.get("/orgs/{oid}/all-crawls/{crawl_id}/download", tags=["all-crawls"])
+    async def download_base_crawl_as_single_wacz(
+        crawl_id: str,
+        request: Request,
+        org: Organization = Depends(org_viewer_dep),
+    ):
+        return await ops.download_crawl_as_single_wacz(
+            crawl_id,
+            org,
+            request.headers.get("Range"),
+            request.headers.get("If-Range"),
+        )
+
     @app.patch("/orgs/{oid}/all-crawls/{crawl_id}", tags=["all-crawls"])
     async def update_crawl(
         update: UpdateCrawl, crawl_id: str, org: Organization = Depends(org_crawl_dep)
@@ -903,4 +1055,20 @@ def init_base_crawls_api(app, user_dep, *args):
     ):
         return await ops.delete_crawls_all_types(delete_list, org, user)
 
+    @app.post("/orgs/{oid}/all-crawls/deleteJob", tags=["all-crawls"])
+    async def delete_crawls_all_types_job(
+        delete_list: DeleteCrawlList,
+        user: User = Depends(user_dep),
+        org: Organization = Depends(org_crawl_dep),
+    ):
+        """Delete crawls and uploads in background job, returning job id"""
+        crawls = await ops.get_crawls_to_delete(org, delete_list.crawl_ids, user)
+        if not crawls:
+            raise HTTPException(status_code=400, detail="nothing_to_delete")
+
+        job_id = await ops.background_job_ops.create_delete_crawls_job(
+            org, [crawl.id for crawl in crawls]
+        )
+        return {"started": True, "id": job_id}
+
     return ops
@@ -9,10 +9,9 @@ from typing import Optional, List, TYPE_CHECKING, cast
 
 import asyncio
 import pymongo
-from fastapi import Depends, HTTPException, Response
-from fastapi.responses import StreamingResponse
+from fastapi import Depends, HTTPException, Query, Request, Response
 
-from .pagination import DEFAULT_PAGE_SIZE, paginated_format
+from .pagination import DEFAULT_PAGE_SIZE, paginate_aggregate, paginated_format
 from .models import (
     Collection,
     CollIn,
@@ -87,6 +86,7 @@ class CollectionOps:
         )
         try:
             await self.collections.insert_one(coll.to_dict())
+            await self.orgs.inc_org_collections_count(oid, 1, 1 if coll.isPublic else 0)
             org = await self.orgs.get_org_by_id(oid)
             if crawl_ids:
                 await self.crawl_ops.add_to_collection(crawl_ids, coll_id, org)
@@ -117,7 +117,7 @@ class CollectionOps:
             result = await self.collections.find_one_and_update(
                 {"_id": coll_id, "oid": org.id},
                 {"$set": query},
-                return_document=pymongo.ReturnDocument.AFTER,
+                return_document=pymongo.ReturnDocument.BEFORE,
             )
         except pymongo.errors.DuplicateKeyError:
             # pylint: disable=raise-missing-from
@@ -126,6 +126,13 @@ class CollectionOps:
         if not result:
             raise HTTPException(status_code=404, detail="collection_not_found")
 
+        if "isPublic" in query and bool(query["isPublic"]) != bool(
+            result.get("isPublic")
+        ):
+            await self.orgs.inc_org_collections_count(
+                org.id, 0, 1 if query["isPublic"] else -1
+            )
+
         return {"updated": True}
 
     async def add_crawls_to_collection(
@@ -204,13 +211,11 @@ class CollectionOps:
         sort_direction: int = 1,
         name: Optional[str] = None,
         name_prefix: Optional[str] = None,
+        next_token: Optional[str] = None,
+        include_total: bool = True,
     ):
         """List all collections for org"""
         # pylint: disable=too-many-locals, duplicate-code
-        # Zero-index page for query
-        page = page - 1
-        skip = page * page_size
-
         match_query: dict[str, object] = {"oid": oid}
 
         if name:
@@ -222,43 +227,29 @@ class CollectionOps:
 
         aggregate = [{"$match": match_query}]
 
+        sort = None
         if sort_by:
             if sort_by not in ("modified", "name", "description", "totalSize"):
                 raise HTTPException(status_code=400, detail="invalid_sort_by")
             if sort_direction not in (1, -1):
                 raise HTTPException(status_code=400, detail="invalid_sort_direction")
 
-            aggregate.extend([{"$sort": {sort_by: sort_direction}}])
-
-        aggregate.extend(
-            [
-                {
-                    "$facet": {
-                        "items": [
-                            {"$skip": skip},
-                            {"$limit": page_size},
-                        ],
-                        "total": [{"$count": "count"}],
-                    }
-                },
-            ]
+            sort = {sort_by: sort_direction}
+
+        items, total, next_token = await paginate_aggregate(
+            self.collections,
+            aggregate,
+            sort,
+            page,
+            page_size,
+            next_token,
+            include_total,
+            collation=pymongo.collation.Collation(locale="en"),
         )
 
-        cursor = self.collections.aggregate(
-            aggregate, collation=pymongo.collation.Collation(locale="en")
-        )
-        results = await cursor.to_list(length=1)
-        result = results[0]
-        items = result["items"]
-
-        try:
-            total = int(result["total"][0]["count"])
-        except (IndexError, ValueError):
-            total = 0
-
         collections = [CollOut.from_dict(res) for res in items]
 
-        return collections, total
+        return collections, total, next_token
 
     async def get_collection_crawl_resources(self, coll_id: UUID, org: Organization):
         """Return pre-signed resources for all collection crawl files."""
@@ -268,7 +259,7 @@ class CollectionOps:
 
         all_files = []
 
-        crawls, _ = await self.crawl_ops.list_all_base_crawls(
+        crawls, _, _ = await self.crawl_ops.list_all_base_crawls(
             collection_id=coll_id,
             states=list(SUCCESSFUL_STATES),
             page_size=10_000,
@@ -303,25 +294,35 @@ class CollectionOps:
         """Delete collection and remove from associated crawls."""
         await self.crawl_ops.remove_collection_from_all_crawls(coll_id)
 
-        result = await self.collections.delete_one({"_id": coll_id, "oid": org.id})
-        if result.deleted_count < 1:
+        result = await self.collections.find_one_and_delete(
+            {"_id": coll_id, "oid": org.id}
+        )
+        if not result:
             raise HTTPException(status_code=404, detail="collection_not_found")
 
+        await self.orgs.inc_org_collections_count(
+            org.id, -1, -1 if result.get("isPublic") else 0
+        )
+
         asyncio.create_task(
             self.event_webhook_ops.create_collection_deleted_notification(coll_id, org)
         )
 
         return {"success": True}
 
-    async def download_collection(self, coll_id: UUID, org: Organization):
-        """Download all WACZs in collection as streaming nested WACZ"""
+    async def download_collection(
+        self,
+        coll_id: UUID,
+        org: Organization,
+        range_header: Optional[str] = None,
+        if_range: Optional[str] = None,
+    ):
+        """Download all WACZs in collection as streaming nested WACZ,
+        or requested byte range of it"""
         coll = await self.get_collection(coll_id, org, resources=True)
 
-        resp = await self.storage_ops.download_streaming_wacz(org, coll.resources)
-
-        headers = {"Content-Disposition": f'attachment; filename="{coll.name}.wacz"'}
-        return StreamingResponse(
-            resp, headers=headers, media_type="application/wacz+zip"
+        return await self.storage_ops.download_streaming_wacz(
+            org, coll.resources, f"{coll.name}.wacz", range_header, if_range
         )
 
     async def update_collection_counts_and_tags(self, collection_id: UUID):
@@ -408,8 +409,10 @@ def init_collections_api(app, mdb, orgs, storage_ops, event_webhook_ops):
         sortDirection: int = 1,
         name: Optional[str] = None,
         namePrefix: Optional[str] = None,
+        nextToken: Optional[str] = Query(default=None, alias="next"),
+        includeTotal: bool = False,
     ):
-        collections, total = await colls.list_collections(
+        collections, total, next_token = await colls.list_collections(
             org.id,
             page_size=pageSize,
             page=page,
@@ -417,8 +420,10 @@ def init_collections_api(app, mdb, orgs, storage_ops, event_webhook_ops):
             sort_direction=sortDirection,
             name=name,
             name_prefix=namePrefix,
+            next_token=nextToken,
+            include_total=includeTotal,
         )
-        return paginated_format(collections, total, page, pageSize)
+        return paginated_format(collections, total, page, pageSize, next_token)
 
     @app.get(
         "/orgs/{oid}/collections/$all",
@@ -427,7 +432,9 @@ def init_collections_api(app, mdb, orgs, storage_ops, event_webhook_ops):
     async def get_collection_all(org: Organization = Depends(org_viewer_dep)):
         results = {}
         try:
-            all_collections, _ = await colls.list_collections(org.id, page_size=10_000)
+            all_collections, _, _ = await colls.list_collections(
+                org.id, page_size=10_000
+            )
             for collection in all_collections:
                 results[collection.name] = await colls.get_collection_crawl_resources(
                     collection.id, org
@@ -531,8 +538,15 @@ def init_collections_api(app, mdb, orgs, storage_ops, event_webhook_ops):
 
     @app.get("/orgs/{oid}/collections/{coll_id}/download", tags=["collections"])
     async def download_collection(
-        coll_id: UUID, org: Organization = Depends(org_viewer_dep)
+        coll_id: UUID,
+        request: Request,
+        org: Organization = Depends(org_viewer_dep),
     ):
-        return await colls.download_collection(coll_id, org)
+        return await colls.download_collection(
+            coll_id,
+            org,
+            request.headers.get("Range"),
+            request.headers.get("If-Range"),
+        )
 
     return colls
@@ -4,7 +4,7 @@ Crawl Config API handling
 
 # pylint: disable=too-many-lines
 
-from typing import List, Union, Optional, Tuple, TYPE_CHECKING, cast
+from typing import List, Union, Optional, Tuple, Dict, TYPE_CHECKING, cast
 
 import asyncio
 import json
@@ -17,7 +17,7 @@ import urllib.parse
 import pymongo
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from .pagination import DEFAULT_PAGE_SIZE, paginated_format
+from .pagination import DEFAULT_PAGE_SIZE, paginate_aggregate, paginated_format
 from .models import (
     CrawlConfigIn,
     ConfigRevision,
@@ -31,6 +31,7 @@ from .models import (
     User,
     PaginatedResponse,
     FAILED_STATES,
+    RUNNING_AND_STARTING_STATES,
     CrawlerChannel,
     CrawlerChannels,
 )
@@ -141,6 +142,10 @@ class CrawlConfigOps:
             [("name", pymongo.ASCENDING), ("firstSeed", pymongo.ASCENDING)]
         )
 
+        await self.crawl_configs.create_index(
+            [("oid", pymongo.ASCENDING), ("firstSeed", pymongo.ASCENDING)]
+        )
+
         await self.config_revs.create_index([("cid", pymongo.HASHED)])
 
         await self.config_revs.create_index(
@@ -204,6 +209,8 @@ class CrawlConfigOps:
         if max_pages > 0:
             data["config"]["limit"] = max_pages
 
+        data.update(config.config.get_seed_fields())
+
         data["profileid"], profile_filename = await self._lookup_profile(
             config.profileid, org
         )
@@ -374,6 +381,7 @@ class CrawlConfigOps:
 
         if update.config is not None:
             query["config"] = update.config.dict()
+            query.update(update.config.get_seed_fields())
 
         # update in db
         result = await self.crawl_configs.find_one_and_update(
@@ -436,12 +444,11 @@ class CrawlConfigOps:
         schedule: Optional[bool] = None,
         sort_by: str = "lastRun",
         sort_direction: int = -1,
+        next_token: Optional[str] = None,
+        include_total: bool = True,
     ):
         """Get all crawl configs for an organization is a member of"""
         # pylint: disable=too-many-locals,too-many-branches
-        # Zero-index page for query
-        page = page - 1
-        skip = page * page_size
 
         match_query = {"oid": org.id, "inactive": {"$ne": True}}
 
@@ -466,19 +473,16 @@ class CrawlConfigOps:
             else:
                 match_query["schedule"] = {"$in": ["", None]}
 
+        if first_seed:
+            match_query["firstSeed"] = first_seed
+
         # pylint: disable=duplicate-code
         aggregate = [
             {"$match": match_query},
-            {"$set": {"firstSeedObject": {"$arrayElemAt": ["$config.seeds", 0]}}},
-            {"$set": {"seedCount": {"$size": "$config.seeds"}}},
-            # Set firstSeed
-            {"$set": {"firstSeed": "$firstSeedObject.url"}},
-            {"$unset": ["firstSeedObject", "config"]},
+            {"$unset": ["config"]},
         ]
 
-        if first_seed:
-            aggregate.extend([{"$match": {"firstSeed": first_seed}}])
-
+        sort_query: Optional[Dict[str, int]] = None
         if sort_by:
             if sort_by not in ALLOWED_SORT_KEYS:
                 raise HTTPException(status_code=400, detail="invalid_sort_by")
@@ -496,41 +500,26 @@ class CrawlConfigOps:
             elif sort_by in ("lastRun", "lastCrawlTime", "lastCrawlStartTime"):
                 sort_query["modified"] = sort_direction
 
-            aggregate.extend([{"$sort": sort_query}])
-
-        aggregate.extend(
-            [
-                {
-                    "$facet": {
-                        "items": [
-                            {"$skip": skip},
-                            {"$limit": page_size},
-                        ],
-                        "total": [{"$count": "count"}],
-                    }
-                },
-            ]
+        items, total, next_token = await paginate_aggregate(
+            self.crawl_configs,
+            aggregate,
+            sort_query,
+            page,
+            page_size,
+            next_token,
+            include_total,
         )
 
-        cursor = self.crawl_configs.aggregate(aggregate)
-        results = await cursor.to_list(length=1)
-        result = results[0]
-        items = result["items"]
+        configs = [CrawlConfigOut.from_dict(res) for res in items]
 
-        try:
-            total = int(result["total"][0]["count"])
-        except (IndexError, ValueError):
-            total = 0
+        running_crawls = await self.get_running_crawls_by_cid(
+            [config.id for config in configs if not config.inactive]
+        )
 
-        configs = []
-        for res in items:
-            config = CrawlConfigOut.from_dict(res)
-            # pylint: disable=invalid-name
-            if not config.inactive:
-                self._add_curr_crawl_stats(config, await self.get_running_crawl(config))
-            configs.append(config)
+        for config in configs:
+            self._add_curr_crawl_stats(config, running_crawls.get(config.id))
 
-        return configs, total
+        return configs, total, next_token
 
     async def get_crawl_config_info_for_profile(
         self, profileid: UUID, org: Organization
@@ -557,7 +546,7 @@ class CrawlConfigOps:
     ) -> Optional[CrawlOut]:
         """Return the id of currently running crawl for this config, if any"""
         # crawls = await self.crawl_manager.list_running_crawls(cid=crawlconfig.id)
-        crawls, _ = await self.crawl_ops.list_crawls(
+        crawls, _, _ = await self.crawl_ops.list_crawls(
             cid=crawlconfig.id, running_only=True
         )
 
@@ -566,6 +555,34 @@ class CrawlConfigOps:
 
         return None
 
+    async def get_running_crawls_by_cid(self, cids: List[UUID]) -> Dict[UUID, dict]:
+        """Return state and stats of currently running crawl for each of the
+        given configs that has exactly one, fetched in a single query"""
+        if not cids:
+            return {}
+
+        cursor = self.crawls.find(
+            {
+                "cid": {"$in": cids},
+                "type": {"$in": ["crawl", None]},
+                "state": {"$in": RUNNING_AND_STARTING_STATES},
+            },
+            projection=["cid", "state", "stats", "stopping"],
+        )
+
+        running_crawls: Dict[UUID, dict] = {}
+        multiple = set()
+        async for crawl in cursor:
+            cid = crawl["cid"]
+            if cid in running_crawls:
+                multiple.add(cid)
+            running_crawls[cid] = crawl
+
+        for cid in multiple:
+            running_crawls.pop(cid)
+
+        return running_crawls
+
     async def stats_recompute_last(self, cid: UUID, size: int, inc_crawls: int = 1):
         """recompute stats by incrementing size counter and number of crawls"""
         update_query: dict[str, object] = {
@@ -614,16 +631,14 @@ class CrawlConfigOps:
 
         return result is not None
 
-    def _add_curr_crawl_stats(
-        self, crawlconfig: CrawlConfigOut, crawl: Optional[CrawlOut]
-    ):
+    def _add_curr_crawl_stats(self, crawlconfig: CrawlConfigOut, crawl: Optional[dict]):
         """Add stats from current running crawl, if any"""
         if not crawl:
             return
 
-        crawlconfig.lastCrawlState = crawl.state
-        crawlconfig.lastCrawlSize = crawl.stats.size if crawl.stats else 0
-        crawlconfig.lastCrawlStopping = crawl.stopping
+        crawlconfig.lastCrawlState = crawl.get("state")
+        crawlconfig.lastCrawlSize = (crawl.get("stats") or {}).get("size", 0)
+        crawlconfig.lastCrawlStopping = crawl.get("stopping", False)
 
     async def get_crawl_config_out(self, cid: UUID, org: Organization):
         """Return CrawlConfigOut, including state of currently running crawl, if active
@@ -638,39 +653,18 @@ class CrawlConfigOps:
             )
 
         if not crawlconfig.inactive:
-            self._add_curr_crawl_stats(
-                crawlconfig, await self.get_running_crawl(crawlconfig)
-            )
+            running_crawls = await self.get_running_crawls_by_cid([cid])
+            self._add_curr_crawl_stats(crawlconfig, running_crawls.get(cid))
 
         if crawlconfig.profileid:
             crawlconfig.profileName = await self.profiles.get_profile_name(
                 crawlconfig.profileid, org
             )
 
-        if crawlconfig.config and crawlconfig.config.seeds:
-            crawlconfig.firstSeed = crawlconfig.config.seeds[0].url
-
-        crawlconfig.seedCount = await self.get_crawl_config_seed_count(cid, org)
-
         crawlconfig.config.seeds = None
 
         return crawlconfig
 
-    async def get_crawl_config_seed_count(self, cid: UUID, org: Organization):
-        """Return count of seeds in crawl config"""
-        cursor = self.crawl_configs.aggregate(
-            [
-                {"$match": {"_id": cid, "oid": org.id}},
-                {"$project": {"seedCount": {"$size": "$config.seeds"}}},
-            ]
-        )
-        results = await cursor.to_list(length=1)
-        result = results[0]
-        seed_count = result["seedCount"]
-        if seed_count:
-            return int(seed_count)
-        return 0
-
     async def get_crawl_config(
         self,
         cid: UUID,
@@ -797,20 +791,17 @@ class CrawlConfigOps:
         names = await self.crawl_configs.distinct("name", {"oid": org.id})
         descriptions = await self.crawl_configs.distinct("description", {"oid": org.id})
         workflow_ids = await self.crawl_configs.distinct("_id", {"oid": org.id})
+        first_seeds = await self.crawl_configs.distinct("firstSeed", {"oid": org.id})
 
         # Remove empty strings
         names = [name for name in names if name]
         descriptions = [description for description in descriptions if description]
-
-        first_seeds = set()
-        async for config in self.crawl_configs.find({"oid": org.id}):
-            first_seed = config["config"]["seeds"][0]["url"]
-            first_seeds.add(first_seed)
+        first_seeds = [first_seed for first_seed in first_seeds if first_seed]
 
         return {
             "names": names,
             "descriptions": descriptions,
-            "firstSeeds": list(first_seeds),
+            "firstSeeds": first_seeds,
             "workflowIds": workflow_ids,
         }
 
@@ -1033,6 +1024,8 @@ def init_crawl_config_api(
         schedule: Optional[bool] = None,
         sortBy: str = "",
         sortDirection: int = -1,
+        nextToken: Optional[str] = Query(default=None, alias="next"),
+        includeTotal: bool = False,
     ):
         # pylint: disable=duplicate-code
         if firstSeed:
@@ -1044,7 +1037,7 @@ def init_crawl_config_api(
         if description:
             description = urllib.parse.unquote(description)
 
-        crawl_configs, total = await ops.get_crawl_configs(
+        crawl_configs, total, next_token = await ops.get_crawl_configs(
             org,
             created_by=userid,
             modified_by=modifiedBy,
@@ -1057,8 +1050,10 @@ def init_crawl_config_api(
             page=page,
             sort_by=sortBy,
             sort_direction=sortDirection,
+            next_token=nextToken,
+            include_total=includeTotal,
         )
-        return paginated_format(crawl_configs, total, page, pageSize)
+        return paginated_format(crawl_configs, total, page, pageSize, next_token)
 
     @router.get("/tags")
     async def get_crawl_config_tags(org: Organization = Depends(org_viewer_dep)):
@@ -2,22 +2,24 @@
 
 # pylint: disable=too-many-lines
 
+import asyncio
 import json
 import os
 import re
+import time
 import contextlib
 import urllib.parse
 from datetime import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from typing import Optional, List, Dict, Union, Any, Sequence
+from typing import Optional, List, Dict, Union, Any, Sequence, Tuple, AsyncIterator
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from redis import asyncio as exceptions
 import pymongo
 
-from .pagination import DEFAULT_PAGE_SIZE, paginated_format
+from .pagination import DEFAULT_PAGE_SIZE, paginate_aggregate, paginated_format
 from .utils import dt_now, parse_jsonl_error_messages, stream_dict_list_as_csv
 from .basecrawls import BaseCrawlOps
 from .crawlmanager import CrawlManager
@@ -40,6 +42,7 @@ from .models import (
     Organization,
     User,
     PaginatedResponse,
+    CrawlLogCounts,
     RUNNING_AND_STARTING_STATES,
     SUCCESSFUL_STATES,
     NON_RUNNING_STATES,
@@ -51,6 +54,71 @@ from .models import (
 MAX_MATCH_SIZE = 500000
 DEFAULT_RANGE_LIMIT = 50
 
+# max number of recent log lines kept in live log stream of running crawl
+DEFAULT_LIVE_LOG_MAX_LEN = 10000
+
+# max number of clients tailing live logs of a single crawl at once
+DEFAULT_LIVE_LOG_MAX_CLIENTS = 5
+
+# max wait for new live log lines before checking if crawl is still running
+LIVE_LOG_BLOCK_MS = 5000
+
+# max live log lines read per client per read
+LIVE_LOG_READ_COUNT = 100
+
+# live log client slot expires if not refreshed, eg. if client disconnected
+# without releasing it or backend restarted
+LIVE_LOG_CLIENTS_TTL_SECS = 60
+
+# wait before retrying live log read after redis connection error
+LIVE_LOG_RETRY_SECS = 2
+
+
+# update pipeline recomputing summary of qa runs stored on crawl,
+# from finished qa runs and active qa run, if any
+QA_SUMMARY_UPDATE: List[Dict[str, Any]] = [
+    {
+        "$set": {
+            "_qaRuns": {
+                "$concatArrays": [
+                    {
+                        "$map": {
+                            "input": {
+                                "$objectToArray": {"$ifNull": ["$qaFinished", {}]}
+                            },
+                            "in": "$$this.v",
+                        }
+                    },
+                    {
+                        "$cond": [
+                            {"$ne": [{"$ifNull": ["$qa", None]}, None]},
+                            ["$qa"],
+                            [],
+                        ]
+                    },
+                ]
+            }
+        }
+    },
+    {
+        "$set": {
+            "_lastQARun": {
+                "$first": {
+                    "$sortArray": {"input": "$_qaRuns", "sortBy": {"started": -1}}
+                }
+            }
+        }
+    },
+    {
+        "$set": {
+            "qaRunCount": {"$size": "$_qaRuns"},
+            "lastQAState": {"$ifNull": ["$_lastQARun.state", None]},
+            "lastQAStarted": {"$ifNull": ["$_lastQARun.started", None]},
+        }
+    },
+    {"$unset": ["_qaRuns", "_lastQARun"]},
+]
+
 
 # ============================================================================
 # pylint: disable=too-many-arguments, too-many-instance-attributes, too-many-public-methods
@@ -68,6 +136,13 @@ class CrawlOps(BaseCrawlOps):
 
         self.min_qa_crawler_image = os.environ.get("MIN_QA_CRAWLER_IMAGE")
 
+        self.live_log_max_len = int(
+            os.environ.get("LIVE_LOG_MAX_LEN") or DEFAULT_LIVE_LOG_MAX_LEN
+        )
+        self.live_log_max_clients = int(
+            os.environ.get("LIVE_LOG_MAX_CLIENTS") or DEFAULT_LIVE_LOG_MAX_CLIENTS
+        )
+
     async def init_index(self):
         """init index for crawls db collection"""
         await self.crawls.create_index([("type", pymongo.HASHED)])
@@ -94,6 +169,33 @@ class CrawlOps(BaseCrawlOps):
         await self.crawls.create_index([("state", pymongo.HASHED)])
         await self.crawls.create_index([("fileSize", pymongo.DESCENDING)])
 
+        await self.crawls.create_index(
+            [("oid", pymongo.ASCENDING), ("firstSeed", pymongo.ASCENDING)]
+        )
+
+        # for sorting archived items by qa summary
+        await self.crawls.create_index(
+            [("oid", pymongo.ASCENDING), ("lastQAStarted", pymongo.DESCENDING)]
+        )
+        await self.crawls.create_index(
+            [("oid", pymongo.ASCENDING), ("lastQAState", pymongo.ASCENDING)]
+        )
+        await self.crawls.create_index(
+            [("oid", pymongo.ASCENDING), ("qaRunCount", pymongo.DESCENDING)]
+        )
+
+        await self.crawl_errors.create_index(
+            [
+                ("crawl_id", pymongo.ASCENDING),
+                ("timestamp", pymongo.ASCENDING),
+                ("_id", pymongo.ASCENDING),
+            ]
+        )
+
+        await self.crawl_log_index.create_index(
+            [("crawl_id", pymongo.ASCENDING), ("filename", pymongo.ASCENDING)]
+        )
+
     async def get_crawl(
         self,
         crawlid: str,
@@ -108,12 +210,9 @@ class CrawlOps(BaseCrawlOps):
         """get redis url for crawl id"""
         redis_url = self.crawl_manager.get_redis_url(crawl_id)
 
-        redis = await self.crawl_manager.get_redis_client(redis_url)
-
-        try:
+        # pooled client, kept open for reuse, not evicted while in use
+        async with self.crawl_manager.hold_redis_client(redis_url) as redis:
             yield redis
-        finally:
-            await redis.close()
 
     async def list_crawls(
         self,
@@ -132,13 +231,11 @@ class CrawlOps(BaseCrawlOps):
         sort_by: Optional[str] = None,
         sort_direction: int = -1,
         resources: bool = False,
+        next_token: Optional[str] = None,
+        include_total: bool = True,
     ):
         """List all finished crawls from the db"""
         # pylint: disable=too-many-locals,too-many-branches,too-many-statements
-        # Zero-index page for query
-        page = page - 1
-        skip = page * page_size
-
         oid = org.id if org else None
 
         query: dict[str, object] = {"type": {"$in": ["crawl", None]}}
@@ -162,70 +259,13 @@ class CrawlOps(BaseCrawlOps):
         if crawl_id:
             query["_id"] = crawl_id
 
+        if first_seed:
+            query["firstSeed"] = first_seed
+
         # pylint: disable=duplicate-code
         aggregate = [
             {"$match": query},
-            {"$set": {"firstSeedObject": {"$arrayElemAt": ["$config.seeds", 0]}}},
-            {"$set": {"firstSeed": "$firstSeedObject.url"}},
-            {"$unset": ["firstSeedObject", "errors", "config"]},
-            {"$set": {"activeQAStats": "$qa.stats"}},
-            {
-                "$set": {
-                    "qaFinishedArray": {
-                        "$map": {
-                            "input": {"$objectToArray": "$qaFinished"},
-                            "in": "$$this.v",
-                        }
-                    }
-                }
-            },
-            # Add active QA run to array if exists prior to sorting, taking care not to
-            # pass null to $concatArrays so that our result isn't null
-            {
-                "$set": {
-                    "qaActiveArray": {"$cond": [{"$ne": ["$qa", None]}, ["$qa"], []]}
-                }
-            },
-            {
-                "$set": {
-                    "qaArray": {"$concatArrays": ["$qaFinishedArray", "$qaActiveArray"]}
-                }
-            },
-            {
-                "$set": {
-                    "sortedQARuns": {
-                        "$sortArray": {
-                            "input": "$qaArray",
-                            "sortBy": {"started": -1},
-                        }
-                    }
-                }
-            },
-            {"$set": {"lastQARun": {"$arrayElemAt": ["$sortedQARuns", 0]}}},
-            {"$set": {"lastQAState": "$lastQARun.state"}},
-            {"$set": {"lastQAStarted": "$lastQARun.started"}},
-            {
-                "$set": {
-                    "qaRunCount": {
-                        "$size": {
-                            "$cond": [
-                                {"$isArray": "$qaArray"},
-                                "$qaArray",
-                                [],
-                            ]
-                        }
-                    }
-                }
-            },
-            {
-                "$unset": [
-                    "lastQARun",
-                    "qaActiveArray",
-                    "qaFinishedArray",
-                    "qaArray",
-                    "sortedQARuns",
-                ]
-            },
+            {"$unset": ["config"]},
         ]
 
         if not resources:
@@ -237,12 +277,10 @@ class CrawlOps(BaseCrawlOps):
         if description:
             aggregate.extend([{"$match": {"description": description}}])
 
-        if first_seed:
-            aggregate.extend([{"$match": {"firstSeed": first_seed}}])
-
         if collection_id:
             aggregate.extend([{"$match": {"collectionIds": {"$in": [collection_id]}}}])
 
+        sort = None
         if sort_by:
             if sort_by not in (
                 "started",
@@ -258,47 +296,34 @@ class CrawlOps(BaseCrawlOps):
             if sort_direction not in (1, -1):
                 raise HTTPException(status_code=400, detail="invalid_sort_direction")
 
-            aggregate.extend([{"$sort": {sort_by: sort_direction}}])
+            sort = {sort_by: sort_direction}
 
-        aggregate.extend(
-            [
-                {
-                    "$facet": {
-                        "items": [
-                            {"$skip": skip},
-                            {"$limit": page_size},
-                        ],
-                        "total": [{"$count": "count"}],
-                    }
-                },
-            ]
+        items, total, next_token = await paginate_aggregate(
+            self.crawls,
+            aggregate,
+            sort,
+            page,
+            page_size,
+            next_token,
+            include_total,
         )
 
-        # Get total
-        cursor = self.crawls.aggregate(aggregate)
-        results = await cursor.to_list(length=1)
-        result = results[0]
-        items = result["items"]
-
-        try:
-            total = int(result["total"][0]["count"])
-        except (IndexError, ValueError):
-            total = 0
-
         cls = CrawlOut
         if resources:
             cls = CrawlOutWithResources
 
         crawls = []
+        to_resolve = []
         for result in items:
+            result["activeQAStats"] = (result.get("qa") or {}).get("stats")
             crawl = cls.from_dict(result)
             files = result.get("files") if resources else None
-            crawl = await self._resolve_crawl_refs(
-                crawl, org, files=files, add_first_seed=False
-            )
+            to_resolve.append((crawl, files))
             crawls.append(crawl)
 
-        return crawls, total
+        await self._resolve_crawls_refs(to_resolve, org)
+
+        return crawls, total, next_token
 
     async def delete_crawls(
         self,
@@ -309,18 +334,13 @@ class CrawlOps(BaseCrawlOps):
     ):
         """Delete a list of crawls by id for given org"""
 
-        count, cids_to_update, quota_reached = await super().delete_crawls(
+        count, quota_reached = await super().delete_crawls(
             org, delete_list, type_, user
         )
 
         if count < 1:
             raise HTTPException(status_code=404, detail="crawl_not_found")
 
-        for cid, cid_dict in cids_to_update.items():
-            cid_size = cid_dict["size"]
-            cid_inc = cid_dict["inc"]
-            await self.crawl_configs.stats_recompute_last(cid, -cid_size, -cid_inc)
-
         return {"deleted": True, "storageQuotaReached": quota_reached}
 
     # pylint: disable=too-many-arguments
@@ -352,6 +372,7 @@ class CrawlOps(BaseCrawlOps):
             scale=crawlconfig.scale,
             jobType=crawlconfig.jobType,
             config=crawlconfig.config,
+            **crawlconfig.config.get_seed_fields(),
             profileid=crawlconfig.profileid,
             schedule=crawlconfig.schedule,
             crawlTimeout=crawlconfig.crawlTimeout,
@@ -518,6 +539,9 @@ class CrawlOps(BaseCrawlOps):
         prefix = "" if not is_qa else "qa."
 
         update: Dict[str, Any] = {f"{prefix}state": state}
+        if is_qa:
+            # active qa run is always the last qa run
+            update["lastQAState"] = state
         if finished:
             update[f"{prefix}finished"] = finished
         if stats:
@@ -587,18 +611,246 @@ class CrawlOps(BaseCrawlOps):
             return None, None
         return res.get("state"), res.get("finished")
 
-    async def add_crawl_error(
+    async def add_crawl_errors(
         self,
         crawl_id: str,
-        is_qa: bool,
-        error: str,
+        qa_run_id: Optional[str],
+        errors: List[str],
     ):
-        """add crawl error from redis to mongodb errors field"""
-        prefix = "" if not is_qa else "qa."
+        """add batch of json-l crawl errors from redis to crawl_errors collection"""
+        error_docs = get_crawl_error_docs(crawl_id, qa_run_id, errors)
+        if not error_docs:
+            return
 
-        await self.crawls.find_one_and_update(
-            {"_id": crawl_id}, {"$push": {f"{prefix}errors": error}}
+        await self.crawl_errors.insert_many(error_docs, ordered=False)
+
+    async def get_crawl_errors(
+        self,
+        crawl_id: str,
+        qa_run_id: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        page: int = 1,
+        log_levels: Optional[List[str]] = None,
+        contexts: Optional[List[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """get page of crawl errors (or qa run errors, if qa_run_id provided),
+        sorted by timestamp and optionally filtered by log level and context"""
+        skip = (page - 1) * page_size
+
+        query: Dict[str, Any] = {"crawl_id": crawl_id, "qa_run_id": qa_run_id}
+        if log_levels:
+            query["logLevel"] = {"$in": log_levels}
+        if contexts:
+            query["context"] = {"$in": contexts}
+
+        total = await self.crawl_errors.count_documents(query)
+
+        cursor = self.crawl_errors.find(
+            query, projection={"_id": 0, "crawl_id": 0, "qa_run_id": 0}
+        )
+        cursor = cursor.sort([("timestamp", 1), ("_id", 1)])
+        cursor = cursor.skip(skip).limit(page_size)
+        errors = await cursor.to_list(length=page_size)
+
+        return errors, total
+
+    async def delete_crawl_errors(self, crawl_id: str, qa_run_id: Optional[str] = None):
+        """delete errors for crawl, or only for qa run if qa_run_id provided"""
+        query: Dict[str, Any] = {"crawl_id": crawl_id}
+        if qa_run_id:
+            query["qa_run_id"] = qa_run_id
+
+        await self.crawl_errors.delete_many(query)
+
+    async def add_live_log_lines(self, redis, crawl_id: str, lines: List[str]):
+        """add json-l log lines to capped live log stream of running crawl"""
+        if not lines:
+            return
+
+        async with redis.pipeline(transaction=False) as pipe:
+            for line in lines:
+                pipe.xadd(
+                    f"{crawl_id}:logs",
+                    {"line": line},
+                    maxlen=self.live_log_max_len,
+                    approximate=True,
+                )
+            await pipe.execute()
+
+    async def add_live_log_client(self, crawl_id: str) -> str:
+        """reserve one of the limited live log client slots for crawl.
+
+        Each client has its own entry in a sorted set, scored by when it
+        expires unless refreshed, so slots of clients that went away without
+        releasing them expire independently of other clients.
+        Return client id"""
+        key = f"{crawl_id}:logs:clients"
+        client_id = str(uuid4())
+        now = time.time()
+
+        async with self.get_redis(crawl_id) as redis:
+            await redis.zremrangebyscore(key, "-inf", now)
+            await redis.zadd(key, {client_id: now + LIVE_LOG_CLIENTS_TTL_SECS})
+            await redis.expire(key, LIVE_LOG_CLIENTS_TTL_SECS)
+
+            if await redis.zcard(key) > self.live_log_max_clients:
+                await redis.zrem(key, client_id)
+                raise HTTPException(status_code=429, detail="too_many_log_clients")
+
+        return client_id
+
+    async def tail_live_logs(
+        self,
+        crawl_id: str,
+        client_id: str,
+        log_levels: List[str],
+        contexts: List[str],
+    ) -> AsyncIterator[bytes]:
+        """Stream filtered log lines from live log stream of running crawl
+        as json-l, starting with recent lines, until crawl is no longer running.
+
+        Each client reads at its own pace from the capped stream, a client that
+        falls too far behind skips lines no longer in the stream.
+        Refreshes and finally releases client slot reserved with
+        add_live_log_client()"""
+        # pylint: disable=too-many-locals
+        stream_key = f"{crawl_id}:logs"
+        clients_key = f"{crawl_id}:logs:clients"
+        last_id = "0"
+
+        try:
+            while True:
+                try:
+                    async with self.get_redis(crawl_id) as redis:
+                        await redis.zadd(
+                            clients_key,
+                            {client_id: time.time() + LIVE_LOG_CLIENTS_TTL_SECS},
+                        )
+                        await redis.expire(clients_key, LIVE_LOG_CLIENTS_TTL_SECS)
+
+                        results = await redis.xread(
+                            {stream_key: last_id},
+                            count=LIVE_LOG_READ_COUNT,
+                            block=LIVE_LOG_BLOCK_MS,
+                        )
+
+                # redis may be unavailable only temporarily, eg. if connection
+                # pool is exhausted, so only stop if crawl actually finished
+                except exceptions.ConnectionError:
+                    results = None
+                    await asyncio.sleep(LIVE_LOG_RETRY_SECS)
+
+                if not results:
+                    state, _ = await self.get_crawl_state(crawl_id, False)
+                    if state not in RUNNING_AND_STARTING_STATES:
+                        break
+
+                    continue
+
+                lines = []
+
+                for entry_id, fields in results[0][1]:
+                    last_id = entry_id
+                    line = fields.get("line", "")
+
+                    try:
+                        line_dict = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+                    if log_levels and line_dict.get("logLevel") not in log_levels:
+                        continue
+                    if contexts and line_dict.get("context") not in contexts:
+                        continue
+
+                    lines.append(line.strip() + "\n")
+
+                if lines:
+                    yield "".join(lines).encode("utf-8")
+
+        finally:
+            # best effort, slot expires on its own if release is interrupted
+            try:
+                async with self.get_redis(crawl_id) as redis:
+                    await redis.zrem(clients_key, client_id)
+            except exceptions.ConnectionError:
+                pass
+
+    async def index_crawl_logs(self, crawl_id: str):
+        """build log index for all WACZs in finished crawl, one document
+        per log file, replacing any existing index"""
+        crawl = await self.get_crawl_out(crawl_id)
+
+        docs = []
+        for wacz_file in crawl.resources or []:
+            for member_name, blocks in await self.storage_ops.index_wacz_logs(
+                wacz_file
+            ):
+                docs.append(
+                    {
+                        "crawl_id": crawl_id,
+                        "oid": crawl.oid,
+                        "filename": wacz_file.name,
+                        "member": member_name,
+                        "blocks": blocks,
+                    }
+                )
+
+        await self.crawl_log_index.delete_many({"crawl_id": crawl_id})
+        if docs:
+            await self.crawl_log_index.insert_many(docs, ordered=False)
+
+    async def get_crawl_log_index(
+        self, crawl_id: str
+    ) -> Optional[Dict[Tuple[str, str], List[Dict[str, Any]]]]:
+        """return log index blocks by (WACZ filename, log member name),
+        or None if crawl logs have not been indexed"""
+        cursor = self.crawl_log_index.find(
+            {"crawl_id": crawl_id}, projection={"blocks.counts.count": 0}
+        )
+
+        log_index = {}
+        async for doc in cursor:
+            log_index[(doc["filename"], doc["member"])] = doc["blocks"]
+
+        return log_index or None
+
+    async def get_crawl_log_counts(self, crawl_id: str) -> CrawlLogCounts:
+        """return counts of log lines per log level and context from log index"""
+        cursor = self.crawl_log_index.aggregate(
+            [
+                {"$match": {"crawl_id": crawl_id}},
+                {"$unwind": "$blocks"},
+                {"$unwind": "$blocks.counts"},
+                {
+                    "$group": {
+                        "_id": {
+                            "logLevel": "$blocks.counts.logLevel",
+                            "context": "$blocks.counts.context",
+                        },
+                        "count": {"$sum": "$blocks.counts.count"},
+                    }
+                },
+            ]
         )
+        results = await cursor.to_list(length=None)
+
+        if not results and not await self.crawl_log_index.find_one(
+            {"crawl_id": crawl_id}, projection={"_id": 1}
+        ):
+            raise HTTPException(status_code=404, detail="log_index_not_found")
+
+        counts = CrawlLogCounts()
+        for result in results:
+            log_level = result["_id"]["logLevel"]
+            context = result["_id"]["context"]
+            count = result["count"]
+
+            counts.total += count
+            counts.logLevels[log_level] = counts.logLevels.get(log_level, 0) + count
+            counts.contexts[context] = counts.contexts.get(context, 0) + count
+
+        return counts
 
     async def add_crawl_file(
         self, crawl_id: str, is_qa: bool, crawl_file: CrawlFile, size: int
@@ -795,7 +1047,10 @@ class CrawlOps(BaseCrawlOps):
                 {
                     "$set": {
                         "qa": qa_run.dict(),
-                    }
+                        "lastQAState": qa_run.state,
+                        "lastQAStarted": qa_run.started,
+                    },
+                    "$inc": {"qaRunCount": 1},
                 },
             )
 
@@ -840,6 +1095,7 @@ class CrawlOps(BaseCrawlOps):
         for qa_run_id in delete_list.qa_run_ids:
             await self.page_ops.delete_qa_run_from_pages(crawl_id, qa_run_id)
             await self.delete_crawl_qa_run_files(crawl_id, qa_run_id, org)
+            await self.delete_crawl_errors(crawl_id, qa_run_id)
 
             res = await self.crawls.find_one_and_update(
                 {"_id": crawl_id, "type": "crawl"},
@@ -849,6 +1105,8 @@ class CrawlOps(BaseCrawlOps):
             if res:
                 count += 1
 
+        await self.update_qa_summary(crawl_id)
+
         return {"deleted": count}
 
     async def delete_crawl_qa_run_files(
@@ -856,13 +1114,12 @@ class CrawlOps(BaseCrawlOps):
     ):
         """delete crawl qa wacz files"""
         qa_run = await self.get_qa_run(crawl_id, qa_run_id, org)
-        for file_ in qa_run.files:
-            if not await self.storage_ops.delete_crawl_file_object(org, file_):
-                raise HTTPException(status_code=400, detail="file_deletion_error")
-            # Not replicating QA run WACZs yet
-            # await self.background_job_ops.create_delete_replica_jobs(
-            #     org, file_, qa_run_id, "qa"
-            # )
+        await self._delete_qa_run_files(crawl_id, {qa_run_id: qa_run}, org)
+        # Not replicating QA run WACZs yet
+        # for file_ in qa_run.files:
+        #     await self.background_job_ops.create_delete_replica_jobs(
+        #         org, file_, qa_run_id, "qa"
+        #     )
 
     async def qa_run_finished(self, crawl_id: str):
         """clear active qa, add qa run to finished list, if successful"""
@@ -879,10 +1136,19 @@ class CrawlOps(BaseCrawlOps):
         if await self.crawls.find_one_and_update(
             {"_id": crawl_id, "type": "crawl"}, {"$set": query}
         ):
+            # qa run count and last qa run change if qa run not kept
+            await self.update_qa_summary(crawl_id)
             return True
 
         return False
 
+    async def update_qa_summary(self, crawl_id: str):
+        """recompute last qa state, last qa started and qa run count
+        stored on crawl for listing and sorting, from all qa runs"""
+        await self.crawls.update_one(
+            {"_id": crawl_id, "type": "crawl"}, QA_SUMMARY_UPDATE
+        )
+
     async def get_qa_runs(
         self,
         crawl_id: str,
@@ -962,11 +1228,12 @@ class CrawlOps(BaseCrawlOps):
         thresholds: Dict[str, List[float]],
     ) -> QARunAggregateStatsOut:
         """Get aggregate stats for QA run"""
+        histogram = await self.page_ops.get_qa_run_histogram(crawl_id, qa_run_id)
         screenshot_results = await self.page_ops.get_qa_run_aggregate_counts(
-            crawl_id, qa_run_id, thresholds, key="screenshotMatch"
+            crawl_id, qa_run_id, thresholds, key="screenshotMatch", histogram=histogram
         )
         text_results = await self.page_ops.get_qa_run_aggregate_counts(
-            crawl_id, qa_run_id, thresholds, key="textMatch"
+            crawl_id, qa_run_id, thresholds, key="textMatch", histogram=histogram
         )
         return QARunAggregateStatsOut(
             screenshotMatch=screenshot_results,
@@ -992,6 +1259,21 @@ async def recompute_crawl_file_count_and_size(crawls, crawl_id):
     )
 
 
+# ============================================================================
+def get_crawl_error_docs(
+    crawl_id: str, qa_run_id: Optional[str], errors: List[str]
+) -> List[Dict[str, Any]]:
+    """parse json-l error lines into crawl_errors documents"""
+    error_docs = []
+    for error in parse_jsonl_error_messages(errors):
+        error["_id"] = uuid4()
+        error["crawl_id"] = crawl_id
+        error["qa_run_id"] = qa_run_id
+        error_docs.append(error)
+
+    return error_docs
+
+
 # ============================================================================
 # pylint: disable=too-many-arguments, too-many-locals, too-many-statements
 def init_crawls_api(crawl_manager: CrawlManager, app, user_dep, *args):
@@ -1018,6 +1300,8 @@ def init_crawls_api(crawl_manager: CrawlManager, app, user_dep, *args):
         sortBy: Optional[str] = None,
         sortDirection: int = -1,
         runningOnly: Optional[bool] = True,
+        nextToken: Optional[str] = Query(default=None, alias="next"),
+        includeTotal: bool = False,
     ):
         if not user.is_superuser:
             raise HTTPException(status_code=403, detail="Not Allowed")
@@ -1035,7 +1319,7 @@ def init_crawls_api(crawl_manager: CrawlManager, app, user_dep, *args):
         if description:
             description = urllib.parse.unquote(description)
 
-        crawls, total = await ops.list_crawls(
+        crawls, total, next_token = await ops.list_crawls(
             None,
             userid=userid,
             cid=cid,
@@ -1049,8 +1333,10 @@ def init_crawls_api(crawl_manager: CrawlManager, app, user_dep, *args):
             page=page,
             sort_by=sortBy,
             sort_direction=sortDirection,
+            next_token=nextToken,
+            include_total=includeTotal,
         )
-        return paginated_format(crawls, total, page, pageSize)
+        return paginated_format(crawls, total, page, pageSize, next_token)
 
     @app.get("/orgs/{oid}/crawls", tags=["crawls"], response_model=PaginatedResponse)
     async def list_crawls(
@@ -1066,6 +1352,8 @@ def init_crawls_api(crawl_manager: CrawlManager, app, user_dep, *args):
         collectionId: Optional[UUID] = None,
         sortBy: Optional[str] = None,
         sortDirection: int = -1,
+        nextToken: Optional[str] = Query(default=None, alias="next"),
+        includeTotal: bool = False,
     ):
         # pylint: disable=duplicate-code
         states = []
@@ -1081,7 +1369,7 @@ def init_crawls_api(crawl_manager: CrawlManager, app, user_dep, *args):
         if description:
             description = urllib.parse.unquote(description)
 
-        crawls, total = await ops.list_crawls(
+        crawls, total, next_token = await ops.list_crawls(
             org,
             userid=userid,
             cid=cid,
@@ -1095,8 +1383,10 @@ def init_crawls_api(crawl_manager: CrawlManager, app, user_dep, *args):
             page=page,
             sort_by=sortBy,
             sort_direction=sortDirection,
+            next_token=nextToken,
+            include_total=includeTotal,
         )
-        return paginated_format(crawls, total, page, pageSize)
+        return paginated_format(crawls, total, page, pageSize, next_token)
 
     @app.post(
         "/orgs/{oid}/crawls/{crawl_id}/cancel",
@@ -1272,7 +1562,7 @@ def init_crawls_api(crawl_manager: CrawlManager, app, user_dep, *args):
         if not user.is_superuser:
             raise HTTPException(status_code=403, detail="Not Allowed")
 
-        crawls, _ = await ops.list_crawls(crawl_id=crawl_id)
+        crawls, _, _ = await ops.list_crawls(crawl_id=crawl_id)
         if len(crawls) < 1:
             raise HTTPException(status_code=404, detail="crawl_not_found")
 
@@ -1284,7 +1574,7 @@ def init_crawls_api(crawl_manager: CrawlManager, app, user_dep, *args):
         response_model=CrawlOut,
     )
     async def list_single_crawl(crawl_id, org: Organization = Depends(org_viewer_dep)):
-        crawls, _ = await ops.list_crawls(org, crawl_id=crawl_id)
+        crawls, _, _ = await ops.list_crawls(org, crawl_id=crawl_id)
         if len(crawls) < 1:
             raise HTTPException(status_code=404, detail="crawl_not_found")
 
@@ -1409,8 +1699,14 @@ def init_crawls_api(crawl_manager: CrawlManager, app, user_dep, *args):
 
         # If crawl is finished, stream logs from WACZ files using presigned urls
         if crawl.finished:
-            resp = await ops.storage_ops.sync_stream_wacz_logs(
-                crawl.resources or [], log_levels, contexts
+            log_index = None
+            # if filtered, only read index blocks with matching lines. compressed
+            # logs are still read from start to last matching block
+            if log_levels or contexts:
+                log_index = await ops.get_crawl_log_index(crawl_id)
+
+            resp = ops.storage_ops.stream_wacz_logs(
+                crawl.resources or [], log_levels, contexts, log_index
             )
             return StreamingResponse(
                 resp,
@@ -1420,8 +1716,35 @@ def init_crawls_api(crawl_manager: CrawlManager, app, user_dep, *args):
                 },
             )
 
+        # If crawl is running, tail live logs from crawl redis
+        if crawl.state in RUNNING_AND_STARTING_STATES:
+            try:
+                client_id = await ops.add_live_log_client(crawl_id)
+            except exceptions.ConnectionError:
+                # pylint: disable=raise-missing-from
+                raise HTTPException(status_code=400, detail="crawl_not_finished")
+
+            return StreamingResponse(
+                ops.tail_live_logs(crawl_id, client_id, log_levels, contexts),
+                media_type="text/jsonl",
+            )
+
         raise HTTPException(status_code=400, detail="crawl_not_finished")
 
+    @app.get(
+        "/orgs/{oid}/crawls/{crawl_id}/logs/counts",
+        tags=["crawls"],
+        response_model=CrawlLogCounts,
+    )
+    async def get_crawl_log_counts(
+        crawl_id: str,
+        org: Organization = Depends(org_viewer_dep),
+    ):
+        # ensure crawl exists in org
+        await ops.get_crawl_raw(crawl_id, org, "crawl", project={"_id": True})
+
+        return await ops.get_crawl_log_counts(crawl_id)
+
     @app.get(
         "/orgs/{oid}/crawls/{crawl_id}/errors",
         tags=["crawls"],
@@ -1430,15 +1753,23 @@ def init_crawls_api(crawl_manager: CrawlManager, app, user_dep, *args):
         crawl_id: str,
         pageSize: int = DEFAULT_PAGE_SIZE,
         page: int = 1,
+        logLevel: Optional[str] = None,
+        context: Optional[str] = None,
         org: Organization = Depends(org_viewer_dep),
     ):
-        crawl = await ops.get_crawl(crawl_id, org)
+        # ensure crawl exists in org
+        await ops.get_crawl_raw(crawl_id, org, "crawl", project={"_id": True})
 
-        skip = (page - 1) * pageSize
-        upper_bound = skip + pageSize
+        log_levels = logLevel.split(",") if logLevel else None
+        contexts = context.split(",") if context else None
 
-        errors = crawl.errors[skip:upper_bound] if crawl.errors else []
-        parsed_errors = parse_jsonl_error_messages(errors)
-        return paginated_format(parsed_errors, len(crawl.errors or []), page, pageSize)
+        errors, total = await ops.get_crawl_errors(
+            crawl_id,
+            page_size=pageSize,
+            page=page,
+            log_levels=log_levels,
+            contexts=contexts,
+        )
+        return paginated_format(errors, total, page, pageSize)
 
     return ops
@@ -13,12 +13,11 @@ from kubernetes_asyncio.client.api import custom_objects_api
 from kubernetes_asyncio.utils import create_from_dict
 from kubernetes_asyncio.client.exceptions import ApiException
 
-from redis import asyncio as aioredis
-
 from fastapi import HTTPException
 from fastapi.templating import Jinja2Templates
 
 from .utils import get_templates_dir, dt_now
+from .redis_pool import RedisClientPool
 
 
 # ============================================================================
@@ -52,6 +51,8 @@ class K8sAPI:
         self.add_custom_resource("CrawlJob", "crawljobs")
         self.add_custom_resource("ProfileJob", "profilejobs")
 
+        self.redis_pool = RedisClientPool()
+
     def add_custom_resource(self, name, plural):
         """add custom resource"""
         self.custom_resources[name] = plural
@@ -68,13 +69,22 @@ class K8sAPI:
         return redis_url
 
     async def get_redis_client(self, redis_url):
-        """return redis client with correct params for one-time use"""
-        return aioredis.from_url(
-            redis_url,
-            decode_responses=True,
-            auto_close_connection_pool=True,
-            socket_timeout=20,
-        )
+        """return long-lived pooled redis client for redis url,
+        client should not be closed by caller"""
+        return await self.redis_pool.get(redis_url)
+
+    def hold_redis_client(self, redis_url):
+        """return context manager for pooled redis client for redis url,
+        which is not evicted as idle while held"""
+        return self.redis_pool.hold(redis_url)
+
+    async def close_redis_clients(self):
+        """close all pooled redis clients, on shutdown"""
+        await self.redis_pool.close_all()
+
+    async def remove_redis_client(self, redis_url):
+        """close and remove pooled redis client, eg. when crawl is finished"""
+        await self.redis_pool.remove(redis_url)
 
     # pylint: disable=too-many-arguments, too-many-locals
     def new_crawl_job_yaml(
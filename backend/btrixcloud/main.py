@@ -154,7 +154,7 @@ def main():
     crawls = init_crawls_api(crawl_manager, *base_crawl_init)
 
     page_ops = init_pages_api(
-        app, mdb, crawls, org_ops, storage_ops, current_active_user
+        app, mdb, crawls, org_ops, storage_ops, background_job_ops, current_active_user
     )
 
     base_crawl_ops.set_page_ops(page_ops)
@@ -184,11 +184,20 @@ def main():
                 db_inited,
             )
         )
+        asyncio.create_task(org_ops.run_org_metrics_reconcile_loop(db_inited))
+        asyncio.create_task(
+            background_job_ops.run_resume_interrupted_jobs_loop(db_inited)
+        )
     else:
         asyncio.create_task(await_db_and_migrations(mdb, db_inited))
 
     app.include_router(org_ops.router)
 
+    @app_root.on_event("shutdown")
+    async def shutdown():
+        await crawl_manager.close_redis_clients()
+        await storage_ops.close_http_session()
+
     @app.get("/settings")
     async def get_settings():
         if not db_inited.get("inited"):
@@ -27,7 +27,7 @@ app_root = FastAPI()
 
 
 # ============================================================================
-# pylint: disable=too-many-function-args, duplicate-code
+# pylint: disable=too-many-function-args, duplicate-code, too-many-locals
 def main():
     """main init"""
     email = EmailSender()
@@ -94,7 +94,7 @@ def main():
 
     background_job_ops.set_ops(crawl_ops, profile_ops)
 
-    return init_operator_api(
+    k8s = init_operator_api(
         app_root,
         crawl_config_ops,
         crawl_ops,
@@ -106,6 +106,14 @@ def main():
         page_ops,
     )
 
+    @app_root.on_event("shutdown")
+    async def shutdown():
+        await k8s.close_redis_clients()
+        await crawl_manager.close_redis_clients()
+        await storage_ops.close_http_session()
+
+    return k8s
+
 
 # ============================================================================
 @app_root.on_event("startup")
@@ -0,0 +1,76 @@
+"""
+Migration 0030 - Move crawl errors to crawl_errors collection
+"""
+
+from btrixcloud.crawls import get_crawl_error_docs
+from btrixcloud.migrations import BaseMigration
+
+
+MIGRATION_VERSION = "0030"
+
+
+class Migration(BaseMigration):
+    """Migration class."""
+
+    # pylint: disable=unused-argument
+    def __init__(self, mdb, **kwargs):
+        super().__init__(mdb, migration_version=MIGRATION_VERSION)
+
+    async def migrate_up(self):
+        """Perform migration up.
+
+        Move errors stored on crawls and finished QA runs into the
+        crawl_errors collection and remove them from the crawl documents
+        """
+        crawls_db = self.mdb["crawls"]
+        crawl_errors_db = self.mdb["crawl_errors"]
+
+        cursor = crawls_db.find(
+            {
+                "type": "crawl",
+                "$or": [
+                    {"errors.0": {"$exists": True}},
+                    {"qaFinished": {"$exists": True, "$ne": {}}},
+                ],
+            },
+            projection=["errors", "qaFinished"],
+        )
+        async for crawl_dict in cursor:
+            crawl_id = crawl_dict.get("_id")
+            try:
+                error_docs = get_crawl_error_docs(
+                    crawl_id, None, crawl_dict.get("errors") or []
+                )
+
+                unset_query = {"errors": ""}
+
+                qa_finished = crawl_dict.get("qaFinished") or {}
+                for qa_run_id, qa_run in qa_finished.items():
+                    error_docs.extend(
+                        get_crawl_error_docs(
+                            crawl_id, qa_run_id, qa_run.get("errors") or []
+                        )
+                    )
+                    unset_query[f"qaFinished.{qa_run_id}.errors"] = ""
+
+                if error_docs:
+                    # clear any errors copied in a previous partial run
+                    await crawl_errors_db.delete_many(
+                        {
+                            "crawl_id": crawl_id,
+                            "qa_run_id": {
+                                "$in": list({doc["qa_run_id"] for doc in error_docs})
+                            },
+                        }
+                    )
+                    await crawl_errors_db.insert_many(error_docs, ordered=False)
+
+                await crawls_db.find_one_and_update(
+                    {"_id": crawl_id, "type": "crawl"}, {"$unset": unset_query}
+                )
+            # pylint: disable=broad-exception-caught
+            except Exception as err:
+                print(
+                    f"Error moving errors for crawl {crawl_id}: {err}",
+                    flush=True,
+                )
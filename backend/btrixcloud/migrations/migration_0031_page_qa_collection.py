@@ -0,0 +1,70 @@
+"""
+Migration 0031 - Move page QA run data to page_qa collection
+"""
+
+from btrixcloud.migrations import BaseMigration
+from btrixcloud.models import PageQACompare
+from btrixcloud.pages import get_page_qa_update
+
+
+MIGRATION_VERSION = "0031"
+
+BATCH_SIZE = 1000
+
+
+class Migration(BaseMigration):
+    """Migration class."""
+
+    # pylint: disable=unused-argument
+    def __init__(self, mdb, **kwargs):
+        super().__init__(mdb, migration_version=MIGRATION_VERSION)
+
+    async def migrate_up(self):
+        """Perform migration up.
+
+        Move QA run comparison data stored on pages keyed by QA run id
+        into one page_qa entry per page and QA run, and remove it from pages
+        """
+        pages_db = self.mdb["pages"]
+        page_qa_db = self.mdb["page_qa"]
+
+        updates = []
+        page_ids = []
+
+        async def flush():
+            try:
+                if updates:
+                    await page_qa_db.bulk_write(updates, ordered=False)
+                if page_ids:
+                    await pages_db.update_many(
+                        {"_id": {"$in": page_ids}}, {"$unset": {"qa": ""}}
+                    )
+            finally:
+                updates.clear()
+                page_ids.clear()
+
+        cursor = pages_db.find({"qa": {"$exists": True}})
+        async for page_raw in cursor:
+            try:
+                for qa_run_id, compare_dict in (page_raw.get("qa") or {}).items():
+                    updates.append(
+                        get_page_qa_update(
+                            page_raw, qa_run_id, PageQACompare(**(compare_dict or {}))
+                        )
+                    )
+                page_ids.append(page_raw["_id"])
+
+                if len(page_ids) >= BATCH_SIZE:
+                    await flush()
+            # pylint: disable=broad-exception-caught
+            except Exception as err:
+                print(
+                    f"Error moving QA data for pages up to {page_raw.get('_id')}: {err}",
+                    flush=True,
+                )
+
+        try:
+            await flush()
+        # pylint: disable=broad-exception-caught
+        except Exception as err:
+            print(f"Error moving QA data for pages: {err}", flush=True)
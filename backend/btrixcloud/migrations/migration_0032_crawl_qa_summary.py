@@ -0,0 +1,31 @@
+"""
+Migration 0032 - Store QA run summary on crawls
+"""
+
+from btrixcloud.crawls import QA_SUMMARY_UPDATE
+from btrixcloud.migrations import BaseMigration
+
+
+MIGRATION_VERSION = "0032"
+
+
+class Migration(BaseMigration):
+    """Migration class."""
+
+    # pylint: disable=unused-argument
+    def __init__(self, mdb, **kwargs):
+        super().__init__(mdb, migration_version=MIGRATION_VERSION)
+
+    async def migrate_up(self):
+        """Perform migration up.
+
+        Set qaRunCount, lastQAState and lastQAStarted on all crawls and uploads
+        from their QA runs, previously computed on every listing request
+        """
+        crawls_db = self.mdb["crawls"]
+
+        try:
+            await crawls_db.update_many({}, QA_SUMMARY_UPDATE)
+        # pylint: disable=broad-exception-caught
+        except Exception as err:
+            print(f"Error storing QA run summary on crawls: {err}", flush=True)
@@ -0,0 +1,43 @@
+"""
+Migration 0033 - Store firstSeed and seedCount on workflows and crawls
+"""
+
+from btrixcloud.migrations import BaseMigration
+
+
+MIGRATION_VERSION = "0033"
+
+SEED_FIELDS_UPDATE = [
+    {
+        "$set": {
+            "firstSeed": {"$first": {"$ifNull": ["$config.seeds.url", [None]]}},
+            "seedCount": {"$size": {"$ifNull": ["$config.seeds", []]}},
+        }
+    }
+]
+
+
+class Migration(BaseMigration):
+    """Migration class."""
+
+    # pylint: disable=unused-argument
+    def __init__(self, mdb, **kwargs):
+        super().__init__(mdb, migration_version=MIGRATION_VERSION)
+
+    async def migrate_up(self):
+        """Perform migration up.
+
+        Set firstSeed and seedCount from config seeds on all workflows
+        and crawls, previously computed on every listing request
+        """
+        for collection in ("crawl_configs", "crawls"):
+            try:
+                await self.mdb[collection].update_many(
+                    {"config.seeds": {"$exists": True}}, SEED_FIELDS_UPDATE
+                )
+            # pylint: disable=broad-exception-caught
+            except Exception as err:
+                print(
+                    f"Error storing firstSeed and seedCount on {collection}: {err}",
+                    flush=True,
+                )
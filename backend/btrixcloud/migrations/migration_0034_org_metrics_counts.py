@@ -0,0 +1,27 @@
+"""
+Migration 0034 - Store archived item, page, profile and collection counts on orgs
+"""
+
+from btrixcloud.orgs import OrgOps
+from btrixcloud.migrations import BaseMigration
+
+
+MIGRATION_VERSION = "0034"
+
+
+class Migration(BaseMigration):
+    """Migration class."""
+
+    # pylint: disable=unused-argument
+    def __init__(self, mdb, **kwargs):
+        super().__init__(mdb, migration_version=MIGRATION_VERSION)
+
+    async def migrate_up(self):
+        """Perform migration up.
+
+        Compute initial org metrics counts, which are then kept up to date
+        incrementally instead of being computed on every metrics request
+        """
+        org_ops = OrgOps(self.mdb, None)
+
+        await org_ops.recompute_stale_org_metrics()
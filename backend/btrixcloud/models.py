@@ -269,6 +269,14 @@ class RawCrawlConfig(BaseModel):
 
     userAgent: Optional[str] = None
 
+    def get_seed_fields(self) -> Dict[str, Any]:
+        """first seed url and seed count, stored with workflows and crawls"""
+        seeds = self.seeds or []
+        return {
+            "firstSeed": str(seeds[0].url) if seeds else None,
+            "seedCount": len(seeds),
+        }
+
 
 # ============================================================================
 class CrawlConfigIn(BaseModel):
@@ -390,6 +398,9 @@ class CrawlConfig(CrawlConfigCore, CrawlConfigAdditional):
     modifiedByName: Optional[str]
     lastStartedByName: Optional[str]
 
+    firstSeed: Optional[str] = None
+    seedCount: int = 0
+
     def get_raw_config(self):
         """serialize config for browsertrix-crawler"""
         return self.config.dict(exclude_unset=True, exclude_none=True)
@@ -514,6 +525,19 @@ class BaseFile(BaseModel):
     replicas: Optional[List[StorageRef]] = []
 
 
+# ============================================================================
+class ZipMember(BaseModel):
+    """Entry from central directory of a WACZ (zip) file"""
+
+    name: str
+    # offset of local file header
+    offset: int
+    compressedSize: int
+    size: int
+    # zip compression method, 0 = stored, 8 = deflated
+    method: int
+
+
 # ============================================================================
 class CrawlFile(BaseFile):
     """file from a crawl"""
@@ -522,6 +546,9 @@ class CrawlFile(BaseFile):
     expireAt: Optional[datetime]
     crc32: int = 0
 
+    # WACZ member listing, to read members without fetching central directory
+    members: Optional[List[ZipMember]] = None
+
 
 # ============================================================================
 class CrawlFileOut(BaseModel):
@@ -537,6 +564,8 @@ class CrawlFileOut(BaseModel):
     numReplicas: int = 0
     expireAt: Optional[str]
 
+    members: Optional[List[ZipMember]] = Field(default=None, exclude=True)
+
 
 # ============================================================================
 class CrawlStats(BaseModel):
@@ -547,6 +576,15 @@ class CrawlStats(BaseModel):
     size: int = 0
 
 
+# ============================================================================
+class CrawlLogCounts(BaseModel):
+    """Counts of crawl log lines, total and per log level and context"""
+
+    total: int = 0
+    logLevels: Dict[str, int] = {}
+    contexts: Dict[str, int] = {}
+
+
 # ============================================================================
 class CoreCrawlable(BaseModel):
     # pylint: disable=too-few-public-methods
@@ -573,8 +611,6 @@ class CoreCrawlable(BaseModel):
     fileSize: int = 0
     fileCount: int = 0
 
-    errors: Optional[List[str]] = []
-
 
 # ============================================================================
 class BaseCrawl(CoreCrawlable, BaseMongoModel):
@@ -595,6 +631,11 @@ class BaseCrawl(CoreCrawlable, BaseMongoModel):
 
     reviewStatus: Optional[conint(ge=1, le=5)] = None  # type: ignore
 
+    # summary of qa runs, updated when qa runs start, finish or are deleted
+    qaRunCount: int = 0
+    lastQAState: Optional[str] = None
+    lastQAStarted: Optional[datetime] = None
+
 
 # ============================================================================
 class CollIdName(BaseModel):
@@ -635,8 +676,6 @@ class CrawlOut(BaseMongoModel):
 
     tags: Optional[List[str]] = []
 
-    errors: Optional[List[str]] = []
-
     collectionIds: Optional[List[UUID]] = []
 
     crawlExecSeconds: int = 0
@@ -771,6 +810,9 @@ class Crawl(BaseCrawl, CrawlConfigCore):
 
     config: RawCrawlConfig
 
+    firstSeed: Optional[str] = None
+    seedCount: int = 0
+
     cid_rev: int = 0
 
     # schedule: Optional[str]
@@ -1065,6 +1107,19 @@ class Organization(BaseMongoModel):
     bytesStoredUploads: int = 0
     bytesStoredProfiles: int = 0
 
+    # archived item, profile and collection counts, kept up to date
+    # incrementally and periodically reconciled
+    crawlCount: int = 0
+    uploadCount: int = 0
+    pageCount: int = 0
+    profileCount: int = 0
+    collectionsCount: int = 0
+    publicCollectionsCount: int = 0
+    # incremented with every incremental update, so that reconciliation
+    # does not overwrite updates made while it was counting
+    metricsVersion: int = 0
+    metricsReconciled: Optional[datetime] = None
+
     # total usage + exec time
     usage: Dict[str, int] = {}
     crawlExecSeconds: Dict[str, int] = {}
@@ -1186,9 +1241,10 @@ class PaginatedResponse(BaseModel):
     """Paginated response model"""
 
     items: List[Any]
-    total: int
+    total: Optional[int]
     page: int
     pageSize: int
+    next: Optional[str] = None
 
 
 # ============================================================================
@@ -1475,6 +1531,8 @@ class BgJobType(str, Enum):
 
     CREATE_REPLICA = "create-replica"
     DELETE_REPLICA = "delete-replica"
+    READD_PAGES = "readd-pages"
+    DELETE_CRAWLS = "delete-crawls"
 
 
 # ============================================================================
@@ -1513,11 +1571,59 @@ class DeleteReplicaJob(BackgroundJob):
     replica_storage: StorageRef
 
 
+# ============================================================================
+class ReAddPagesJob(BackgroundJob):
+    """Model for tracking re-adding pages from WACZs for one or all org crawls"""
+
+    type: Literal[BgJobType.READD_PAGES] = BgJobType.READD_PAGES
+
+    # if not set, re-add pages for all finished crawls in org
+    crawl_id: Optional[str] = None
+
+    # all crawls to re-add pages for, fixed when job is created
+    crawl_ids: List[str] = []
+
+    crawls_total: int = 0
+
+    # checkpoint of crawls already processed, skipped on retry
+    completed_crawl_ids: List[str] = []
+    failed_crawl_ids: List[str] = []
+
+    # last time running attempt was known to be alive,
+    # used to resume attempts interrupted by restart
+    heartbeat: Optional[datetime] = None
+
+
+# ============================================================================
+class DeleteCrawlsJob(BackgroundJob):
+    """Model for tracking deletion of a list of crawls and uploads"""
+
+    type: Literal[BgJobType.DELETE_CRAWLS] = BgJobType.DELETE_CRAWLS
+
+    crawl_ids: List[str]
+
+    crawls_total: int = 0
+
+    # checkpoint of crawls already deleted, skipped on retry
+    completed_crawl_ids: List[str] = []
+    failed_crawl_ids: List[str] = []
+
+    # last time running attempt was known to be alive,
+    # used to resume attempts interrupted by restart
+    heartbeat: Optional[datetime] = None
+
+
 # ============================================================================
 class AnyJob(BaseModel):
     """Union of all job types, for response model"""
 
-    __root__: Union[CreateReplicaJob, DeleteReplicaJob, BackgroundJob]
+    __root__: Union[
+        CreateReplicaJob,
+        DeleteReplicaJob,
+        ReAddPagesJob,
+        DeleteCrawlsJob,
+        BackgroundJob,
+    ]
 
 
 # ============================================================================
@@ -3,7 +3,7 @@
 import traceback
 import os
 from pprint import pprint
-from typing import Optional, Any, Sequence
+from typing import Optional, Any, Sequence, Callable, Awaitable
 from datetime import datetime
 
 import json
@@ -77,6 +77,12 @@ MEM_SOFT_OOM_THRESHOLD = 1.0
 # set memory limit to this much of request for extra padding
 MEM_LIMIT_PADDING = 1.2
 
+# default number of entries to pop from redis lists per LPOP
+DEFAULT_DRAIN_BATCH_SIZE = 100
+
+# default max entries to drain from each redis list per sync
+DEFAULT_DRAIN_MAX_PER_SYNC = 5000
+
 
 # pylint: disable=too-many-public-methods, too-many-locals, too-many-branches, too-many-statements
 # pylint: disable=invalid-name, too-many-lines, too-many-return-statements
@@ -95,6 +101,17 @@ class CrawlOperator(BaseOperator):
 
         self.log_failed_crawl_lines = int(os.environ.get("LOG_FAILED_CRAWL_LINES") or 0)
 
+        # number of entries to pop from a redis list in a single LPOP
+        self.redis_drain_batch_size = int(
+            os.environ.get("REDIS_DRAIN_BATCH_SIZE") or DEFAULT_DRAIN_BATCH_SIZE
+        )
+
+        # max number of entries to pop from each redis list per sync,
+        # remaining entries are processed on next (fast) resync
+        self.redis_drain_max_per_sync = int(
+            os.environ.get("REDIS_DRAIN_MAX_PER_SYNC") or DEFAULT_DRAIN_MAX_PER_SYNC
+        )
+
     def init_routes(self, app):
         """init routes for this operator"""
 
@@ -213,13 +230,15 @@ class CrawlOperator(BaseOperator):
             for pod_name, pod in pods.items():
                 self.sync_resources(status, pod_name, pod, data.children)
 
-            status = await self.sync_crawl_state(
-                redis_url,
-                crawl,
-                status,
-                pods,
-                data.related.get(METRICS, {}),
-            )
+            # hold pooled redis client so it isn't evicted during sync
+            async with self.k8s.hold_redis_client(redis_url):
+                status = await self.sync_crawl_state(
+                    redis_url,
+                    crawl,
+                    status,
+                    pods,
+                    data.related.get(METRICS, {}),
+                )
 
             # auto-scaling not possible without pod metrics
             if self.k8s.has_pod_metrics:
@@ -707,8 +726,12 @@ class CrawlOperator(BaseOperator):
             else:
                 finalized = True
 
-        if finalized and crawl.is_qa:
-            await self.crawl_ops.qa_run_finished(crawl.db_crawl_id)
+        if finalized:
+            # crawl redis is gone, release pooled client
+            await self.k8s.remove_redis_client(self.k8s.get_redis_url(crawl.id))
+
+            if crawl.is_qa:
+                await self.crawl_ops.qa_run_finished(crawl.db_crawl_id)
 
         return {
             "status": status.dict(exclude_none=True),
@@ -727,8 +750,8 @@ class CrawlOperator(BaseOperator):
 
         # pylint: disable=bare-except
         except:
-            if redis:
-                await redis.close()
+            # drop pooled client, will reconnect on next sync
+            await self.k8s.remove_redis_client(redis_url)
 
             return None
 
@@ -812,52 +835,158 @@ class CrawlOperator(BaseOperator):
             if crawler_running:
                 status.lastActiveTime = to_k8s_date(dt_now())
 
-            file_done = await redis.lpop(self.done_key)
-            while file_done:
-                msg = json.loads(file_done)
-                # add completed file
-                if msg.get("filename"):
-                    await self.add_file_to_crawl(msg, crawl, redis)
-                    await redis.incr("filesAdded")
-
-                # get next file done
-                file_done = await redis.lpop(self.done_key)
-
-            page_crawled = await redis.lpop(f"{crawl.id}:{self.pages_key}")
-            qa_run_id = crawl.id if crawl.is_qa else None
-
-            while page_crawled:
-                page_dict = json.loads(page_crawled)
-                await self.page_ops.add_page_to_db(
-                    page_dict, crawl.db_crawl_id, qa_run_id, crawl.oid
-                )
-                page_crawled = await redis.lpop(f"{crawl.id}:{self.pages_key}")
-
-            crawl_error = await redis.lpop(f"{crawl.id}:{self.errors_key}")
-            while crawl_error:
-                await self.crawl_ops.add_crawl_error(
-                    crawl.db_crawl_id, crawl.is_qa, crawl_error
-                )
-                crawl_error = await redis.lpop(f"{crawl.id}:{self.errors_key}")
-
-            # ensure filesAdded and filesAddedSize always set
-            status.filesAdded = int(await redis.get("filesAdded") or 0)
-            status.filesAddedSize = int(await redis.get("filesAddedSize") or 0)
-
-            # update stats and get status
-            return await self.update_crawl_state(
+            status = await self.drain_and_update_crawl_state(
                 redis, crawl, status, pods, pod_done_count
             )
 
+            return status
+
         # pylint: disable=broad-except
         except Exception as exc:
             traceback.print_exc()
             print(f"Crawl get failed: {exc}, will try again")
             return status
 
-        finally:
-            if redis:
-                await redis.close()
+    # pylint: disable=too-many-arguments
+    async def drain_and_update_crawl_state(
+        self,
+        redis: Redis,
+        crawl: CrawlSpec,
+        status: CrawlStatus,
+        pods: dict[str, dict],
+        pod_done_count: int,
+    ) -> CrawlStatus:
+        """drain files, pages and errors from redis, then update crawl state.
+
+        crawl is not finished until all lists are fully drained, as redis
+        is removed once crawl is finished"""
+        qa_run_id = crawl.id if crawl.is_qa else None
+
+        # drain files, pages and errors in batches, up to a per-sync budget
+        drained_files = await self.drain_redis_list(
+            redis,
+            self.done_key,
+            lambda batch: self.add_files_done_batch(batch, crawl, redis),
+        )
+
+        drained_pages = await self.drain_redis_list(
+            redis,
+            f"{crawl.id}:{self.pages_key}",
+            lambda batch: self.add_pages_batch(batch, crawl, qa_run_id),
+        )
+
+        drained_errors = await self.drain_redis_list(
+            redis,
+            f"{crawl.id}:{self.errors_key}",
+            lambda batch: self.add_errors_batch(batch, crawl, redis),
+        )
+
+        all_drained = drained_files and drained_pages and drained_errors
+
+        # ensure filesAdded and filesAddedSize always set
+        status.filesAdded = int(await redis.get("filesAdded") or 0)
+        status.filesAddedSize = int(await redis.get("filesAddedSize") or 0)
+
+        # update stats and get status
+        status = await self.update_crawl_state(
+            redis, crawl, status, pods, pod_done_count, all_drained
+        )
+
+        # if budget exhausted before draining all lists, resync soon
+        if not all_drained:
+            status.resync_after = self.fast_retry_secs
+
+        return status
+
+    async def drain_redis_list(
+        self,
+        redis: Redis,
+        key: str,
+        process_batch: Callable[[list[str]], Awaitable[int]],
+    ) -> bool:
+        """read entries from redis list in batches, passing each batch to
+        process_batch, until the list is empty or the per-sync budget is used.
+
+        entries are only removed from the list once processed, process_batch
+        returning how many were. if it raises, or not all entries were
+        processed, the rest are kept and retried on next sync.
+
+        return true if list was fully drained"""
+        remaining = self.redis_drain_max_per_sync
+        while remaining > 0:
+            count = min(self.redis_drain_batch_size, remaining)
+            batch = await redis.lrange(key, 0, count - 1)
+            if not batch:
+                return True
+
+            processed = await process_batch(batch)
+            if processed:
+                await redis.ltrim(key, processed, -1)
+
+            if processed < len(batch):
+                return False
+
+            remaining -= processed
+
+        return not await redis.llen(key)
+
+    async def add_files_done_batch(
+        self, files_done: list[str], crawl, redis: Redis
+    ) -> int:
+        """add batch of completed files to crawl, one at a time,
+        returning number of entries processed before any error"""
+        for inx, file_done in enumerate(files_done):
+            try:
+                msg = json.loads(file_done)
+            except json.JSONDecodeError:
+                print(f"Skipping invalid file entry: {file_done}", flush=True)
+                continue
+
+            # add completed file
+            if msg.get("filename"):
+                try:
+                    await self.add_file_to_crawl(msg, crawl, redis)
+                # pylint: disable=broad-exception-caught
+                except Exception as exc:
+                    print(f"Error adding file to crawl, will retry: {exc}", flush=True)
+                    return inx
+
+                await redis.incr("filesAdded")
+
+        return len(files_done)
+
+    async def add_pages_batch(
+        self, pages_crawled: list[str], crawl: CrawlSpec, qa_run_id: Optional[str]
+    ) -> int:
+        """add batch of crawled pages to db, skipping invalid entries.
+
+        existing pages are skipped when adding, so a failed batch can be retried
+        """
+        page_dicts = []
+        for page_crawled in pages_crawled:
+            try:
+                page_dicts.append(json.loads(page_crawled))
+            except json.JSONDecodeError:
+                print(f"Skipping invalid page entry: {page_crawled}", flush=True)
+
+        await self.page_ops.add_pages_to_db(
+            page_dicts, crawl.db_crawl_id, qa_run_id, crawl.oid
+        )
+        return len(pages_crawled)
+
+    async def add_errors_batch(
+        self, crawl_errors: list[str], crawl: CrawlSpec, redis: Redis
+    ) -> int:
+        """add batch of crawl errors to db, and to live log stream for crawls"""
+        qa_run_id = crawl.id if crawl.is_qa else None
+        await self.crawl_ops.add_crawl_errors(
+            crawl.db_crawl_id, qa_run_id, crawl_errors
+        )
+
+        if not crawl.is_qa:
+            await self.crawl_ops.add_live_log_lines(redis, crawl.id, crawl_errors)
+
+        return len(crawl_errors)
 
     def sync_pod_status(
         self, pods: dict[str, dict], status: CrawlStatus
@@ -1173,6 +1302,16 @@ class CrawlOperator(BaseOperator):
             storage=crawl.storage,
         )
 
+        # record member listing so WACZ contents can be read
+        # without fetching the central directory each time
+        try:
+            crawl_file.members = await self.storage_ops.get_wacz_members(
+                org, crawl_file
+            )
+        # pylint: disable=broad-except
+        except Exception as exc:
+            print("Error reading WACZ member listing", exc, flush=True)
+
         await redis.incr("filesAddedSize", filecomplete.size)
 
         await self.crawl_ops.add_crawl_file(
@@ -1250,6 +1389,7 @@ class CrawlOperator(BaseOperator):
         stats = CrawlStats(found=pages_found, done=pages_done, size=archive_size)
         return stats, sizes
 
+    # pylint: disable=too-many-arguments
     async def update_crawl_state(
         self,
         redis: Redis,
@@ -1257,6 +1397,7 @@ class CrawlOperator(BaseOperator):
         status: CrawlStatus,
         pods: dict[str, dict],
         pod_done_count: int,
+        all_drained: bool = True,
     ) -> CrawlStatus:
         """update crawl state and check if crawl is now done"""
         results = await redis.hgetall(f"{crawl.id}:status")
@@ -1297,6 +1438,11 @@ class CrawlOperator(BaseOperator):
                 crawl.id, crawl.scale, redis, status, pods
             )
 
+        # don't check if done until all files, pages and errors are added,
+        # as crawl redis is removed once crawl is finished
+        if not all_drained:
+            return status
+
         # check if done / failed
         status_count: dict[str, int] = {}
         for i in range(status.scale):
@@ -1418,6 +1564,9 @@ class CrawlOperator(BaseOperator):
             await self.org_ops.inc_org_bytes_stored(
                 crawl.oid, status.filesAddedSize, "crawl"
             )
+            await self.org_ops.inc_org_item_counts(
+                crawl.oid, "crawl", 1, status.pagesDone
+            )
             await self.coll_ops.add_successful_crawl_to_collections(crawl.id, crawl.cid)
 
         if state in FAILED_STATES:
@@ -1431,6 +1580,14 @@ class CrawlOperator(BaseOperator):
         # finally, delete job
         await self.k8s.delete_crawl_job(crawl.id)
 
+        # index logs after job is deleted, may take a while for large crawls
+        if state in SUCCESSFUL_STATES:
+            try:
+                await self.crawl_ops.index_crawl_logs(crawl.id)
+            # pylint: disable=broad-except
+            except Exception as exc:
+                print(f"Error indexing logs for crawl {crawl.id}", exc, flush=True)
+
     # pylint: disable=too-many-arguments
     async def do_qa_run_finished_tasks(
         self,
@@ -1458,14 +1615,10 @@ class CrawlOperator(BaseOperator):
 
     async def mark_for_cancelation(self, crawl_id):
         """mark crawl as canceled in redis"""
-        try:
-            redis_url = self.k8s.get_redis_url(crawl_id)
-            redis = await self._get_redis(redis_url)
-            if not redis:
-                return False
+        redis_url = self.k8s.get_redis_url(crawl_id)
+        redis = await self._get_redis(redis_url)
+        if not redis:
+            return False
 
-            await redis.set(f"{crawl_id}:canceled", "1")
-            return True
-        finally:
-            if redis:
-                await redis.close()
+        await redis.set(f"{crawl_id}:canceled", "1")
+        return True
@@ -3,12 +3,13 @@ Organization API handling
 """
 
 # pylint: disable=too-many-lines
+import asyncio
 import math
 import os
 import time
 import urllib.parse
 from uuid import UUID, uuid4
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from typing import Optional, TYPE_CHECKING
 
@@ -20,7 +21,6 @@ from .models import (
     SUCCESSFUL_STATES,
     RUNNING_STATES,
     STARTING_STATES,
-    BaseCrawl,
     Organization,
     StorageRef,
     OrgQuotas,
@@ -41,7 +41,7 @@ from .models import (
     PaginatedResponse,
 )
 from .pagination import DEFAULT_PAGE_SIZE, paginated_format
-from .utils import slug_from_name, validate_slug
+from .utils import dt_now, slug_from_name, validate_slug
 
 
 if TYPE_CHECKING:
@@ -52,6 +52,13 @@ else:
 
 DEFAULT_ORG = os.environ.get("DEFAULT_ORG", "My Organization")
 
+# how often to check for orgs with metrics due for reconciliation
+METRICS_RECONCILE_CHECK_INTERVAL = 600
+
+# how many times to retry reconciling org metrics if they are updated
+# concurrently while recomputing
+METRICS_RECONCILE_ATTEMPTS = 3
+
 
 # ============================================================================
 # pylint: disable=too-many-public-methods, too-many-instance-attributes
@@ -77,6 +84,10 @@ class OrgOps:
 
         self.invites = invites
 
+        self.metrics_reconcile_seconds = int(
+            os.environ.get("ORG_METRICS_RECONCILE_SECONDS") or 86400
+        )
+
     def set_default_primary_storage(self, storage: StorageRef):
         """set default primary storage"""
         self.default_primary = storage
@@ -450,6 +461,39 @@ class OrgOps:
             )
         return await self.storage_quota_reached(oid)
 
+    async def inc_org_item_counts(
+        self, oid: UUID, type_: str, count: int = 1, pages: int = 0
+    ):
+        """Increase org archived item and page counts for successfully
+        finished crawls or uploads (pass negative values to subtract)."""
+        count_field = "uploadCount" if type_ == "upload" else "crawlCount"
+        await self.orgs.find_one_and_update(
+            {"_id": oid},
+            {"$inc": {count_field: count, "pageCount": pages, "metricsVersion": 1}},
+        )
+
+    async def inc_org_profile_count(self, oid: UUID, count: int = 1):
+        """Increase org profile count (pass negative value to subtract)."""
+        await self.orgs.find_one_and_update(
+            {"_id": oid}, {"$inc": {"profileCount": count, "metricsVersion": 1}}
+        )
+
+    async def inc_org_collections_count(
+        self, oid: UUID, count: int = 1, public_count: int = 0
+    ):
+        """Increase org collection and public collection counts
+        (pass negative values to subtract)."""
+        await self.orgs.find_one_and_update(
+            {"_id": oid},
+            {
+                "$inc": {
+                    "collectionsCount": count,
+                    "publicCollectionsCount": public_count,
+                    "metricsVersion": 1,
+                }
+            },
+        )
+
     # pylint: disable=invalid-name
     async def storage_quota_reached(self, oid: UUID) -> bool:
         """Return boolean indicating if storage quota is met or exceeded."""
@@ -646,60 +690,149 @@ class OrgOps:
         return 0
 
     async def get_org_metrics(self, org: Organization):
-        """Calculate and return org metrics"""
-        # pylint: disable=too-many-locals
-        storage_quota = await self.get_org_storage_quota(org.id)
-        max_concurrent_crawls = await self.get_max_concurrent_crawls(org.id)
-
-        # Calculate these counts in loop to avoid having db iterate through
-        # archived items several times.
-        archived_item_count = 0
-        crawl_count = 0
-        upload_count = 0
-        page_count = 0
-
-        async for item_data in self.crawls_db.find({"oid": org.id}):
-            item = BaseCrawl.from_dict(item_data)
-            if item.state not in SUCCESSFUL_STATES:
-                continue
-            archived_item_count += 1
-            if item.type == "crawl":
-                crawl_count += 1
-            if item.type == "upload":
-                upload_count += 1
-            if item.stats:
-                page_count += item.stats.done
-
-        profile_count = await self.profiles_db.count_documents({"oid": org.id})
-        workflows_running_count = await self.crawls_db.count_documents(
-            {"oid": org.id, "state": {"$in": RUNNING_STATES}}
-        )
-        workflows_queued_count = await self.crawls_db.count_documents(
-            {"oid": org.id, "state": {"$in": STARTING_STATES}}
-        )
-        collections_count = await self.colls_db.count_documents({"oid": org.id})
-        public_collections_count = await self.colls_db.count_documents(
-            {"oid": org.id, "isPublic": True}
+        """Return org metrics from counts stored on org,
+        along with current number of running and queued crawls"""
+        workflows_running_count = 0
+        workflows_queued_count = 0
+
+        cursor = self.crawls_db.aggregate(
+            [
+                {
+                    "$match": {
+                        "oid": org.id,
+                        "state": {"$in": [*RUNNING_STATES, *STARTING_STATES]},
+                    }
+                },
+                {"$group": {"_id": "$state", "count": {"$sum": 1}}},
+            ]
         )
+        async for result in cursor:
+            if result["_id"] in RUNNING_STATES:
+                workflows_running_count += result["count"]
+            else:
+                workflows_queued_count += result["count"]
+
+        quotas = org.quotas or OrgQuotas()
 
         return {
             "storageUsedBytes": org.bytesStored,
             "storageUsedCrawls": org.bytesStoredCrawls,
             "storageUsedUploads": org.bytesStoredUploads,
             "storageUsedProfiles": org.bytesStoredProfiles,
-            "storageQuotaBytes": storage_quota,
-            "archivedItemCount": archived_item_count,
-            "crawlCount": crawl_count,
-            "uploadCount": upload_count,
-            "pageCount": page_count,
-            "profileCount": profile_count,
+            "storageQuotaBytes": quotas.storageQuota,
+            "archivedItemCount": org.crawlCount + org.uploadCount,
+            "crawlCount": org.crawlCount,
+            "uploadCount": org.uploadCount,
+            "pageCount": org.pageCount,
+            "profileCount": org.profileCount,
             "workflowsRunningCount": workflows_running_count,
-            "maxConcurrentCrawls": max_concurrent_crawls,
+            "maxConcurrentCrawls": quotas.maxConcurrentCrawls,
             "workflowsQueuedCount": workflows_queued_count,
-            "collectionsCount": collections_count,
-            "publicCollectionsCount": public_collections_count,
+            "collectionsCount": org.collectionsCount,
+            "publicCollectionsCount": org.publicCollectionsCount,
         }
 
+    async def recompute_org_metrics(self, oid: UUID) -> bool:
+        """Recompute archived item, page, profile and collection counts
+        for org from scratch, correcting any drift in incremental updates
+
+        Counts are only written if no incremental update happened while
+        recomputing, otherwise recomputing is retried. Returns True if
+        counts were updated"""
+        for _ in range(METRICS_RECONCILE_ATTEMPTS):
+            org_data = await self.orgs.find_one(
+                {"_id": oid}, projection=["metricsVersion"]
+            )
+            if not org_data:
+                return False
+
+            # None also matches orgs never incrementally updated
+            version = org_data.get("metricsVersion")
+
+            counts = await self._count_org_metrics(oid)
+
+            res = await self.orgs.find_one_and_update(
+                {"_id": oid, "metricsVersion": version},
+                {"$set": {**counts, "metricsReconciled": dt_now()}},
+            )
+            if res:
+                return True
+
+        print(
+            f"Org {oid} metrics updated while reconciling, will retry later",
+            flush=True,
+        )
+        return False
+
+    async def _count_org_metrics(self, oid: UUID) -> dict[str, int]:
+        """Count archived items, pages, profiles and collections for org"""
+        counts = {"crawlCount": 0, "uploadCount": 0, "pageCount": 0}
+
+        cursor = self.crawls_db.aggregate(
+            [
+                {"$match": {"oid": oid, "state": {"$in": SUCCESSFUL_STATES}}},
+                {
+                    "$group": {
+                        "_id": "$type",
+                        "count": {"$sum": 1},
+                        "pages": {"$sum": "$stats.done"},
+                    }
+                },
+            ]
+        )
+        async for result in cursor:
+            if result["_id"] == "upload":
+                counts["uploadCount"] += result["count"]
+            elif result["_id"] == "crawl":
+                counts["crawlCount"] += result["count"]
+            counts["pageCount"] += result["pages"]
+
+        counts["profileCount"] = await self.profiles_db.count_documents({"oid": oid})
+        counts["collectionsCount"] = await self.colls_db.count_documents({"oid": oid})
+        counts["publicCollectionsCount"] = await self.colls_db.count_documents(
+            {"oid": oid, "isPublic": True}
+        )
+        return counts
+
+    async def recompute_stale_org_metrics(self, max_age: int = 0):
+        """Recompute metrics for all orgs not reconciled in last max_age seconds
+
+        As this runs on every backend pod, each stale org is first claimed
+        by atomically marking it reconciled, so only one pod recomputes it"""
+        query: dict[str, object] = {}
+        if max_age:
+            cutoff = dt_now() - timedelta(seconds=max_age)
+            query["$or"] = [
+                {"metricsReconciled": None},
+                {"metricsReconciled": {"$lt": cutoff}},
+            ]
+
+        async for org_data in self.orgs.find(query, projection=["_id"]):
+            oid = org_data["_id"]
+            try:
+                if max_age:
+                    claimed = await self.orgs.find_one_and_update(
+                        {"_id": oid, **query},
+                        {"$set": {"metricsReconciled": dt_now()}},
+                    )
+                    if not claimed:
+                        continue
+
+                await self.recompute_org_metrics(oid)
+            # pylint: disable=broad-exception-caught
+            except Exception as exc:
+                print(f"Error recomputing metrics for org {oid}: {exc}", flush=True)
+
+    async def run_org_metrics_reconcile_loop(self, db_inited: dict):
+        """Periodically recompute metrics of orgs not recently reconciled,
+        once database is ready"""
+        while not db_inited.get("inited"):
+            await asyncio.sleep(5)
+
+        while True:
+            await self.recompute_stale_org_metrics(self.metrics_reconcile_seconds)
+            await asyncio.sleep(METRICS_RECONCILE_CHECK_INTERVAL)
+
     async def get_all_org_slugs(self):
         """Return list of all org slugs."""
         slugs = await self.orgs.distinct("slug", {})
@@ -1,12 +1,12 @@
 """crawl pages"""
 
-import asyncio
+import bisect
 import traceback
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional, Tuple, List, Dict, Any, Union
 from uuid import UUID, uuid4
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
 import pymongo
 
 from .models import (
@@ -24,7 +24,7 @@ from .models import (
     PageNoteDelete,
     QARunBucketStats,
 )
-from .pagination import DEFAULT_PAGE_SIZE, paginated_format
+from .pagination import DEFAULT_PAGE_SIZE, paginate_aggregate, paginated_format
 from .utils import from_k8s_date, str_list_to_bools
 
 if TYPE_CHECKING:
@@ -35,6 +35,31 @@ else:
     CrawlOps = StorageOps = OrgOps = object
 
 
+# pylint: disable=too-many-lines
+
+DUPLICATE_KEY_ERROR = 11000
+
+# page fields that can be sorted on for review, each with a per-crawl index
+PAGE_SORT_FIELDS = ("url", "title", "notes", "approved")
+
+# QA run score fields that can be sorted and filtered on
+PAGE_QA_SORT_FIELDS = ("screenshotMatch", "textMatch")
+
+# page review fields copied onto each page_qa entry so QA review
+# queries can filter and sort on them using the page_qa indexes
+PAGE_QA_REVIEW_FIELDS = ("url", "title", "approved", "isFile", "isError")
+
+# number of fixed-width buckets QA scores between 0 and 1 are counted in,
+# with an extra bucket for scores of exactly 1
+QA_HISTOGRAM_RESOLUTION = 1000
+
+# histogram key for pages with a QA run entry but no score
+QA_HISTOGRAM_NO_SCORE = "none"
+
+# page, QA data written for it, and scores of the page_qa entry replaced
+PageQAWrite = Tuple[Dict[str, Any], PageQACompare, Optional[Dict[str, Any]]]
+
+
 # ============================================================================
 # pylint: disable=too-many-instance-attributes, too-many-arguments,too-many-public-methods
 class PageOps:
@@ -46,43 +71,67 @@ class PageOps:
 
     def __init__(self, mdb, crawl_ops, org_ops, storage_ops):
         self.pages = mdb["pages"]
+        self.page_qa = mdb["page_qa"]
+        self.qa_histograms = mdb["page_qa_histograms"]
         self.crawls = mdb["crawls"]
         self.crawl_ops = crawl_ops
         self.org_ops = org_ops
         self.storage_ops = storage_ops
 
     async def init_index(self):
-        """init index for pages db collection"""
+        """init index for pages and page_qa db collections"""
         await self.pages.create_index([("crawl_id", pymongo.HASHED)])
 
-    async def add_crawl_pages_to_db_from_wacz(self, crawl_id: str, batch_size=100):
-        """Add pages to database from WACZ files"""
+        # per-crawl indexes for review list sort keys, with _id as tiebreaker
+        await self.pages.create_index([("crawl_id", 1), ("_id", 1)])
+        for key in ("url", "title", "approved"):
+            await self.pages.create_index([("crawl_id", 1), (key, 1), ("_id", 1)])
+
+        # one entry per page per QA run
+        await self.page_qa.create_index([("page_id", 1), ("qa_run_id", 1)], unique=True)
+
+        # per-QA-run indexes for QA review list sort and score filter keys
+        await self.page_qa.create_index([("crawl_id", 1), ("qa_run_id", 1), ("_id", 1)])
+        for key in (*PAGE_QA_SORT_FIELDS, "url", "title", "approved", "hasNotes"):
+            await self.page_qa.create_index(
+                [("crawl_id", 1), ("qa_run_id", 1), (key, 1), ("_id", 1)]
+            )
+
+        await self.qa_histograms.create_index(
+            [("crawl_id", 1), ("qa_run_id", 1)], unique=True
+        )
+
+    async def add_crawl_pages_to_db_from_wacz(
+        self, crawl_id: str, batch_size=100
+    ) -> bool:
+        """Add pages to database from WACZ files, return true if successful"""
         pages_buffer: List[Page] = []
         try:
             crawl = await self.crawl_ops.get_crawl_out(crawl_id)
-            stream = await self.storage_ops.sync_stream_wacz_pages(
-                crawl.resources or []
-            )
-            for page_dict in stream:
+            stream = self.storage_ops.stream_wacz_pages(crawl.resources or [])
+            async for page_dict in stream:
                 if not page_dict.get("url"):
                     continue
 
-                if len(pages_buffer) > batch_size:
-                    await self._add_pages_to_db(crawl_id, pages_buffer)
-
                 pages_buffer.append(
                     self._get_page_from_dict(page_dict, crawl_id, crawl.oid)
                 )
 
+                if len(pages_buffer) >= batch_size:
+                    await self._add_pages_to_db(crawl_id, pages_buffer)
+                    pages_buffer = []
+
             # Add any remaining pages in buffer to db
             if pages_buffer:
                 await self._add_pages_to_db(crawl_id, pages_buffer)
 
             print(f"Added pages for crawl {crawl_id} to db", flush=True)
+            return True
         # pylint: disable=broad-exception-caught, raise-missing-from
         except Exception as err:
             traceback.print_exc()
             print(f"Error adding pages for crawl {crawl_id} to db: {err}", flush=True)
+            return False
 
     def _get_page_from_dict(
         self, page_dict: Dict[str, Any], crawl_id: str, oid: UUID
@@ -115,20 +164,10 @@ class PageOps:
         return p
 
     async def _add_pages_to_db(self, crawl_id: str, pages: List[Page]):
-        """Add batch of pages to db in one insert"""
-        result = await self.pages.insert_many(
-            [
-                page.to_dict(
-                    exclude_unset=True, exclude_none=True, exclude_defaults=True
-                )
-                for page in pages
-            ]
-        )
-        if not result.inserted_ids:
-            # pylint: disable=broad-exception-raised
-            raise Exception("No pages inserted")
+        """Add batch of pages to db in one insert, skipping existing pages"""
+        inserted = await self._insert_pages_skip_dupes(crawl_id, pages)
 
-        await self.update_crawl_file_and_error_counts(crawl_id, pages)
+        await self.update_crawl_file_and_error_counts(crawl_id, inserted)
 
     async def add_page_to_db(
         self,
@@ -138,38 +177,259 @@ class PageOps:
         oid: UUID,
     ):
         """Add page to database"""
-        page = self._get_page_from_dict(page_dict, crawl_id, oid)
-        page_to_insert = page.to_dict(
-            exclude_unset=True, exclude_none=True, exclude_defaults=True
+        await self.add_pages_to_db([page_dict], crawl_id, qa_run_id, oid)
+
+    async def add_pages_to_db(
+        self,
+        page_dicts: List[Dict[str, Any]],
+        crawl_id: str,
+        qa_run_id: Optional[str],
+        oid: UUID,
+    ):
+        """Add batch of pages to database with one unordered insert.
+
+        Pages that already exist (eg. re-sent by crawler, or added by the
+        crawl being QA'd) are skipped. File and error page counts are updated
+        for newly inserted pages with a single $inc, and QA comparison data
+        is upserted as page_qa entries in one bulk write"""
+        # pylint: disable=too-many-locals
+        if not page_dicts:
+            return
+
+        pages = [
+            self._get_page_from_dict(page_dict, crawl_id, oid)
+            for page_dict in page_dicts
+        ]
+
+        if qa_run_id:
+            # create histogram before adding this batch so it is only counted once
+            await self.get_qa_run_histogram(crawl_id, qa_run_id, create=True)
+
+        inserted = await self._insert_pages_skip_dupes(crawl_id, pages)
+
+        if not qa_run_id:
+            await self.update_crawl_file_and_error_counts(crawl_id, inserted)
+            return
+
+        # qa data
+        compares: Dict[UUID, PageQACompare] = {}
+        for page, page_dict in zip(pages, page_dicts):
+            compare_dict = page_dict.get("comparison")
+            if compare_dict is not None:
+                compares[page.id] = PageQACompare(**compare_dict)
+
+        missing = len(pages) - len(compares)
+        if missing:
+            print(
+                f"QA run {qa_run_id}: compare data missing for {missing} "
+                + f"of {len(pages)} pages",
+                flush=True,
+            )
+
+        # pages first seen in QA run have no data for it unless compared
+        new_page_count = len(
+            [page for page in inserted if not page.isFile and not page.isError]
         )
 
+        written: List[PageQAWrite] = []
+
         try:
-            await self.pages.insert_one(page_to_insert)
-        except pymongo.errors.DuplicateKeyError:
-            pass
+            qa_pages = []
+            cursor = self.pages.find(
+                {"_id": {"$in": list(compares.keys())}, "oid": oid},
+                projection=PAGE_QA_PAGE_PROJECTION,
+            )
+            async for page_raw in cursor:
+                qa_pages.append((page_raw, compares[page_raw["_id"]]))
 
+            written = await self._upsert_page_qa(qa_run_id, qa_pages)
         # pylint: disable=broad-except
         except Exception as err:
             print(
-                f"Error adding page {page.id} from crawl {crawl_id} to db: {err}",
+                f"Error adding QA run {qa_run_id} data for crawl {crawl_id}: {err}",
                 flush=True,
             )
+
+        await self._inc_qa_run_histogram(crawl_id, qa_run_id, written, new_page_count)
+
+    async def _upsert_page_qa(
+        self, qa_run_id: str, qa_pages: List[Tuple[Dict[str, Any], PageQACompare]]
+    ) -> List[PageQAWrite]:
+        """Upsert page_qa entries for QA run in one bulk write.
+
+        Returns the pages whose entries were written, each with the scores
+        of the entry it replaced, or None if a new entry was added"""
+        if not qa_pages:
+            return []
+
+        prev_entries: Dict[UUID, Dict[str, Any]] = {}
+        cursor = self.page_qa.find(
+            {
+                "page_id": {"$in": [page_raw["_id"] for page_raw, _ in qa_pages]},
+                "qa_run_id": qa_run_id,
+            },
+            projection=["page_id", *PAGE_QA_SORT_FIELDS],
+        )
+        async for page_qa in cursor:
+            prev_entries[page_qa["page_id"]] = page_qa
+
+        qa_updates = [
+            get_page_qa_update(page_raw, qa_run_id, compare)
+            for page_raw, compare in qa_pages
+        ]
+
+        failed = set()
+        try:
+            result = await self.page_qa.bulk_write(qa_updates, ordered=False)
+            upserted = set(result.upserted_ids.keys())
+        except pymongo.errors.BulkWriteError as bwe:
+            upserted = {entry["index"] for entry in bwe.details.get("upserted", [])}
+            failed = {entry["index"] for entry in bwe.details.get("writeErrors", [])}
+            print(
+                f"Error adding QA run {qa_run_id} data for {len(failed)} pages",
+                flush=True,
+            )
+
+        written: List[PageQAWrite] = []
+        for index, (page_raw, compare) in enumerate(qa_pages):
+            if index in failed:
+                continue
+
+            if index in upserted:
+                written.append((page_raw, compare, None))
+            # skip if replaced entry was added concurrently, as not read above
+            elif page_raw["_id"] in prev_entries:
+                written.append((page_raw, compare, prev_entries[page_raw["_id"]]))
+
+        return written
+
+    async def _inc_qa_run_histogram(
+        self,
+        crawl_id: str,
+        qa_run_id: str,
+        written: List[PageQAWrite],
+        new_page_count: int = 0,
+    ):
+        """Count written page_qa entries in QA run score histograms,
+        moving replaced entries from their previous score buckets"""
+        inc: Dict[str, int] = {}
+        if new_page_count:
+            inc["pageCount"] = new_page_count
+
+        for page_raw, compare, prev_entry in written:
+            if page_raw.get("isFile") or page_raw.get("isError"):
+                continue
+
+            for key in PAGE_QA_SORT_FIELDS:
+                path = f"{key}.{get_qa_histogram_bucket(getattr(compare, key))}"
+                inc[path] = inc.get(path, 0) + 1
+
+                if prev_entry is not None:
+                    path = f"{key}.{get_qa_histogram_bucket(prev_entry.get(key))}"
+                    inc[path] = inc.get(path, 0) - 1
+
+        inc = {path: count for path, count in inc.items() if count}
+        if not inc:
             return
 
-        if not qa_run_id and page:
-            await self.update_crawl_file_and_error_counts(crawl_id, [page])
+        try:
+            await self.qa_histograms.update_one(
+                {"crawl_id": crawl_id, "qa_run_id": qa_run_id},
+                {"$inc": inc},
+                upsert=True,
+            )
+        # pylint: disable=broad-except
+        except Exception as err:
+            print(
+                f"Error updating QA run {qa_run_id} histograms: {err}",
+                flush=True,
+            )
 
-        # qa data
-        if qa_run_id and page:
-            compare_dict = page_dict.get("comparison")
-            if compare_dict is None:
-                print("QA Run, but compare data missing!")
-                return
+    async def get_qa_run_histogram(
+        self, crawl_id: str, qa_run_id: str, create: bool = False
+    ) -> Dict[str, Any]:
+        """Return score histograms for QA run.
+
+        If not yet stored (eg. QA run from before histograms were kept),
+        compute from page_qa entries, storing if the QA run has any entries
+        or create is set"""
+        query = {"crawl_id": crawl_id, "qa_run_id": qa_run_id}
+        histogram = await self.qa_histograms.find_one(query)
+        if histogram:
+            return histogram
+
+        page_query = {
+            "crawl_id": crawl_id,
+            "isFile": {"$ne": True},
+            "isError": {"$ne": True},
+        }
 
-            compare = PageQACompare(**compare_dict)
-            print("Adding QA Run Data for Page", page_dict.get("url"), compare)
+        histogram = {
+            "_id": uuid4(),
+            **query,
+            "pageCount": await self.pages.count_documents(page_query),
+        }
 
-            await self.add_qa_run_for_page(page.id, oid, qa_run_id, compare)
+        has_entries = False
+        cursor = self.page_qa.find(
+            {**page_query, "qa_run_id": qa_run_id},
+            projection=list(PAGE_QA_SORT_FIELDS),
+        )
+        async for page_qa in cursor:
+            has_entries = True
+            for key in PAGE_QA_SORT_FIELDS:
+                counts = histogram.setdefault(key, {})
+                bucket = get_qa_histogram_bucket(page_qa.get(key))
+                counts[bucket] = counts.get(bucket, 0) + 1
+
+        if not has_entries and not create:
+            return histogram
+
+        try:
+            await self.qa_histograms.insert_one(histogram)
+        except pymongo.errors.DuplicateKeyError:
+            return await self.qa_histograms.find_one(query) or histogram
+
+        return histogram
+
+    async def _insert_pages_skip_dupes(
+        self, crawl_id: str, pages: List[Page]
+    ) -> List[Page]:
+        """Insert pages with unordered insert_many, ignoring duplicate keys.
+
+        Return list of pages that were newly inserted"""
+        try:
+            await self.pages.insert_many(
+                [
+                    page.to_dict(
+                        exclude_unset=True, exclude_none=True, exclude_defaults=True
+                    )
+                    for page in pages
+                ],
+                ordered=False,
+            )
+        except pymongo.errors.BulkWriteError as bwe:
+            failed = set()
+            for write_error in bwe.details.get("writeErrors", []):
+                failed.add(write_error["index"])
+                if write_error.get("code") != DUPLICATE_KEY_ERROR:
+                    print(
+                        f"Error adding page {pages[write_error['index']].id} "
+                        + f"from crawl {crawl_id} to db: {write_error.get('errmsg')}",
+                        flush=True,
+                    )
+
+            return [page for i, page in enumerate(pages) if i not in failed]
+
+        # pylint: disable=broad-except
+        except Exception as err:
+            print(
+                f"Error adding {len(pages)} pages from crawl {crawl_id} to db: {err}",
+                flush=True,
+            )
+            return []
+
+        return pages
 
     async def update_crawl_file_and_error_counts(
         self, crawl_id: str, pages: List[Page]
@@ -211,6 +471,8 @@ class PageOps:
             query["oid"] = oid
         try:
             await self.pages.delete_many(query)
+            await self.page_qa.delete_many(query)
+            await self.qa_histograms.delete_many({"crawl_id": crawl_id})
         # pylint: disable=broad-except
         except Exception as err:
             print(
@@ -254,9 +516,11 @@ class PageOps:
         """Return PageOut or PageOutWithSingleQA for page"""
         page_raw = await self.get_page_raw(page_id, oid, crawl_id)
         if qa_run_id:
-            qa = page_raw.get("qa")
-            if qa and qa.get(qa_run_id):
-                page_raw["qa"] = qa.get(qa_run_id)
+            page_qa = await self.page_qa.find_one(
+                {"page_id": page_id, "qa_run_id": qa_run_id}
+            )
+            if page_qa:
+                page_raw["qa"] = get_page_qa_compare(page_qa)
             else:
                 print(
                     f"Error: Page {page_id} does not have data from QA run {qa_run_id}",
@@ -273,24 +537,35 @@ class PageOps:
 
         # modified = datetime.utcnow().replace(microsecond=0, tzinfo=None)
 
-        result = await self.pages.find_one_and_update(
-            {"_id": page_id, "oid": oid},
-            {"$set": {f"qa.{qa_run_id}": compare.dict()}},
-            return_document=pymongo.ReturnDocument.AFTER,
+        page_raw = await self.pages.find_one(
+            {"_id": page_id, "oid": oid}, projection=PAGE_QA_PAGE_PROJECTION
         )
 
-        if not result:
+        if not page_raw:
             raise HTTPException(status_code=404, detail="page_not_found")
 
+        crawl_id = page_raw["crawl_id"]
+        await self.get_qa_run_histogram(crawl_id, qa_run_id, create=True)
+
+        written = await self._upsert_page_qa(qa_run_id, [(page_raw, compare)])
+        await self._inc_qa_run_histogram(crawl_id, qa_run_id, written)
+
         return True
 
     async def delete_qa_run_from_pages(self, crawl_id: str, qa_run_id: str):
-        """delete pages"""
-        result = await self.pages.update_many(
-            {"crawl_id": crawl_id}, {"$unset": {f"qa.{qa_run_id}": ""}}
+        """delete QA run data for all pages in crawl"""
+        result = await self.page_qa.delete_many(
+            {"crawl_id": crawl_id, "qa_run_id": qa_run_id}
+        )
+        await self.qa_histograms.delete_many(
+            {"crawl_id": crawl_id, "qa_run_id": qa_run_id}
         )
         return result
 
+    async def _update_page_qa_review(self, page_id: UUID, update: Dict[str, Any]):
+        """Keep review fields copied onto page's QA run entries in sync"""
+        await self.page_qa.update_many({"page_id": page_id}, {"$set": update})
+
     async def update_page_approval(
         self,
         page_id: UUID,
@@ -316,6 +591,8 @@ class PageOps:
         if not result:
             raise HTTPException(status_code=404, detail="page_not_found")
 
+        await self._update_page_qa_review(page_id, {"approved": approved})
+
         return {"updated": True}
 
     async def add_page_note(
@@ -343,6 +620,8 @@ class PageOps:
         if not result:
             raise HTTPException(status_code=404, detail="page_not_found")
 
+        await self._update_page_qa_review(page_id, {"hasNotes": True})
+
         return {"added": True, "data": note}
 
     async def update_page_note(
@@ -413,6 +692,8 @@ class PageOps:
         if not result:
             raise HTTPException(status_code=404, detail="page_not_found")
 
+        await self._update_page_qa_review(page_id, {"hasNotes": bool(remaining_notes)})
+
         return {"deleted": True}
 
     async def list_pages(
@@ -432,39 +713,127 @@ class PageOps:
         page: int = 1,
         sort_by: Optional[str] = None,
         sort_direction: Optional[int] = -1,
-    ) -> Tuple[Union[List[PageOut], List[PageOutWithSingleQA]], int]:
+        next_token: Optional[str] = None,
+        include_total: bool = True,
+    ) -> Tuple[
+        Union[List[PageOut], List[PageOutWithSingleQA]], Optional[int], Optional[str]
+    ]:
         """List all pages in crawl"""
-        # pylint: disable=duplicate-code, too-many-locals, too-many-branches, too-many-statements
-        # Zero-index page for query
-        page = page - 1
-        skip = page_size * page
+        # pylint: disable=duplicate-code, too-many-locals, too-many-arguments
+        query, sort = self._get_list_pages_query(
+            crawl_id,
+            org,
+            qa_run_id=qa_run_id,
+            qa_filter_by=qa_filter_by,
+            qa_gte=qa_gte,
+            qa_gt=qa_gt,
+            qa_lte=qa_lte,
+            qa_lt=qa_lt,
+            reviewed=reviewed,
+            approved=approved,
+            has_notes=has_notes,
+            sort_by=sort_by,
+            sort_direction=sort_direction,
+        )
+
+        if not qa_run_id:
+            items, total, next_token = await paginate_aggregate(
+                self.pages,
+                [{"$match": query}],
+                sort,
+                page,
+                page_size,
+                next_token,
+                include_total,
+            )
+            return [PageOut.from_dict(data) for data in items], total, next_token
+
+        # page and sort over page_qa entries for the QA run, then
+        # fetch just the pages on this page of results
+        items, total, next_token = await paginate_aggregate(
+            self.page_qa,
+            [{"$match": query}],
+            sort,
+            page,
+            page_size,
+            next_token,
+            include_total,
+        )
+
+        pages_by_id = {}
+        cursor = self.pages.find(
+            {"_id": {"$in": [item["page_id"] for item in items]}, "crawl_id": crawl_id}
+        )
+        async for page_raw in cursor:
+            pages_by_id[page_raw["_id"]] = page_raw
+
+        pages = []
+        for item in items:
+            page_raw = pages_by_id.get(item["page_id"])
+            if not page_raw:
+                continue
+
+            page_raw["qa"] = get_page_qa_compare(item)
+            pages.append(PageOutWithSingleQA.from_dict(page_raw))
+
+        return pages, total, next_token
+
+    def _get_list_pages_query(
+        self,
+        crawl_id: str,
+        org: Optional[Organization] = None,
+        qa_run_id: Optional[str] = None,
+        qa_filter_by: Optional[str] = None,
+        qa_gte: Optional[float] = None,
+        qa_gt: Optional[float] = None,
+        qa_lte: Optional[float] = None,
+        qa_lt: Optional[float] = None,
+        reviewed: Optional[bool] = None,
+        approved: Optional[List[Union[bool, None]]] = None,
+        has_notes: Optional[bool] = None,
+        sort_by: Optional[str] = None,
+        sort_direction: Optional[int] = -1,
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, int]]]:
+        """Return match query and sort for listing pages.
 
-        query: dict[str, object] = {
+        If qa_run_id is set, the query and sort apply to the page_qa
+        collection, otherwise to the pages collection"""
+        # pylint: disable=too-many-branches, too-many-arguments, too-many-locals
+        query: Dict[str, Any] = {
             "crawl_id": crawl_id,
         }
         if org:
             query["oid"] = org.id
 
+        has_notes_query: Dict[str, Any]
+        no_notes_query: Dict[str, Any]
+        if qa_run_id:
+            has_notes_query = {"hasNotes": True}
+            no_notes_query = {"hasNotes": {"$ne": True}}
+        else:
+            has_notes_query = {"notes.0": {"$exists": True}}
+            no_notes_query = {"notes.0": {"$exists": False}}
+
         if reviewed:
             query["$or"] = [
                 {"approved": {"$ne": None}},
-                {"notes.0": {"$exists": True}},
+                has_notes_query,
             ]
 
         if reviewed is False:
             query["$and"] = [
                 {"approved": {"$eq": None}},
-                {"notes.0": {"$exists": False}},
+                no_notes_query,
             ]
 
         if approved:
             query["approved"] = {"$in": approved}
 
         if has_notes is not None:
-            query["notes.0"] = {"$exists": has_notes}
+            query.update(has_notes_query if has_notes else no_notes_query)
 
         if qa_run_id:
-            query[f"qa.{qa_run_id}"] = {"$exists": True}
+            query["qa_run_id"] = qa_run_id
 
             range_filter = {}
 
@@ -478,81 +847,43 @@ class PageOps:
                 range_filter["$lt"] = qa_lt
 
             if qa_filter_by:
+                if qa_filter_by not in PAGE_QA_SORT_FIELDS:
+                    raise HTTPException(status_code=400, detail="invalid_filter_by")
                 if not range_filter:
                     raise HTTPException(status_code=400, detail="range_missing")
 
-                query[f"qa.{qa_run_id}.{qa_filter_by}"] = range_filter
-
-        aggregate = [{"$match": query}]
-
-        if sort_by:
-            # Sorting options to add:
-            # - automated heuristics like screenshot_comparison (dict keyed by QA run id)
-            # - Ensure notes sorting works okay with notes in list
-            sort_fields = ("url", "title", "notes", "approved")
-            qa_sort_fields = ("screenshotMatch", "textMatch")
-            if sort_by not in sort_fields and sort_by not in qa_sort_fields:
-                raise HTTPException(status_code=400, detail="invalid_sort_by")
-            if sort_direction not in (1, -1):
-                raise HTTPException(status_code=400, detail="invalid_sort_direction")
-
-            if sort_by in qa_sort_fields:
-                if not qa_run_id:
-                    raise HTTPException(
-                        status_code=400, detail="qa_run_id_missing_for_qa_sort"
-                    )
+                query[qa_filter_by] = range_filter
 
-                sort_by = f"qa.{qa_run_id}.{sort_by}"
+        if not sort_by:
+            return query, None
 
-            aggregate.extend([{"$sort": {sort_by: sort_direction}}])
+        # Sorting options to add:
+        # - Ensure notes sorting works okay with notes in list
+        if sort_by not in PAGE_SORT_FIELDS and sort_by not in PAGE_QA_SORT_FIELDS:
+            raise HTTPException(status_code=400, detail="invalid_sort_by")
+        if sort_direction not in (1, -1):
+            raise HTTPException(status_code=400, detail="invalid_sort_direction")
 
-        if qa_run_id:
-            aggregate.extend([{"$set": {"qa": f"$qa.{qa_run_id}"}}])
-            # aggregate.extend([{"$project": {"qa": f"$qa.{qa_run_id}"}}])
-
-        aggregate.extend(
-            [
-                {
-                    "$facet": {
-                        "items": [
-                            {"$skip": skip},
-                            {"$limit": page_size},
-                        ],
-                        "total": [{"$count": "count"}],
-                    }
-                },
-            ]
-        )
-
-        # Get total
-        cursor = self.pages.aggregate(aggregate)
-        results = await cursor.to_list(length=1)
-        result = results[0]
-        items = result["items"]
+        if sort_by in PAGE_QA_SORT_FIELDS and not qa_run_id:
+            raise HTTPException(status_code=400, detail="qa_run_id_missing_for_qa_sort")
 
-        try:
-            total = int(result["total"][0]["count"])
-        except (IndexError, ValueError):
-            total = 0
-
-        if qa_run_id:
-            return [PageOutWithSingleQA.from_dict(data) for data in items], total
+        # page_qa entries only track whether page has notes
+        if sort_by == "notes" and qa_run_id:
+            sort_by = "hasNotes"
 
-        return [PageOut.from_dict(data) for data in items], total
+        return query, {sort_by: sort_direction}
 
-    async def re_add_crawl_pages(self, crawl_id: str, oid: UUID):
+    async def re_add_crawl_pages(self, crawl_id: str, oid: UUID) -> bool:
         """Delete existing pages for crawl and re-add from WACZs."""
         await self.delete_crawl_pages(crawl_id, oid)
         print(f"Deleted pages for crawl {crawl_id}", flush=True)
-        await self.add_crawl_pages_to_db_from_wacz(crawl_id)
+        return await self.add_crawl_pages_to_db_from_wacz(crawl_id)
 
-    async def re_add_all_crawl_pages(self, oid: UUID):
-        """Re-add pages for all crawls in org"""
-        crawl_ids = await self.crawls.distinct(
-            "_id", {"type": "crawl", "finished": {"$ne": None}}
+    async def get_finished_crawl_ids(self, oid: UUID) -> List[str]:
+        """Return ids of all finished crawls in org"""
+        return await self.crawls.distinct(
+            "_id", {"type": "crawl", "oid": oid, "finished": {"$ne": None}}
         )
-        for crawl_id in crawl_ids:
-            await self.re_add_crawl_pages(crawl_id, oid)
 
     async def get_qa_run_aggregate_counts(
         self,
@@ -560,8 +891,13 @@ class PageOps:
         qa_run_id: str,
         thresholds: Dict[str, List[float]],
         key: str = "screenshotMatch",
+        histogram: Optional[Dict[str, Any]] = None,
     ):
-        """Get counts for pages in QA run in buckets by score key based on thresholds"""
+        """Get counts for pages in QA run in buckets by score key based on thresholds
+
+        Counts are summed from the QA run's score histogram, so thresholds
+        are effectively rounded to 1 / QA_HISTOGRAM_RESOLUTION"""
+        # pylint: disable=too-many-arguments, too-many-locals
         boundaries = thresholds.get(key, [])
         if not boundaries:
             raise HTTPException(status_code=400, detail="missing_thresholds")
@@ -576,36 +912,39 @@ class PageOps:
         if boundaries[-1] <= 1:
             boundaries.append(1.1)
 
-        aggregate = [
-            {
-                "$match": {
-                    "crawl_id": crawl_id,
-                    "isFile": {"$ne": True},
-                    "isError": {"$ne": True},
-                }
-            },
-            {
-                "$bucket": {
-                    "groupBy": f"$qa.{qa_run_id}.{key}",
-                    "default": "No data",
-                    "boundaries": boundaries,
-                    "output": {
-                        "count": {"$sum": 1},
-                    },
-                }
-            },
+        if histogram is None:
+            histogram = await self.get_qa_run_histogram(crawl_id, qa_run_id)
+
+        boundary_buckets = [
+            round(boundary * QA_HISTOGRAM_RESOLUTION) for boundary in boundaries
         ]
-        cursor = self.pages.aggregate(aggregate)
-        results = await cursor.to_list(length=len(boundaries))
 
-        return_data = []
+        counts: Dict[str, int] = {}
+        total = 0
 
-        for result in results:
-            return_data.append(
-                QARunBucketStats(
-                    lowerBoundary=str(result.get("_id")), count=result.get("count", 0)
-                )
-            )
+        for bucket, count in (histogram.get(key) or {}).items():
+            total += count
+            index = -1
+            if bucket != QA_HISTOGRAM_NO_SCORE:
+                index = bisect.bisect_right(boundary_buckets, int(bucket)) - 1
+
+            if 0 <= index < len(boundaries) - 1:
+                lower = str(boundaries[index])
+            else:
+                lower = "No data"
+
+            counts[lower] = counts.get(lower, 0) + count
+
+        # pages without an entry for this QA run also have no data
+        no_qa_count = histogram.get("pageCount", 0) - total
+        if no_qa_count > 0:
+            counts["No data"] = counts.get("No data", 0) + no_qa_count
+
+        return_data = [
+            QARunBucketStats(lowerBoundary=lower, count=count)
+            for lower, count in counts.items()
+            if count > 0
+        ]
 
         # Add missing boundaries to result and re-sort
         for boundary in boundaries:
@@ -623,14 +962,66 @@ class PageOps:
         return sorted(return_data, key=lambda bucket: bucket.lowerBoundary)
 
 
+# ============================================================================
+PAGE_QA_PAGE_PROJECTION = {
+    "crawl_id": True,
+    "oid": True,
+    "url": True,
+    "title": True,
+    "approved": True,
+    "isFile": True,
+    "isError": True,
+    "notes": {"$slice": 1},
+}
+
+
+def get_page_qa_update(
+    page_raw: Dict[str, Any], qa_run_id: str, compare: PageQACompare
+) -> pymongo.UpdateOne:
+    """Return upsert of page_qa entry for page and QA run, storing QA
+    scores as top-level fields along with page review fields"""
+    update = compare.dict()
+    update["crawl_id"] = page_raw.get("crawl_id")
+    update["oid"] = page_raw.get("oid")
+    for field in PAGE_QA_REVIEW_FIELDS:
+        update[field] = page_raw.get(field)
+
+    update["hasNotes"] = bool(page_raw.get("notes"))
+
+    return pymongo.UpdateOne(
+        {"page_id": page_raw["_id"], "qa_run_id": qa_run_id},
+        {"$set": update, "$setOnInsert": {"_id": uuid4()}},
+        upsert=True,
+    )
+
+
+def get_qa_histogram_bucket(score: Optional[float]) -> str:
+    """Return histogram bucket key for QA score"""
+    if score is None:
+        return QA_HISTOGRAM_NO_SCORE
+
+    # small epsilon so that scores on bucket boundaries aren't rounded down
+    bucket = int(score * QA_HISTOGRAM_RESOLUTION + 1e-9)
+    return str(min(max(bucket, 0), QA_HISTOGRAM_RESOLUTION))
+
+
+def get_page_qa_compare(page_qa: Dict[str, Any]) -> Dict[str, Any]:
+    """Return QA comparison data from page_qa entry"""
+    return {key: page_qa.get(key) for key in PageQACompare.__fields__}
+
+
 # ============================================================================
 # pylint: disable=too-many-arguments, too-many-locals, invalid-name, fixme
-def init_pages_api(app, mdb, crawl_ops, org_ops, storage_ops, user_dep):
+def init_pages_api(
+    app, mdb, crawl_ops, org_ops, storage_ops, background_job_ops, user_dep
+):
     """init pages API"""
     # pylint: disable=invalid-name
 
     ops = PageOps(mdb, crawl_ops, org_ops, storage_ops)
 
+    background_job_ops.set_page_ops(ops)
+
     org_crawl_dep = org_ops.org_crawl_dep
 
     @app.post("/orgs/{oid}/crawls/all/pages/reAdd", tags=["pages"])
@@ -641,16 +1032,18 @@ def init_pages_api(app, mdb, crawl_ops, org_ops, storage_ops, user_dep):
         if not user.is_superuser:
             raise HTTPException(status_code=403, detail="Not Allowed")
 
-        asyncio.create_task(ops.re_add_all_crawl_pages(org.id))
-        return {"started": True}
+        job_id = await background_job_ops.create_re_add_pages_job(org.id)
+        return {"started": True, "id": job_id}
 
     @app.post("/orgs/{oid}/crawls/{crawl_id}/pages/reAdd", tags=["pages"])
     async def re_add_crawl_pages(
         crawl_id: str, org: Organization = Depends(org_crawl_dep)
     ):
         """Re-add pages for crawl"""
-        asyncio.create_task(ops.re_add_crawl_pages(crawl_id, org.id))
-        return {"started": True}
+        await crawl_ops.get_crawl_raw(crawl_id, org, "crawl", project={"_id": True})
+
+        job_id = await background_job_ops.create_re_add_pages_job(org.id, crawl_id)
+        return {"started": True, "id": job_id}
 
     @app.get(
         "/orgs/{oid}/crawls/{crawl_id}/pages/{page_id}",
@@ -751,13 +1144,18 @@ def init_pages_api(app, mdb, crawl_ops, org_ops, storage_ops, user_dep):
         page: int = 1,
         sortBy: Optional[str] = None,
         sortDirection: Optional[int] = -1,
+        nextToken: Optional[str] = Query(default=None, alias="next"),
+        includeTotal: bool = False,
     ):
-        """Retrieve paginated list of pages"""
+        """Retrieve paginated list of pages
+
+        Pass next= (empty for first page) to use keyset pagination,
+        following the returned next token for each subsequent page"""
         formatted_approved: Optional[List[Union[bool, None]]] = None
         if approved:
             formatted_approved = str_list_to_bools(approved.split(","))
 
-        pages, total = await ops.list_pages(
+        pages, total, next_token = await ops.list_pages(
             crawl_id=crawl_id,
             org=org,
             reviewed=reviewed,
@@ -767,8 +1165,10 @@ def init_pages_api(app, mdb, crawl_ops, org_ops, storage_ops, user_dep):
             page=page,
             sort_by=sortBy,
             sort_direction=sortDirection,
+            next_token=nextToken,
+            include_total=includeTotal,
         )
-        return paginated_format(pages, total, page, pageSize)
+        return paginated_format(pages, total, page, pageSize, next_token)
 
     @app.get(
         "/orgs/{oid}/crawls/{crawl_id}/qa/{qa_run_id}/pages",
@@ -791,13 +1191,18 @@ def init_pages_api(app, mdb, crawl_ops, org_ops, storage_ops, user_dep):
         page: int = 1,
         sortBy: Optional[str] = None,
         sortDirection: Optional[int] = -1,
+        nextToken: Optional[str] = Query(default=None, alias="next"),
+        includeTotal: bool = False,
     ):
-        """Retrieve paginated list of pages"""
+        """Retrieve paginated list of pages
+
+        Pass next= (empty for first page) to use keyset pagination,
+        following the returned next token for each subsequent page"""
         formatted_approved: Optional[List[Union[bool, None]]] = None
         if approved:
             formatted_approved = str_list_to_bools(approved.split(","))
 
-        pages, total = await ops.list_pages(
+        pages, total, next_token = await ops.list_pages(
             crawl_id=crawl_id,
             org=org,
             qa_run_id=qa_run_id,
@@ -813,7 +1218,9 @@ def init_pages_api(app, mdb, crawl_ops, org_ops, storage_ops, user_dep):
             page=page,
             sort_by=sortBy,
             sort_direction=sortDirection,
+            next_token=nextToken,
+            include_total=includeTotal,
         )
-        return paginated_format(pages, total, page, pageSize)
+        return paginated_format(pages, total, page, pageSize, next_token)
 
     return ops
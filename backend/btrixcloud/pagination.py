@@ -1,6 +1,13 @@
 """API pagination"""
 
-from typing import Any, List, Optional
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
 
 
 DEFAULT_PAGE_SIZE = 1_000
@@ -9,9 +16,199 @@ DEFAULT_PAGE_SIZE = 1_000
 # ============================================================================
 def paginated_format(
     items: Optional[List[Any]],
-    total: int,
+    total: Optional[int],
     page: int = 1,
     page_size: int = DEFAULT_PAGE_SIZE,
+    next_token: Optional[str] = None,
 ):
     """Return items in paged format."""
-    return {"items": items, "total": total, "page": page, "pageSize": page_size}
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "pageSize": page_size,
+        "next": next_token,
+    }
+
+
+# ============================================================================
+async def paginate_aggregate(
+    collection,
+    aggregate: List[Any],
+    sort: Optional[Dict[str, int]] = None,
+    page: int = 1,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    next_token: Optional[str] = None,
+    include_total: bool = True,
+    **kwargs,
+) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
+    """Run aggregate on collection, adding sort and pagination stages,
+    and return (items, total, next_token)
+
+    If next_token is None, use offset pagination with page and page_size
+    and always compute total.
+
+    Otherwise, use keyset (cursor) pagination: next_token is the opaque token
+    returned with the previous page, or empty string for first page.
+    Items are sorted by sort keys and then _id, and only items after
+    the token are returned, without skipping. Total is only computed if
+    include_total is set. The returned next_token is None on the last page.
+
+    Additional kwargs (eg. collation) are passed to aggregate()
+    """
+    # pylint: disable=too-many-arguments, too-many-locals
+    aggregate = list(aggregate)
+    total: Optional[int] = None
+
+    if next_token is None:
+        if sort:
+            aggregate.append({"$sort": sort})
+
+        skip = (page - 1) * page_size
+        aggregate.append(
+            {
+                "$facet": {
+                    "items": [
+                        {"$skip": skip},
+                        {"$limit": page_size},
+                    ],
+                    "total": [{"$count": "count"}],
+                }
+            }
+        )
+
+        cursor = collection.aggregate(aggregate, **kwargs)
+        results = await cursor.to_list(length=1)
+        result = results[0]
+        items = result["items"]
+
+        try:
+            total = int(result["total"][0]["count"])
+        except (IndexError, ValueError):
+            total = 0
+
+        return items, total, None
+
+    sort_keys = list((sort or {}).items())
+    id_direction = sort_keys[0][1] if sort_keys else 1
+    if "_id" not in (sort or {}):
+        sort_keys.append(("_id", id_direction))
+
+    items_stages: List[Dict[str, Any]] = []
+    if next_token:
+        items_stages.append({"$match": keyset_match(sort_keys, next_token)})
+
+    items_stages.append({"$sort": dict(sort_keys)})
+    # fetch one extra item to determine if there is a next page
+    items_stages.append({"$limit": page_size + 1})
+
+    if include_total:
+        aggregate.append(
+            {"$facet": {"items": items_stages, "total": [{"$count": "count"}]}}
+        )
+        cursor = collection.aggregate(aggregate, **kwargs)
+        results = await cursor.to_list(length=1)
+        items = results[0]["items"]
+        try:
+            total = int(results[0]["total"][0]["count"])
+        except (IndexError, ValueError):
+            total = 0
+    else:
+        aggregate.extend(items_stages)
+        cursor = collection.aggregate(aggregate, **kwargs)
+        items = await cursor.to_list(length=page_size + 1)
+
+    new_next_token = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        new_next_token = encode_next_token(
+            [_get_path(items[-1], key) for key, _ in sort_keys]
+        )
+
+    return items, total, new_next_token
+
+
+# ============================================================================
+def keyset_match(sort_keys: List[Tuple[str, int]], next_token: str) -> Dict:
+    """Return match query for items sorted strictly after the values
+    encoded in next_token, for given list of (key, direction) sort keys"""
+    values = decode_next_token(next_token)
+    if len(values) != len(sort_keys):
+        raise HTTPException(status_code=400, detail="invalid_next_token")
+
+    clauses = []
+    prefix: Dict[str, Any] = {}
+
+    for (key, direction), value in zip(sort_keys, values):
+        after = _after_value(key, value, direction)
+        if after is not None:
+            clauses.append({**prefix, **after})
+
+        prefix[key] = value
+
+    return {"$or": clauses}
+
+
+def _after_value(key: str, value: Any, direction: int) -> Optional[Dict]:
+    """return query for values of key sorted strictly after value.
+    null / missing values sort before all other values"""
+    if direction == 1:
+        if value is None:
+            return {key: {"$ne": None}}
+
+        return {key: {"$gt": value}}
+
+    if value is None:
+        return None
+
+    return {"$or": [{key: {"$lt": value}}, {key: None}]}
+
+
+def _get_path(item: Dict[str, Any], key: str) -> Any:
+    """get value of (possibly dotted, with array indexes) key from item"""
+    value: Any = item
+    for part in key.split("."):
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.isdigit():
+            value = value[int(part)] if int(part) < len(value) else None
+        else:
+            return None
+
+    return value
+
+
+# ============================================================================
+def encode_next_token(values: List[Any]) -> str:
+    """Encode sort key values as opaque url-safe token"""
+    encoded = []
+    for value in values:
+        if isinstance(value, datetime):
+            encoded.append({"d": value.isoformat()})
+        elif isinstance(value, UUID):
+            encoded.append({"u": str(value)})
+        else:
+            encoded.append({"v": value})
+
+    data = json.dumps(encoded, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def decode_next_token(next_token: str) -> List[Any]:
+    """Decode sort key values from token created by encode_next_token"""
+    try:
+        data = base64.urlsafe_b64decode(next_token.encode("ascii"))
+        values: List[Any] = []
+        for encoded in json.loads(data):
+            if "d" in encoded:
+                values.append(datetime.fromisoformat(encoded["d"]))
+            elif "u" in encoded:
+                values.append(UUID(encoded["u"]))
+            else:
+                values.append(encoded["v"])
+
+        return values
+
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeError):
+        # pylint: disable=raise-missing-from
+        raise HTTPException(status_code=400, detail="invalid_next_token")
@@ -1,16 +1,16 @@
 """ Profile Management """
 
-from typing import Optional, TYPE_CHECKING, Any, cast, Dict, List
+from typing import Optional, TYPE_CHECKING, Any, cast, Dict, Iterable, List
 from datetime import datetime
 from uuid import UUID, uuid4
 import os
 
 from urllib.parse import urlencode
 
-from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi import APIRouter, Depends, Request, HTTPException, Query
 import aiohttp
 
-from .pagination import DEFAULT_PAGE_SIZE, paginated_format
+from .pagination import DEFAULT_PAGE_SIZE, paginate_aggregate, paginated_format
 from .models import (
     Profile,
     ProfileWithCrawlConfigs,
@@ -230,10 +230,13 @@ class ProfileOps:
             crawlerChannel=browser_commit.crawlerChannel,
         )
 
-        await self.profiles.find_one_and_update(
+        prev_profile = await self.profiles.find_one_and_update(
             {"_id": profile.id}, {"$set": profile.to_dict()}, upsert=True
         )
 
+        if not prev_profile:
+            await self.orgs.inc_org_profile_count(oid)
+
         await self.background_job_ops.create_replica_jobs(
             oid, profile_file, str(profileid), "profile"
         )
@@ -275,20 +278,19 @@ class ProfileOps:
         page: int = 1,
         sort_by: str = "modified",
         sort_direction: int = -1,
+        next_token: Optional[str] = None,
+        include_total: bool = True,
     ):
         """list all profiles"""
         # pylint: disable=too-many-locals
 
-        # Zero-index page for query
-        page = page - 1
-        skip = page_size * page
-
         match_query = {"oid": org.id}
         if userid:
             match_query["userid"] = userid
 
         aggregate: List[Dict[str, Any]] = [{"$match": match_query}]
 
+        sort = None
         if sort_by:
             if sort_by not in ("modified", "created", "name", "url"):
                 raise HTTPException(status_code=400, detail="invalid_sort_by")
@@ -298,34 +300,20 @@ class ProfileOps:
             if sort_by == "url":
                 sort_by = "origins.0"
 
-            aggregate.extend([{"$sort": {sort_by: sort_direction}}])
-
-        aggregate.extend(
-            [
-                {
-                    "$facet": {
-                        "items": [
-                            {"$skip": skip},
-                            {"$limit": page_size},
-                        ],
-                        "total": [{"$count": "count"}],
-                    }
-                },
-            ]
-        )
-
-        cursor = self.profiles.aggregate(aggregate)
-        results = await cursor.to_list(length=1)
-        result = results[0]
-        items = result["items"]
+            sort = {sort_by: sort_direction}
 
-        try:
-            total = int(result["total"][0]["count"])
-        except (IndexError, ValueError):
-            total = 0
+        items, total, next_token = await paginate_aggregate(
+            self.profiles,
+            aggregate,
+            sort,
+            page,
+            page_size,
+            next_token,
+            include_total,
+        )
 
         profiles = [Profile.from_dict(res) for res in items]
-        return profiles, total
+        return profiles, total, next_token
 
     async def get_profile(self, profileid: UUID, org: Optional[Organization] = None):
         """get profile by id and org"""
@@ -370,6 +358,17 @@ class ProfileOps:
         except:
             return None
 
+    async def get_profile_names(
+        self, profileids: Iterable[UUID], org: Optional[Organization] = None
+    ) -> Dict[UUID, str]:
+        """return names of profiles by id for given profile ids, in one query"""
+        query: Dict[str, Any] = {"_id": {"$in": list(profileids)}}
+        if org:
+            query["oid"] = org.id
+
+        cursor = self.profiles.find(query, projection={"name": True})
+        return {res["_id"]: res.get("name") async for res in cursor}
+
     async def get_crawl_configs_for_profile(self, profileid: UUID, org: Organization):
         """Get list of crawl configs with basic info for that use a particular profile"""
 
@@ -401,6 +400,8 @@ class ProfileOps:
         if not res or res.deleted_count != 1:
             raise HTTPException(status_code=404, detail="profile_not_found")
 
+        await self.orgs.inc_org_profile_count(org.id, -1)
+
         await self.background_job_ops.create_delete_replica_jobs(
             org, profile.resource, profile.id, "profile"
         )
@@ -477,16 +478,21 @@ def init_profiles_api(
         page: int = 1,
         sortBy: str = "modified",
         sortDirection: int = -1,
+        nextToken: Optional[str] = Query(default=None, alias="next"),
+        includeTotal: bool = False,
     ):
-        profiles, total = await ops.list_profiles(
+        # pylint: disable=duplicate-code
+        profiles, total, next_token = await ops.list_profiles(
             org,
             userid,
             page_size=pageSize,
             page=page,
             sort_by=sortBy,
             sort_direction=sortDirection,
+            next_token=nextToken,
+            include_total=includeTotal,
         )
-        return paginated_format(profiles, total, page, pageSize)
+        return paginated_format(profiles, total, page, pageSize, next_token)
 
     @router.post("")
     async def commit_browser_to_new(
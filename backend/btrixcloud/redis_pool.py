@@ -0,0 +1,160 @@
+""" Registry of long-lived, pooled redis clients, one per crawl redis """
+
+import contextlib
+import os
+import time
+from typing import AsyncIterator, Dict, Tuple
+
+from redis import asyncio as aioredis
+from redis.asyncio.client import Redis
+
+
+DEFAULT_IDLE_SECS = 300
+
+DEFAULT_HEALTH_CHECK_SECS = 30
+
+DEFAULT_MAX_CONNECTIONS = 20
+
+DEFAULT_STATS_LOG_SECS = 300
+
+
+# ============================================================================
+# pylint: disable=too-many-instance-attributes
+class RedisClientPool:
+    """Keep one redis client (with its own connection pool) per redis url,
+    reusing it across requests / operator syncs instead of connecting anew.
+
+    Clients not used for idle_secs, and not currently held, are closed and
+    removed, and clients for finished crawls can be removed explicitly"""
+
+    clients: Dict[str, Tuple[Redis, float]]
+
+    # number of current holders of client, by redis url
+    holders: Dict[str, int]
+
+    def __init__(self):
+        self.clients = {}
+        self.holders = {}
+
+        self.idle_secs = int(
+            os.environ.get("REDIS_POOL_IDLE_SECS") or DEFAULT_IDLE_SECS
+        )
+
+        self.health_check_secs = int(
+            os.environ.get("REDIS_POOL_HEALTH_CHECK_SECS") or DEFAULT_HEALTH_CHECK_SECS
+        )
+
+        self.max_connections = int(
+            os.environ.get("REDIS_POOL_MAX_CONNECTIONS") or DEFAULT_MAX_CONNECTIONS
+        )
+
+        self.stats_log_secs = int(
+            os.environ.get("REDIS_POOL_STATS_LOG_SECS") or DEFAULT_STATS_LOG_SECS
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.last_stats_log = time.monotonic()
+
+    async def get(self, redis_url: str) -> Redis:
+        """return pooled client for redis url, creating if needed"""
+        now = time.monotonic()
+
+        await self.evict_idle(now)
+
+        entry = self.clients.get(redis_url)
+        if entry:
+            self.hits += 1
+            client = entry[0]
+        else:
+            self.misses += 1
+            client = aioredis.from_url(
+                redis_url,
+                decode_responses=True,
+                auto_close_connection_pool=True,
+                socket_timeout=20,
+                health_check_interval=self.health_check_secs,
+                max_connections=self.max_connections,
+            )
+
+        self.clients[redis_url] = (client, now)
+        self.log_stats(now)
+        return client
+
+    @contextlib.asynccontextmanager
+    async def hold(self, redis_url: str) -> AsyncIterator[Redis]:
+        """return pooled client for redis url, which is not evicted while held,
+        and counts as used until released"""
+        client = await self.get(redis_url)
+        self.holders[redis_url] = self.holders.get(redis_url, 0) + 1
+
+        try:
+            yield client
+
+        finally:
+            count = self.holders.pop(redis_url, 0) - 1
+            if count > 0:
+                self.holders[redis_url] = count
+
+            entry = self.clients.get(redis_url)
+            if entry and entry[0] is client:
+                self.clients[redis_url] = (client, time.monotonic())
+
+    async def remove(self, redis_url: str):
+        """close and remove client for redis url, if any"""
+        entry = self.clients.pop(redis_url, None)
+        if not entry:
+            return
+
+        await self._close(entry[0])
+
+    async def evict_idle(self, now: float):
+        """close and remove clients not used in the last idle_secs,
+        skipping clients currently held"""
+        idle = [
+            url
+            for url, (_, last_used) in self.clients.items()
+            if now - last_used > self.idle_secs and not self.holders.get(url)
+        ]
+
+        for url in idle:
+            entry = self.clients.pop(url, None)
+            if entry:
+                self.evictions += 1
+                await self._close(entry[0])
+
+        if idle:
+            print(f"Redis client pool: evicted {len(idle)}, {self.stats()}", flush=True)
+
+    async def close_all(self):
+        """close all pooled clients, on shutdown"""
+        clients = list(self.clients.values())
+        self.clients = {}
+        self.holders = {}
+        for client, _ in clients:
+            await self._close(client)
+
+    def log_stats(self, now: float):
+        """log pool stats, at most once every stats_log_secs"""
+        if now - self.last_stats_log < self.stats_log_secs:
+            return
+
+        self.last_stats_log = now
+        print(f"Redis client pool: {self.stats()}", flush=True)
+
+    def stats(self) -> Dict[str, int]:
+        """return pool hit / miss / eviction counts"""
+        return {
+            "size": len(self.clients),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    async def _close(self, client: Redis):
+        try:
+            await client.close()
+        # pylint: disable=broad-exception-caught
+        except Exception as exc:
+            print(f"Error closing redis client: {exc}", flush=True)
@@ -2,35 +2,45 @@
 Storage API
 """
 
+# pylint: disable=too-many-lines
+
 from typing import (
     Optional,
     Iterator,
-    Iterable,
     List,
     Dict,
     AsyncIterator,
     TYPE_CHECKING,
     Any,
+    Tuple,
+    cast,
+    Callable,
 )
 from urllib.parse import urlsplit
-from contextlib import asynccontextmanager
-from itertools import chain
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Full as QueueFull
+from contextlib import asynccontextmanager, AsyncExitStack
 
 import asyncio
+import hashlib
 import heapq
 import zlib
 import json
 import os
+import threading
+import time
 
 from datetime import datetime
-from zipfile import ZipInfo
 
 from fastapi import Depends, HTTPException
-from stream_zip import stream_zip, NO_COMPRESSION_64
-from remotezip import RemoteZip
+from fastapi.responses import StreamingResponse
 
+import aiohttp
 import aiobotocore.session
+from aiobotocore.config import AioConfig
 import boto3
+from botocore.config import Config
 
 from mypy_boto3_s3.client import S3Client
 from mypy_boto3_s3.type_defs import CompletedPartTypeDef
@@ -44,9 +54,12 @@ from .models import (
     S3Storage,
     S3StorageIn,
     OrgStorageRefs,
+    ZipMember,
 )
 
-from .utils import is_bool, slug_from_name
+from .utils import is_bool, slug_from_name, parse_range_header
+from .ziplayout import ZipSegment, get_zip_layout, iter_segment_ranges
+from .zipreader import AsyncZipReader, read_zip_members
 
 
 if TYPE_CHECKING:
@@ -57,9 +70,194 @@ else:
 
 CHUNK_SIZE = 1024 * 256
 
+# number of WACZs to read pages from concurrently
+DEFAULT_PAGE_READ_CONCURRENCY = 4
+
+# max number of pages read ahead from WACZs and not yet consumed
+DEFAULT_PAGE_QUEUE_SIZE = 1000
+
+# number of chunks read ahead when streaming logs and pages from WACZs
+DEFAULT_WACZ_READ_AHEAD_CHUNKS = 4
+
+# max size of each block of log lines in crawl log index
+DEFAULT_LOG_INDEX_BLOCK_SIZE = 1024 * 1024
+
+# number of files requested ahead of the one being streamed in downloads
+DEFAULT_DOWNLOAD_PREFETCH_FILES = 2
+
+# max bytes buffered for each file being streamed or prefetched in downloads
+DEFAULT_DOWNLOAD_PREFETCH_BUFFER_SIZE = 8 * 1024 * 1024
+
+# max number of cached s3 clients, each with own connection pool
+DEFAULT_S3_CLIENT_POOL_SIZE = 32
+
+# max connections kept open by each cached s3 client
+DEFAULT_S3_CLIENT_MAX_CONNECTIONS = 50
+
+# max number of keys in a single s3 DeleteObjects request
+DELETE_OBJECTS_MAX_KEYS = 1000
+
+# max number of presigned urls cached in memory
+
+# size of each part in multipart uploads, s3 requires at least 5MiB
+DEFAULT_UPLOAD_PART_SIZE = 10_000_000
+MIN_UPLOAD_PART_SIZE = 5 * 1024 * 1024
+
+# max number of parts of a multipart upload read and uploading at once
+DEFAULT_UPLOAD_PART_CONCURRENCY = 4
+
+# number of attempts to upload each part before failing the upload
+DEFAULT_UPLOAD_PART_ATTEMPTS = 3
+
+
+# ============================================================================
+class PooledS3Client:
+    """Cached async s3 client and its usage count"""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, client: AIOS3Client, exit_stack: AsyncExitStack):
+        self.client = client
+        self.exit_stack = exit_stack
+        self.in_use = 0
+        self.invalidated = False
+
+    async def close(self):
+        """close client and its connection pool"""
+        try:
+            await self.exit_stack.aclose()
+        except Exception as exc:
+            print(f"Error closing s3 client: {exc}", flush=True)
+
+
+# ============================================================================
+class S3ClientPool:
+    """Cache of long-lived s3 clients, one per storage endpoint and
+    credentials, so that storage refs resolving to the same storage share
+    a client and its connections across requests.
+
+    Least recently used clients beyond pool_size are closed once no
+    longer in use"""
+
+    clients: "OrderedDict[tuple, PooledS3Client]"
+    sync_clients: "OrderedDict[tuple, S3Client]"
+
+    def __init__(self):
+        self.pool_size = int(
+            os.environ.get("S3_CLIENT_POOL_SIZE") or DEFAULT_S3_CLIENT_POOL_SIZE
+        )
+        self.max_connections = int(
+            os.environ.get("S3_CLIENT_MAX_CONNECTIONS")
+            or DEFAULT_S3_CLIENT_MAX_CONNECTIONS
+        )
+
+        self.session = aiobotocore.session.get_session()
+        self.clients = OrderedDict()
+        self.sync_clients = OrderedDict()
+        self.lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def get_client(
+        self, endpoint_url: str, storage: S3Storage
+    ) -> AsyncIterator[AIOS3Client]:
+        """context manager for cached async client for endpoint and storage"""
+        cache_key = self._get_cache_key(endpoint_url, storage)
+
+        async with self.lock:
+            entry = self.clients.get(cache_key)
+            if entry:
+                self.clients.move_to_end(cache_key)
+            else:
+                exit_stack = AsyncExitStack()
+                client = await exit_stack.enter_async_context(
+                    self.session.create_client(
+                        "s3",
+                        region_name=storage.region,
+                        endpoint_url=endpoint_url,
+                        aws_access_key_id=storage.access_key,
+                        aws_secret_access_key=storage.secret_key,
+                        config=AioConfig(max_pool_connections=self.max_connections),
+                    )
+                )
+                entry = PooledS3Client(client, exit_stack)
+                self.clients[cache_key] = entry
+                await self._evict_unused()
+
+            entry.in_use += 1
+
+        try:
+            yield entry.client
+        finally:
+            entry.in_use -= 1
+            if entry.invalidated and not entry.in_use:
+                await entry.close()
+
+    def get_sync_client(self, endpoint_url: str, storage: S3Storage) -> S3Client:
+        """return cached boto3 client for endpoint and storage"""
+        cache_key = self._get_cache_key(endpoint_url, storage)
+
+        cached = self.sync_clients.get(cache_key)
+        if cached:
+            self.sync_clients.move_to_end(cache_key)
+            return cached
+
+        client = boto3.client(
+            "s3",
+            region_name=storage.region,
+            endpoint_url=endpoint_url,
+            aws_access_key_id=storage.access_key,
+            aws_secret_access_key=storage.secret_key,
+            config=Config(max_pool_connections=self.max_connections),
+        )
+        self.sync_clients[cache_key] = client
+
+        # sync clients may still be streaming downloads, so evicted clients
+        # are not closed explicitly, their connections are released when done
+        while len(self.sync_clients) > self.pool_size:
+            self.sync_clients.popitem(last=False)
+
+        return client
+
+    async def invalidate(self, storage: S3Storage):
+        """remove cached clients using storage's credentials, eg.
+        when a custom storage is removed or fails verification"""
+        async with self.lock:
+            for cache_key in list(self.clients.keys()):
+                if cache_key[1:] != self._get_credentials(storage):
+                    continue
+
+                entry = self.clients.pop(cache_key)
+                entry.invalidated = True
+                if not entry.in_use:
+                    await entry.close()
+
+            for cache_key in list(self.sync_clients.keys()):
+                if cache_key[1:] == self._get_credentials(storage):
+                    self.sync_clients.pop(cache_key)
+
+    async def _evict_unused(self):
+        """close least recently used clients beyond pool size not in use"""
+        for cache_key in list(self.clients.keys()):
+            if len(self.clients) <= self.pool_size:
+                break
+
+            entry = self.clients[cache_key]
+            if entry.in_use:
+                continue
+
+            del self.clients[cache_key]
+            await entry.close()
+
+    def _get_cache_key(self, endpoint_url: str, storage: S3Storage) -> tuple:
+        return (endpoint_url, *self._get_credentials(storage))
+
+    def _get_credentials(self, storage: S3Storage) -> tuple:
+        return (storage.region, storage.access_key, storage.secret_key)
+
 
 # ============================================================================
 # pylint: disable=broad-except,raise-missing-from
+# pylint: disable=too-many-instance-attributes,too-many-public-methods
 class StorageOps:
     """All storage handling, download/upload operations"""
 
@@ -79,6 +277,37 @@ class StorageOps:
         self.org_ops = org_ops
         self.crawl_manager = crawl_manager
 
+        self.s3_client_pool = S3ClientPool()
+
+        self.upload_part_size = max(
+            int(os.environ.get("UPLOAD_PART_SIZE") or DEFAULT_UPLOAD_PART_SIZE),
+            MIN_UPLOAD_PART_SIZE,
+        )
+        self.upload_part_concurrency = int(
+            os.environ.get("UPLOAD_PART_CONCURRENCY") or DEFAULT_UPLOAD_PART_CONCURRENCY
+        )
+        self.upload_part_attempts = int(
+            os.environ.get("UPLOAD_PART_ATTEMPTS") or DEFAULT_UPLOAD_PART_ATTEMPTS
+        )
+
+        self.wacz_read_ahead_chunks = int(
+            os.environ.get("WACZ_READ_AHEAD_CHUNKS") or DEFAULT_WACZ_READ_AHEAD_CHUNKS
+        )
+
+        self.http_session: Optional[aiohttp.ClientSession] = None
+
+        self.log_index_block_size = int(
+            os.environ.get("LOG_INDEX_BLOCK_SIZE") or DEFAULT_LOG_INDEX_BLOCK_SIZE
+        )
+
+        self.download_prefetch_files = int(
+            os.environ.get("DOWNLOAD_PREFETCH_FILES") or DEFAULT_DOWNLOAD_PREFETCH_FILES
+        )
+        self.download_prefetch_buffer_size = int(
+            os.environ.get("DOWNLOAD_PREFETCH_BUFFER_SIZE")
+            or DEFAULT_DOWNLOAD_PREFETCH_BUFFER_SIZE
+        )
+
         self.is_local_minio = is_bool(os.environ.get("IS_LOCAL_MINIO"))
 
         frontend_origin = os.environ.get(
@@ -178,6 +407,7 @@ class StorageOps:
         try:
             await self.verify_storage_upload(storage, ".btrix-upload-verify")
         except:
+            await self.s3_client_pool.invalidate(storage)
             raise HTTPException(
                 status_code=400,
                 detail="Could not verify custom storage. Check credentials are valid?",
@@ -217,10 +447,12 @@ class StorageOps:
         )
 
         try:
-            del org.customStorages[name]
+            storage = org.customStorages.pop(name)
         except:
             raise HTTPException(status_code=400, detail="no_such_storage")
 
+        await self.s3_client_pool.invalidate(storage)
+
         await self.org_ops.update_custom_storages(org)
 
         return {"deleted": True}
@@ -261,7 +493,7 @@ class StorageOps:
     async def get_s3_client(
         self, storage: S3Storage, use_access=False
     ) -> AsyncIterator[tuple[AIOS3Client, str, str]]:
-        """context manager for s3 client"""
+        """context manager for cached s3 client for storage"""
         endpoint_url = (
             storage.endpoint_url if not use_access else storage.access_endpoint_url
         )
@@ -273,22 +505,14 @@ class StorageOps:
 
         endpoint_url = parts.scheme + "://" + parts.netloc
 
-        session = aiobotocore.session.get_session()
-
-        async with session.create_client(
-            "s3",
-            region_name=storage.region,
-            endpoint_url=endpoint_url,
-            aws_access_key_id=storage.access_key,
-            aws_secret_access_key=storage.secret_key,
-        ) as client:
+        async with self.s3_client_pool.get_client(endpoint_url, storage) as client:
             yield client, bucket, key
 
     @asynccontextmanager
     async def get_sync_client(
         self, org: Organization
     ) -> AsyncIterator[tuple[S3Client, str, str]]:
-        """context manager for s3 client"""
+        """context manager for cached sync s3 client for org primary storage"""
         storage = self.get_org_primary_storage(org)
 
         endpoint_url = storage.endpoint_url
@@ -301,17 +525,7 @@ class StorageOps:
 
         endpoint_url = parts.scheme + "://" + parts.netloc
 
-        try:
-            client = boto3.client(
-                "s3",
-                region_name=storage.region,
-                endpoint_url=endpoint_url,
-                aws_access_key_id=storage.access_key,
-                aws_secret_access_key=storage.secret_key,
-            )
-            yield client, bucket, key
-        finally:
-            client.close()
+        yield self.s3_client_pool.get_sync_client(endpoint_url, storage), bucket, key
 
     async def verify_storage_upload(self, storage: S3Storage, filename: str) -> None:
         """Test credentials and storage endpoint by uploading an empty test file"""
@@ -389,10 +603,16 @@ class StorageOps:
         org: Organization,
         filename: str,
         file_: AsyncIterator,
-        min_size: int,
+        min_size: Optional[int] = None,
     ) -> bool:
-        """do upload to specified key using multipart chunking"""
+        """do upload to specified key using multipart chunking
+
+        Up to upload_part_concurrency parts are uploaded at once while the
+        next part is read, so at most that many parts (of min_size, by
+        default upload_part_size) are buffered in memory"""
+        # pylint: disable=too-many-locals, too-many-statements
         s3storage = self.get_org_primary_storage(org)
+        min_size = min_size or self.upload_part_size
 
         async def get_next_chunk(file_, min_size) -> bytes:
             total = 0
@@ -418,38 +638,79 @@ class StorageOps:
 
             upload_id = mup_resp["UploadId"]
 
-            parts = []
-            part_number = 1
+            window = asyncio.Semaphore(self.upload_part_concurrency)
+
+            async def upload_part(part_number: int, chunk: bytes):
+                try:
+                    attempt = 1
+                    while True:
+                        try:
+                            resp = await client.upload_part(
+                                Bucket=bucket,
+                                Body=chunk,
+                                UploadId=upload_id,
+                                PartNumber=part_number,
+                                Key=key,
+                            )
+                            break
+                        except Exception as exc:
+                            if attempt >= self.upload_part_attempts:
+                                raise
+
+                            print(
+                                f"part upload failed, retrying: {part_number} "
+                                + f"attempt {attempt} {upload_id}: {exc}",
+                                flush=True,
+                            )
+                            await asyncio.sleep(attempt)
+                            attempt += 1
+                finally:
+                    window.release()
+
+                print(
+                    f"part added: {part_number} {len(chunk)} {upload_id}",
+                    flush=True,
+                )
+
+                part: CompletedPartTypeDef = {
+                    "PartNumber": part_number,
+                    "ETag": resp["ETag"],
+                }
+                return part
+
+            tasks: List[asyncio.Task] = []
+            total_size = 0
+            start = time.monotonic()
 
             try:
+                part_number = 1
+
                 while True:
-                    chunk = await get_next_chunk(file_, min_size)
-
-                    resp = await client.upload_part(
-                        Bucket=bucket,
-                        Body=chunk,
-                        UploadId=upload_id,
-                        PartNumber=part_number,
-                        Key=key,
-                    )
+                    # wait for a free slot before reading next part into memory
+                    await window.acquire()
 
-                    print(
-                        f"part added: {part_number} {len(chunk)} {upload_id}",
-                        flush=True,
-                    )
+                    for task in tasks:
+                        if task.done() and task.exception():
+                            window.release()
+                            raise cast(Exception, task.exception())
 
-                    part: CompletedPartTypeDef = {
-                        "PartNumber": part_number,
-                        "ETag": resp["ETag"],
-                    }
+                    try:
+                        chunk = await get_next_chunk(file_, min_size)
+                    except:
+                        window.release()
+                        raise
+
+                    total_size += len(chunk)
 
-                    parts.append(part)
+                    tasks.append(asyncio.create_task(upload_part(part_number, chunk)))
 
                     part_number += 1
 
                     if len(chunk) < min_size:
                         break
 
+                parts = await asyncio.gather(*tasks)
+
                 await client.complete_multipart_upload(
                     Bucket=bucket,
                     Key=key,
@@ -457,11 +718,24 @@ class StorageOps:
                     MultipartUpload={"Parts": parts},
                 )
 
-                print(f"Multipart upload succeeded: {upload_id}")
+                elapsed = time.monotonic() - start
+                rate = total_size / elapsed / 1_000_000 if elapsed else 0
+
+                print(
+                    f"Multipart upload succeeded: {upload_id}, "
+                    + f"{total_size} bytes in {len(parts)} parts, "
+                    + f"{elapsed:.1f}s, {rate:.2f} MB/s",
+                    flush=True,
+                )
 
                 return True
             # pylint: disable=broad-exception-caught
             except Exception as exc:
+                for task in tasks:
+                    task.cancel()
+
+                await asyncio.gather(*tasks, return_exceptions=True)
+
                 await client.abort_multipart_upload(
                     Bucket=bucket, Key=key, UploadId=upload_id
                 )
@@ -483,29 +757,164 @@ class StorageOps:
             bucket,
             key,
         ):
-            key += crawlfile.filename
-
-            presigned_url = await client.generate_presigned_url(
-                "get_object", Params={"Bucket": bucket, "Key": key}, ExpiresIn=duration
+            return await self._sign_url(
+                client, bucket, key + crawlfile.filename, s3storage, duration
             )
 
-            if (
-                not s3storage.use_access_for_presign
-                and s3storage.access_endpoint_url
-                and s3storage.access_endpoint_url != s3storage.endpoint_url
-            ):
-                presigned_url = presigned_url.replace(
-                    s3storage.endpoint_url, s3storage.access_endpoint_url
+    async def get_presigned_urls(
+        self,
+        org: Organization,
+        crawlfiles: List[CrawlFile],
+        duration: int,
+        expire_at: datetime,
+    ) -> List[Tuple[str, datetime]]:
+        """return (presigned url, expire at) for each crawl file
+
+        Urls are signed concurrently, sharing one client (and signer)
+        per storage"""
+        results: List[Optional[Tuple[str, datetime]]] = [None] * len(crawlfiles)
+        by_storage: Dict[str, List[int]] = {}
+
+        for inx, crawlfile in enumerate(crawlfiles):
+            by_storage.setdefault(str(crawlfile.storage), []).append(inx)
+
+        for indexes in by_storage.values():
+            storage_ref = crawlfiles[indexes[0]].storage
+            s3storage = self.get_org_storage_by_ref(org, storage_ref)
+
+            async with self.get_s3_client(
+                s3storage, s3storage.use_access_for_presign
+            ) as (client, bucket, key):
+                urls = await asyncio.gather(
+                    *[
+                        self._sign_url(
+                            client,
+                            bucket,
+                            key + crawlfiles[inx].filename,
+                            s3storage,
+                            duration,
+                        )
+                        for inx in indexes
+                    ]
                 )
 
+            for inx, url in zip(indexes, urls):
+                results[inx] = (url, expire_at)
+
+        return cast(List[Tuple[str, datetime]], results)
+
+    async def _sign_url(
+        self,
+        client: AIOS3Client,
+        bucket: str,
+        key: str,
+        s3storage: S3Storage,
+        duration: int,
+    ) -> str:
+        presigned_url = await client.generate_presigned_url(
+            "get_object", Params={"Bucket": bucket, "Key": key}, ExpiresIn=duration
+        )
+
+        if (
+            not s3storage.use_access_for_presign
+            and s3storage.access_endpoint_url
+            and s3storage.access_endpoint_url != s3storage.endpoint_url
+        ):
+            presigned_url = presigned_url.replace(
+                s3storage.endpoint_url, s3storage.access_endpoint_url
+            )
+
         return presigned_url
 
+    async def get_wacz_members(
+        self, org: Organization, crawlfile: CrawlFile
+    ) -> List[ZipMember]:
+        """read member listing from central directory of WACZ in storage"""
+        s3storage = self.get_org_storage_by_ref(org, crawlfile.storage)
+
+        async with self.get_s3_client(s3storage) as (client, bucket, key):
+            key += crawlfile.filename
+
+            async def fetch_range(offset: int, length: int) -> bytes:
+                resp = await client.get_object(
+                    Bucket=bucket,
+                    Key=key,
+                    Range=f"bytes={offset}-{offset + length - 1}",
+                )
+                async with resp["Body"] as body:
+                    return await body.read()
+
+            return await read_zip_members(fetch_range, crawlfile.size)
+
     async def delete_crawl_file_object(
         self, org: Organization, crawlfile: CrawlFile
     ) -> bool:
         """delete crawl file from storage."""
         return await self._delete_file(org, crawlfile.filename, crawlfile.storage)
 
+    async def delete_crawl_file_objects(
+        self, org: Organization, crawlfiles: List[CrawlFile]
+    ) -> Dict[str, str]:
+        """delete crawl files from storage, returning errors by filename
+
+        Files are grouped by storage and deleted with DeleteObjects requests
+        of up to DELETE_OBJECTS_MAX_KEYS keys each, all run concurrently"""
+        by_storage: Dict[str, List[CrawlFile]] = {}
+        for crawlfile in crawlfiles:
+            by_storage.setdefault(str(crawlfile.storage), []).append(crawlfile)
+
+        errors: Dict[str, str] = {}
+
+        async def delete_batch(
+            client: AIOS3Client, bucket: str, key: str, filenames: List[str]
+        ):
+            try:
+                response = await client.delete_objects(
+                    Bucket=bucket,
+                    Delete={
+                        "Objects": [{"Key": key + filename} for filename in filenames],
+                        "Quiet": True,
+                    },
+                )
+                for error in response.get("Errors", []):
+                    filename = error.get("Key", "").removeprefix(key)
+                    errors[filename] = error.get("Code") or "unknown_error"
+
+            # pylint: disable=broad-exception-caught
+            except Exception as exc:
+                for filename in filenames:
+                    errors[filename] = str(exc)
+
+        async def delete_storage_files(files: List[CrawlFile]):
+            s3storage = self.get_org_storage_by_ref(org, files[0].storage)
+            filenames = [file_.filename for file_ in files]
+
+            async with self.get_s3_client(s3storage) as (client, bucket, key):
+                await asyncio.gather(
+                    *[
+                        delete_batch(
+                            client,
+                            bucket,
+                            key,
+                            filenames[inx : inx + DELETE_OBJECTS_MAX_KEYS],
+                        )
+                        for inx in range(0, len(filenames), DELETE_OBJECTS_MAX_KEYS)
+                    ]
+                )
+
+        await asyncio.gather(
+            *[delete_storage_files(files) for files in by_storage.values()]
+        )
+
+        if errors:
+            print(
+                f"Error deleting {len(errors)} of {len(crawlfiles)} files: "
+                + ", ".join(f"{name}: {err}" for name, err in errors.items()),
+                flush=True,
+            )
+
+        return errors
+
     async def _delete_file(
         self, org: Organization, filename: str, storage: StorageRef
     ) -> bool:
@@ -525,67 +934,115 @@ class StorageOps:
 
         return status_code == 204
 
-    async def sync_stream_wacz_pages(
-        self, wacz_files: List[CrawlFileOut]
-    ) -> Iterator[Dict[Any, Any]]:
-        """Return stream of pages specified WACZ"""
-        loop = asyncio.get_event_loop()
+    def get_http_session(self) -> aiohttp.ClientSession:
+        """return shared http session for reading WACZs from presigned urls"""
+        if not self.http_session or self.http_session.closed:
+            self.http_session = aiohttp.ClientSession()
 
-        resp = await loop.run_in_executor(None, self._sync_get_pages, wacz_files)
+        return self.http_session
 
-        return resp
+    async def close_http_session(self):
+        """close shared http session, on shutdown"""
+        if self.http_session and not self.http_session.closed:
+            await self.http_session.close()
 
-    async def sync_stream_wacz_logs(
-        self,
-        wacz_files: List[CrawlFileOut],
-        log_levels: List[str],
-        contexts: List[str],
-    ) -> Iterator[bytes]:
-        """Return filtered stream of logs from specified WACZs sorted by timestamp"""
-        loop = asyncio.get_event_loop()
-
-        resp = await loop.run_in_executor(
-            None,
-            self._sync_get_logs,
-            wacz_files,
-            log_levels,
-            contexts,
-        )
+        self.http_session = None
 
-        return resp
+    def get_wacz_reader(self, wacz_file: CrawlFileOut) -> AsyncZipReader:
+        """return async range request reader for WACZ"""
+        return AsyncZipReader(
+            self.get_http_session(),
+            self.resolve_internal_access_path(wacz_file.path),
+            wacz_file.size,
+            self.wacz_read_ahead_chunks,
+        )
 
-    def _sync_get_logs(
+    async def stream_wacz_pages(
         self,
         wacz_files: List[CrawlFileOut],
-        log_levels: List[str],
-        contexts: List[str],
-    ) -> Iterator[bytes]:
-        """Generate filtered stream of logs from specified WACZs sorted by timestamp"""
+        concurrency: int = DEFAULT_PAGE_READ_CONCURRENCY,
+        queue_size: int = DEFAULT_PAGE_QUEUE_SIZE,
+    ) -> AsyncIterator[Dict[Any, Any]]:
+        """Async stream of pages from specified WACZs.
+
+        Up to 'concurrency' WACZs are read at once, feeding a bounded queue.
+        Readers wait when the queue is full, so no more than 'queue_size'
+        pages are held in memory. Pages from different WACZs may be
+        interleaved."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        sem = asyncio.Semaphore(concurrency)
+
+        async def reader(wacz_file: CrawlFileOut):
+            async with sem:
+                async for page_dict in self._iter_wacz_pages(wacz_file):
+                    await queue.put(page_dict)
+
+        readers = [asyncio.create_task(reader(wacz_file)) for wacz_file in wacz_files]
+
+        async def wait_for_readers():
+            results = await asyncio.gather(*readers, return_exceptions=True)
+            await queue.put(None)
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+
+        done_task = asyncio.create_task(wait_for_readers())
+
+        try:
+            while True:
+                page_dict = await queue.get()
+                if page_dict is None:
+                    break
+
+                yield page_dict
+
+            # raise reader exception, if any
+            await done_task
+
+        finally:
+            for reader_task in readers:
+                reader_task.cancel()
+
+            done_task.cancel()
+            await asyncio.gather(done_task, *readers, return_exceptions=True)
+
+    async def _iter_wacz_pages(
+        self, wacz_file: CrawlFileOut
+    ) -> AsyncIterator[Dict[Any, Any]]:
+        """Iterate over page dicts in all page files in one WACZ"""
+        wacz_reader = self.get_wacz_reader(wacz_file)
+
+        members = wacz_file.members
+        if members is None:
+            members = await wacz_reader.get_members()
 
-        # pylint: disable=too-many-function-args
-        def stream_log_lines(
-            log_zipinfo: ZipInfo, wacz_url: str, wacz_filename: str
-        ) -> Iterator[dict]:
-            """Pass lines as json objects"""
-            filename = log_zipinfo.filename
+        for member in members:
+            if not member.name.startswith("pages/") or not member.name.endswith(
+                ".jsonl"
+            ):
+                continue
 
-            print(f"Fetching log {filename} from {wacz_filename}", flush=True)
+            print(
+                f"Fetching JSON lines from {member.name} in {wacz_file.name}",
+                flush=True,
+            )
 
-            line_iter: Iterator[bytes] = self._sync_get_filestream(wacz_url, filename)
-            for line in line_iter:
+            async for line in wacz_reader.iter_member_lines(member):
                 yield _parse_json(line.decode("utf-8", errors="ignore"))
 
-        def stream_json_lines(
-            iterator: Iterable[dict], log_levels: List[str], contexts: List[str]
-        ) -> Iterator[bytes]:
-            """Yield parsed JSON dicts as JSON-lines bytes after filtering as necessary"""
-            for line_dict in iterator:
-                if log_levels and line_dict["logLevel"] not in log_levels:
-                    continue
-                if contexts and line_dict["context"] not in contexts:
-                    continue
-                json_str = json.dumps(line_dict, ensure_ascii=False) + "\n"
-                yield json_str.encode("utf-8")
+    async def stream_wacz_logs(
+        self,
+        wacz_files: List[CrawlFileOut],
+        log_levels: List[str],
+        contexts: List[str],
+        log_index: Optional[Dict[Tuple[str, str], List[Dict[str, Any]]]] = None,
+    ) -> AsyncIterator[bytes]:
+        """Generate filtered stream of logs from specified WACZs sorted by timestamp
+
+        If log_index, a dict of (WACZ filename, log member name) to index blocks,
+        is provided, only blocks with lines matching the filters are read.
+        Logs with no matching blocks are skipped. Deflated logs are still read
+        from the start up to the last matching block, see iter_member_lines()"""
 
         def organize_based_on_instance_number(
             wacz_files: List[CrawlFileOut],
@@ -603,134 +1060,363 @@ class StorageOps:
                     waczs_groups[instance_number] = [file]
             return list(waczs_groups.values())
 
-        log_generators: List[Iterator[dict]] = []
+        if not log_levels and not contexts:
+            log_index = None
 
-        waczs_groups = organize_based_on_instance_number(wacz_files)
-        for instance_list in waczs_groups:
-            wacz_log_streams: List[Iterator[dict]] = []
+        log_iters = [
+            self._iter_instance_logs(instance_list, log_levels, contexts, log_index)
+            for instance_list in organize_based_on_instance_number(wacz_files)
+        ]
 
-            for wacz_file in instance_list:
-                wacz_url = self.resolve_internal_access_path(wacz_file.path)
-                with RemoteZip(wacz_url) as remote_zip:
-                    log_files: List[ZipInfo] = [
-                        f
-                        for f in remote_zip.infolist()
-                        if f.filename.startswith("logs/") and not f.is_dir()
-                    ]
-                    log_files.sort(key=lambda log_zipinfo: log_zipinfo.filename)
+        async for line_dict in _merge_sorted(
+            log_iters, key=lambda entry: entry["timestamp"]
+        ):
+            if log_levels and line_dict["logLevel"] not in log_levels:
+                continue
+            if contexts and line_dict["context"] not in contexts:
+                continue
+            json_str = json.dumps(line_dict, ensure_ascii=False) + "\n"
+            yield json_str.encode("utf-8")
+
+    async def _iter_instance_logs(
+        self,
+        wacz_files: List[CrawlFileOut],
+        log_levels: List[str],
+        contexts: List[str],
+        log_index: Optional[Dict[Tuple[str, str], List[Dict[str, Any]]]],
+    ) -> AsyncIterator[dict]:
+        """Iterate over log lines, as json objects, in all WACZs
+        from a single crawler instance, in order"""
+        for wacz_file in wacz_files:
+            wacz_reader = self.get_wacz_reader(wacz_file)
 
-                    for log_zipinfo in log_files:
-                        wacz_log_streams.append(
-                            stream_log_lines(log_zipinfo, wacz_url, wacz_file.name)
-                        )
+            for member in await self._get_log_members(wacz_reader, wacz_file):
+                ranges = None
+                blocks = (
+                    log_index.get((wacz_file.name, member.name)) if log_index else None
+                )
+                if blocks is not None:
+                    ranges = _get_log_ranges(blocks, log_levels, contexts)
+                    if not ranges:
+                        continue
+
+                print(f"Fetching log {member.name} from {wacz_file.name}", flush=True)
+
+                async for line in wacz_reader.iter_member_lines(member, ranges):
+                    yield _parse_json(line.decode("utf-8", errors="ignore"))
+
+    async def index_wacz_logs(
+        self, wacz_file: CrawlFileOut
+    ) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Return (log member name, blocks) index for each log in WACZ
+
+        Each block covers consecutive log lines, up to log_index_block_size
+        bytes, and records their byte range, first and last timestamp,
+        and counts of lines per log level and context"""
+        wacz_reader = self.get_wacz_reader(wacz_file)
+
+        index = []
+
+        for member in await self._get_log_members(wacz_reader, wacz_file):
+            blocks = []
+            block: Optional[Dict[str, Any]] = None
+            counts: Dict[Tuple[str, str], int] = {}
+            offset = 0
+
+            async for line in wacz_reader.iter_member_lines(member):
+                if not block:
+                    block = {
+                        "offset": offset,
+                        "length": 0,
+                        "firstTimestamp": None,
+                        "lastTimestamp": None,
+                    }
+                    counts = {}
 
-            log_generators.append(chain(*wacz_log_streams))
+                line_dict = _parse_json(line.decode("utf-8", errors="ignore"))
 
-        heap_iter = heapq.merge(*log_generators, key=lambda entry: entry["timestamp"])
+                key = (line_dict.get("logLevel", ""), line_dict.get("context", ""))
+                counts[key] = counts.get(key, 0) + 1
 
-        return stream_json_lines(heap_iter, log_levels, contexts)
+                timestamp = line_dict.get("timestamp")
+                if timestamp:
+                    block["firstTimestamp"] = block["firstTimestamp"] or timestamp
+                    block["lastTimestamp"] = timestamp
 
-    def _sync_get_pages(
-        self,
-        wacz_files: List[CrawlFileOut],
-    ) -> Iterator[Dict[Any, Any]]:
-        """Generate stream of page dicts from specified WACZs"""
+                block["length"] += len(line)
+                offset += len(line)
 
-        # pylint: disable=too-many-function-args
-        def stream_page_lines(
-            pagefile_zipinfo: ZipInfo, wacz_url: str, wacz_filename: str
-        ) -> Iterator[Dict[Any, Any]]:
-            """Pass lines as json objects"""
-            filename = pagefile_zipinfo.filename
+                if block["length"] >= self.log_index_block_size:
+                    blocks.append(_finish_log_block(block, counts))
+                    block = None
 
-            print(
-                f"Fetching JSON lines from {filename} in {wacz_filename}",
-                flush=True,
-            )
+            if block:
+                blocks.append(_finish_log_block(block, counts))
 
-            line_iter: Iterator[bytes] = self._sync_get_filestream(wacz_url, filename)
-            for line in line_iter:
-                yield _parse_json(line.decode("utf-8", errors="ignore"))
+            index.append((member.name, blocks))
 
-        page_generators: List[Iterator[Dict[Any, Any]]] = []
+        return index
 
-        for wacz_file in wacz_files:
-            wacz_url = self.resolve_internal_access_path(wacz_file.path)
-            with RemoteZip(wacz_url) as remote_zip:
-                page_files: List[ZipInfo] = [
-                    f
-                    for f in remote_zip.infolist()
-                    if f.filename.startswith("pages/")
-                    and f.filename.endswith(".jsonl")
-                    and not f.is_dir()
-                ]
-                for pagefile_zipinfo in page_files:
-                    page_generators.append(
-                        stream_page_lines(pagefile_zipinfo, wacz_url, wacz_file.name)
-                    )
+    async def _get_log_members(
+        self, wacz_reader: AsyncZipReader, wacz_file: CrawlFileOut
+    ) -> List[ZipMember]:
+        members = wacz_file.members
+        if members is None:
+            members = await wacz_reader.get_members()
 
-        return chain.from_iterable(page_generators)
+        log_members = [member for member in members if member.name.startswith("logs/")]
+        log_members.sort(key=lambda member: member.name)
+        return log_members
 
-    def _sync_get_filestream(self, wacz_url: str, filename: str) -> Iterator[bytes]:
-        """Return iterator of lines in remote file as bytes"""
-        with RemoteZip(wacz_url) as remote_zip:
-            with remote_zip.open(filename) as file_stream:
-                yield from file_stream
+    def get_streaming_wacz_layout(
+        self, all_files: List[CrawlFileOut]
+    ) -> Tuple[List[ZipSegment], int, str]:
+        """return (segments, size, etag) of multi-wacz zip for files
 
-    def _sync_dl(
-        self, all_files: List[CrawlFileOut], client: S3Client, bucket: str, key: str
-    ) -> Iterator[bytes]:
-        """generate streaming zip as sync"""
+        The layout only depends on the files, not on when they are
+        requested, so that byte ranges of the same download can be served
+        and resumed across requests"""
+        all_files = sorted(all_files, key=lambda file_: file_.name)
+
+        resources = []
         for file_ in all_files:
             file_.path = file_.name
+            resources.append(
+                file_.dict(include={"name", "path", "hash", "crc32", "size", "crawlId"})
+            )
 
         datapackage = {
             "profile": "multi-wacz-package",
-            "resources": [file_.dict() for file_ in all_files],
+            "resources": resources,
         }
         datapackage_bytes = json.dumps(datapackage).encode("utf-8")
 
-        def get_file(name) -> Iterator[bytes]:
-            response = client.get_object(Bucket=bucket, Key=key + name)
-            return response["Body"].iter_chunks(chunk_size=CHUNK_SIZE)
-
-        def member_files():
-            modified_at = datetime(year=1980, month=1, day=1)
-            perms = 0o664
-            for file_ in all_files:
-                yield (
-                    file_.name,
-                    modified_at,
-                    perms,
-                    NO_COMPRESSION_64(file_.size, file_.crc32),
-                    get_file(file_.name),
-                )
-
-            yield (
+        members: List[Tuple[str, int, int, Optional[bytes]]] = [
+            (file_.name, file_.size, file_.crc32, None) for file_ in all_files
+        ]
+        members.append(
+            (
                 "datapackage.json",
-                modified_at,
-                perms,
-                NO_COMPRESSION_64(
-                    len(datapackage_bytes), zlib.crc32(datapackage_bytes)
-                ),
-                (datapackage_bytes,),
+                len(datapackage_bytes),
+                zlib.crc32(datapackage_bytes),
+                datapackage_bytes,
             )
+        )
 
-        return stream_zip(member_files(), chunk_size=CHUNK_SIZE)
+        segments, size = get_zip_layout(members)
+        etag = '"' + hashlib.sha256(datapackage_bytes).hexdigest()[:32] + '"'
+        return segments, size, etag
 
-    async def download_streaming_wacz(
-        self, org: Organization, files: List[CrawlFileOut]
+    def _sync_dl(
+        self,
+        segments: List[ZipSegment],
+        start: int,
+        end: int,
+        client: S3Client,
+        bucket: str,
+        key: str,
     ) -> Iterator[bytes]:
-        """return an iter for downloading a stream nested wacz file
-        from list of files"""
+        """generate bytes [start, end) of streaming zip as sync
+
+        While each file is streamed, the next download_prefetch_files files
+        are already requested, each buffering up to download_prefetch_buffer_size
+        bytes, to avoid waiting on the first bytes of each file"""
+        # pylint: disable=too-many-arguments,too-many-locals
+        ranges = list(iter_segment_ranges(segments, start, end))
+        file_ranges = [
+            (segment.name or "", seg_start, seg_end)
+            for segment, seg_start, seg_end in ranges
+            if segment.data is None
+        ]
+
+        stopped = threading.Event()
+        buffer_chunks = max(1, self.download_prefetch_buffer_size // CHUNK_SIZE)
+        executor = ThreadPoolExecutor(max_workers=self.download_prefetch_files + 1)
+
+        def prefetch_file(name: str, range_start: int, range_end: int, buffer: Queue):
+            """read range of file into bounded buffer, blocking while it is full"""
+
+            def put(item) -> bool:
+                while not stopped.is_set():
+                    try:
+                        buffer.put(item, timeout=1)
+                        return True
+                    except QueueFull:
+                        continue
+                return False
+
+            try:
+                response = client.get_object(
+                    Bucket=bucket,
+                    Key=key + name,
+                    Range=f"bytes={range_start}-{range_end - 1}",
+                )
+                for chunk in response["Body"].iter_chunks(chunk_size=CHUNK_SIZE):
+                    if not put(chunk):
+                        response["Body"].close()
+                        return
+
+                put(None)
+            except Exception as exc:
+                put(exc)
+
+        def get_file(buffer: Queue) -> Iterator[bytes]:
+            while True:
+                chunk = buffer.get()
+                if chunk is None:
+                    return
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+
+        def zip_chunks() -> Iterator[bytes]:
+            buffers: List[Queue] = []
+            file_inx = 0
+
+            for segment, seg_start, seg_end in ranges:
+                if segment.data is not None:
+                    yield segment.data[seg_start:seg_end]
+                    continue
+
+                # start fetching current file and next files, up to prefetch depth
+                while len(buffers) < min(
+                    file_inx + 1 + self.download_prefetch_files, len(file_ranges)
+                ):
+                    buffer: Queue = Queue(maxsize=buffer_chunks)
+                    executor.submit(prefetch_file, *file_ranges[len(buffers)], buffer)
+                    buffers.append(buffer)
+
+                yield from get_file(buffers[file_inx])
+                file_inx += 1
+
+        def stream_with_stats() -> Iterator[bytes]:
+            start_time = time.monotonic()
+            total_size = 0
+            try:
+                for chunk in zip_chunks():
+                    total_size += len(chunk)
+                    yield chunk
+            finally:
+                stopped.set()
+                executor.shutdown(wait=False)
+
+                elapsed = time.monotonic() - start_time
+                rate = total_size / elapsed / 1_000_000 if elapsed else 0
+                print(
+                    f"Streaming download: {total_size} bytes, "
+                    + f"{len(file_ranges)} files, {elapsed:.1f}s, {rate:.2f} MB/s",
+                    flush=True,
+                )
+
+        return stream_with_stats()
+
+    async def download_streaming_wacz(
+        self,
+        org: Organization,
+        files: List[CrawlFileOut],
+        filename: str,
+        range_header: Optional[str] = None,
+        if_range: Optional[str] = None,
+    ) -> StreamingResponse:
+        """return streaming response for downloading a nested wacz file
+        from list of files, or the requested byte range of it"""
+        # pylint: disable=too-many-arguments
+        segments, size, etag = self.get_streaming_wacz_layout(files)
+
+        byte_range = None
+        # only resume if download has not changed since, otherwise send all
+        if not if_range or if_range == etag:
+            byte_range = parse_range_header(range_header, size)
+
+        start, end = byte_range or (0, size)
+
+        headers = {
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Content-Length": str(end - start),
+            "Accept-Ranges": "bytes",
+            "ETag": etag,
+        }
+
+        status_code = 200
+        if byte_range:
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+
         async with self.get_sync_client(org) as (client, bucket, key):
             loop = asyncio.get_event_loop()
 
             resp = await loop.run_in_executor(
-                None, self._sync_dl, files, client, bucket, key
+                None, self._sync_dl, segments, start, end, client, bucket, key
             )
 
-            return resp
+        return StreamingResponse(
+            resp,
+            status_code=status_code,
+            headers=headers,
+            media_type="application/wacz+zip",
+        )
+
+
+# ============================================================================
+async def _merge_sorted(
+    iterators: List[AsyncIterator[dict]], key: Callable[[dict], Any]
+) -> AsyncIterator[dict]:
+    """Merge already sorted async iterators into single sorted iterator,
+    like heapq.merge()"""
+    heap = []
+    for inx, iterator in enumerate(iterators):
+        item = await anext(iterator, None)
+        if item is not None:
+            heap.append((key(item), inx, item))
+
+    heapq.heapify(heap)
+
+    while heap:
+        _, inx, item = heap[0]
+        yield item
+
+        item = await anext(iterators[inx], None)
+        if item is not None:
+            heapq.heapreplace(heap, (key(item), inx, item))
+        else:
+            heapq.heappop(heap)
+
+
+# ============================================================================
+def _finish_log_block(
+    block: Dict[str, Any], counts: Dict[Tuple[str, str], int]
+) -> Dict[str, Any]:
+    block["counts"] = [
+        {"logLevel": log_level, "context": context, "count": count}
+        for (log_level, context), count in counts.items()
+    ]
+    return block
+
+
+def _get_log_ranges(
+    blocks: List[Dict[str, Any]], log_levels: List[str], contexts: List[str]
+) -> List[Tuple[int, int]]:
+    """return (start, end) byte ranges of log index blocks containing lines
+    matching log levels and contexts, merging adjacent blocks"""
+    ranges: List[Tuple[int, int]] = []
+
+    for block in blocks:
+        if not any(
+            (not log_levels or count["logLevel"] in log_levels)
+            and (not contexts or count["context"] in contexts)
+            for count in block["counts"]
+        ):
+            continue
+
+        start = block["offset"]
+        end = start + block["length"]
+
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+
+    return ranges
 
 
 # ============================================================================
@@ -10,7 +10,7 @@ from uuid import UUID
 import asyncio
 from io import BufferedReader
 from typing import Optional, List, Any
-from fastapi import Depends, UploadFile, File
+from fastapi import Depends, UploadFile, File, Query
 from fastapi import HTTPException
 from starlette.requests import Request
 from pathvalidate import sanitize_filename
@@ -32,9 +32,6 @@ from .pagination import paginated_format, DEFAULT_PAGE_SIZE
 from .utils import dt_now
 
 
-MIN_UPLOAD_PART_SIZE = 10000000
-
-
 # ============================================================================
 class UploadOps(BaseCrawlOps):
     """upload ops"""
@@ -92,10 +89,7 @@ class UploadOps(BaseCrawlOps):
         print("Stream Upload Start", flush=True)
 
         if not await self.storage_ops.do_upload_multipart(
-            org,
-            file_prep.upload_name,
-            stream_iter(),
-            MIN_UPLOAD_PART_SIZE,
+            org, file_prep.upload_name, stream_iter()
         ):
             print("Stream Upload Failed", flush=True)
             raise HTTPException(status_code=400, detail="upload_failed")
@@ -191,10 +185,14 @@ class UploadOps(BaseCrawlOps):
 
         # result = await self.crawls.insert_one(uploaded.to_dict())
         # return {"id": str(result.inserted_id), "added": True}
-        await self.crawls.find_one_and_update(
+        prev_upload = await self.crawls.find_one_and_update(
             {"_id": crawl_id}, {"$set": uploaded.to_dict()}, upsert=True
         )
 
+        # replacing existing upload doesn't change item count
+        if not prev_upload:
+            await self.orgs.inc_org_item_counts(org.id, "upload")
+
         asyncio.create_task(
             self.event_webhook_ops.create_upload_finished_notification(crawl_id, org.id)
         )
@@ -218,7 +216,7 @@ class UploadOps(BaseCrawlOps):
         user: Optional[User] = None,
     ):
         """Delete uploaded crawls"""
-        deleted_count, _, quota_reached = await self.delete_crawls(
+        deleted_count, quota_reached = await self.delete_crawls(
             org, delete_list, "upload", user
         )
 
@@ -356,6 +354,8 @@ def init_uploads_api(app, user_dep, *args):
         collectionId: Optional[UUID] = None,
         sortBy: str = "finished",
         sortDirection: int = -1,
+        nextToken: Optional[str] = Query(default=None, alias="next"),
+        includeTotal: bool = False,
     ):
         states = state.split(",") if state else None
 
@@ -365,7 +365,7 @@ def init_uploads_api(app, user_dep, *args):
         if description:
             description = unquote(description)
 
-        uploads, total = await ops.list_all_base_crawls(
+        uploads, total, next_token = await ops.list_all_base_crawls(
             org,
             userid=userid,
             states=states,
@@ -377,8 +377,10 @@ def init_uploads_api(app, user_dep, *args):
             sort_by=sortBy,
             sort_direction=sortDirection,
             type_="upload",
+            next_token=nextToken,
+            include_total=includeTotal,
         )
-        return paginated_format(uploads, total, page, pageSize)
+        return paginated_format(uploads, total, page, pageSize, next_token)
 
     @app.get(
         "/orgs/{oid}/uploads/{crawlid}",
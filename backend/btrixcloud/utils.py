@@ -11,7 +11,7 @@ import sys
 import re
 
 from datetime import datetime
-from typing import Optional, Dict, Union, List
+from typing import Optional, Dict, Union, List, Tuple
 
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
@@ -150,3 +150,38 @@ def stream_dict_list_as_csv(data: List[Dict[str, Union[str, int]]], filename: st
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment;filename={filename}"},
     )
+
+
+def parse_range_header(
+    range_header: Optional[str], size: int
+) -> Optional[Tuple[int, int]]:
+    """Parse single 'bytes' Range header into (start, end) with end exclusive.
+
+    Returns None if no range, or if range can not be parsed or has multiple
+    ranges, so the full content is sent. Raises HTTPException 416 if range
+    is not satisfiable"""
+    if not range_header:
+        return None
+
+    match = re.match(r"^bytes=(\d*)-(\d*)$", range_header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+
+    first, last = match.groups()
+
+    if first == "":
+        # suffix range: last n bytes
+        start = max(0, size - int(last))
+        end = size
+    else:
+        start = int(first)
+        end = min(size, int(last) + 1) if last else size
+
+    if start >= size or start >= end:
+        raise HTTPException(
+            status_code=416,
+            detail="range_not_satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    return start, end
@@ -7,9 +7,9 @@ from uuid import UUID, uuid4
 
 import aiohttp
 import backoff
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
-from .pagination import DEFAULT_PAGE_SIZE, paginated_format
+from .pagination import DEFAULT_PAGE_SIZE, paginate_aggregate, paginated_format
 from .models import (
     WebhookEventType,
     WebhookNotification,
@@ -70,12 +70,11 @@ class EventWebhookOps:
         event: Optional[str] = None,
         sort_by: Optional[str] = None,
         sort_direction: Optional[int] = -1,
+        next_token: Optional[str] = None,
+        include_total: bool = True,
     ):
         """List all webhook notifications"""
         # pylint: disable=duplicate-code
-        # Zero-index page for query
-        page = page - 1
-        skip = page_size * page
 
         query: dict[str, object] = {"oid": org.id}
 
@@ -87,6 +86,7 @@ class EventWebhookOps:
 
         aggregate = [{"$match": query}]
 
+        sort = None
         if sort_by:
             SORT_FIELDS = ("success", "event", "attempts", "created", "lastAttempted")
             if sort_by not in SORT_FIELDS:
@@ -94,36 +94,21 @@ class EventWebhookOps:
             if sort_direction not in (1, -1):
                 raise HTTPException(status_code=400, detail="invalid_sort_direction")
 
-            aggregate.extend([{"$sort": {sort_by: sort_direction}}])
-
-        aggregate.extend(
-            [
-                {
-                    "$facet": {
-                        "items": [
-                            {"$skip": skip},
-                            {"$limit": page_size},
-                        ],
-                        "total": [{"$count": "count"}],
-                    }
-                },
-            ]
-        )
-
-        # Get total
-        cursor = self.webhooks.aggregate(aggregate)
-        results = await cursor.to_list(length=1)
-        result = results[0]
-        items = result["items"]
+            sort = {sort_by: sort_direction}
 
-        try:
-            total = int(result["total"][0]["count"])
-        except (IndexError, ValueError):
-            total = 0
+        items, total, next_token = await paginate_aggregate(
+            self.webhooks,
+            aggregate,
+            sort,
+            page,
+            page_size,
+            next_token,
+            include_total,
+        )
 
         notifications = [WebhookNotification.from_dict(res) for res in items]
 
-        return notifications, total
+        return notifications, total, next_token
 
     async def get_notification(self, org: Organization, notificationid: UUID):
         """Get webhook notification by id and org"""
@@ -453,8 +438,10 @@ def init_event_webhooks_api(mdb, org_ops, app):
         event: Optional[str] = None,
         sortBy: Optional[str] = None,
         sortDirection: Optional[int] = -1,
+        nextToken: Optional[str] = Query(default=None, alias="next"),
+        includeTotal: bool = False,
     ):
-        notifications, total = await ops.list_notifications(
+        notifications, total, next_token = await ops.list_notifications(
             org,
             page_size=pageSize,
             page=page,
@@ -462,8 +449,10 @@ def init_event_webhooks_api(mdb, org_ops, app):
             event=event,
             sort_by=sortBy,
             sort_direction=sortDirection,
+            next_token=nextToken,
+            include_total=includeTotal,
         )
-        return paginated_format(notifications, total, page, pageSize)
+        return paginated_format(notifications, total, page, pageSize, next_token)
 
     @router.get("/{notificationid}", response_model=WebhookNotification)
     async def get_notification(
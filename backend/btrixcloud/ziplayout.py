@@ -0,0 +1,155 @@
+"""
+Layout of uncompressed (stored) zip64 files from members of known size
+and crc32, so that any byte range of the zip can be generated directly
+"""
+
+import struct
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+
+ZIP64_VERSION = 45
+UNIX_MADE_BY = 3 << 8
+UTF8_FLAG = 0x800
+
+# 1980-01-01 00:00:00 in ms-dos date and time format
+DOS_TIME = 0
+DOS_DATE = (1 << 5) | 1
+
+EXTERNAL_ATTR = 0o100664 << 16
+
+LOCAL_HEADER_STRUCT = struct.Struct("<4s5H3L2H")
+LOCAL_ZIP64_EXTRA_STRUCT = struct.Struct("<2H2Q")
+
+CENTRAL_DIR_STRUCT = struct.Struct("<4s6H3L5H2L")
+CENTRAL_ZIP64_EXTRA_STRUCT = struct.Struct("<2H3Q")
+
+ZIP64_EOCD_STRUCT = struct.Struct("<4sQ2H2L4Q")
+ZIP64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+EOCD_STRUCT = struct.Struct("<4s4H2LH")
+
+MAX_16 = 0xFFFF
+MAX_32 = 0xFFFFFFFF
+
+
+# ============================================================================
+class ZipSegment(NamedTuple):
+    """Part of zip file at offset, either generated data,
+    or contents of member file with given name"""
+
+    offset: int
+    length: int
+    data: Optional[bytes] = None
+    name: Optional[str] = None
+
+
+# ============================================================================
+def get_zip_layout(
+    members: List[Tuple[str, int, int, Optional[bytes]]]
+) -> Tuple[List[ZipSegment], int]:
+    """return segments and total size of stored zip64 file containing
+    (name, size, crc32, data) members. Contents of members without data are
+    not included, but referenced by name in segments"""
+    # pylint: disable=too-many-locals
+    segments: List[ZipSegment] = []
+    central_dir = b""
+    offset = 0
+
+    def add_segment(length: int, data: Optional[bytes], name: Optional[str] = None):
+        nonlocal offset
+        if length:
+            segments.append(ZipSegment(offset, length, data, name))
+            offset += length
+
+    for name, size, crc32, data in members:
+        name_bytes = name.encode("utf-8")
+        header_offset = offset
+
+        local_header = (
+            LOCAL_HEADER_STRUCT.pack(
+                b"PK\x03\x04",
+                ZIP64_VERSION,
+                UTF8_FLAG,
+                0,
+                DOS_TIME,
+                DOS_DATE,
+                crc32,
+                MAX_32,
+                MAX_32,
+                len(name_bytes),
+                LOCAL_ZIP64_EXTRA_STRUCT.size,
+            )
+            + name_bytes
+            + LOCAL_ZIP64_EXTRA_STRUCT.pack(1, 16, size, size)
+        )
+
+        add_segment(len(local_header), local_header)
+        add_segment(size, data, name if data is None else None)
+
+        central_dir += (
+            CENTRAL_DIR_STRUCT.pack(
+                b"PK\x01\x02",
+                UNIX_MADE_BY | ZIP64_VERSION,
+                ZIP64_VERSION,
+                UTF8_FLAG,
+                0,
+                DOS_TIME,
+                DOS_DATE,
+                crc32,
+                MAX_32,
+                MAX_32,
+                len(name_bytes),
+                CENTRAL_ZIP64_EXTRA_STRUCT.size,
+                0,
+                0,
+                0,
+                EXTERNAL_ATTR,
+                MAX_32,
+            )
+            + name_bytes
+            + CENTRAL_ZIP64_EXTRA_STRUCT.pack(1, 24, size, size, header_offset)
+        )
+
+    central_dir_offset = offset
+    zip64_eocd_offset = central_dir_offset + len(central_dir)
+    num_members = len(members)
+
+    end = (
+        ZIP64_EOCD_STRUCT.pack(
+            b"PK\x06\x06",
+            ZIP64_EOCD_STRUCT.size - 12,
+            UNIX_MADE_BY | ZIP64_VERSION,
+            ZIP64_VERSION,
+            0,
+            0,
+            num_members,
+            num_members,
+            len(central_dir),
+            central_dir_offset,
+        )
+        + ZIP64_LOCATOR_STRUCT.pack(b"PK\x06\x07", 0, zip64_eocd_offset, 1)
+        + EOCD_STRUCT.pack(b"PK\x05\x06", 0, 0, MAX_16, MAX_16, MAX_32, MAX_32, 0)
+    )
+
+    add_segment(len(central_dir) + len(end), central_dir + end)
+
+    return segments, offset
+
+
+def iter_segment_ranges(
+    segments: List[ZipSegment], start: int, end: int
+) -> Iterator[Tuple[ZipSegment, int, int]]:
+    """yield (segment, start, end) for each segment overlapping zip byte range
+    [start, end), with start and end relative to the segment"""
+    for segment in segments:
+        seg_end = segment.offset + segment.length
+        if seg_end <= start:
+            continue
+
+        if segment.offset >= end:
+            break
+
+        yield (
+            segment,
+            max(start, segment.offset) - segment.offset,
+            min(end, seg_end) - segment.offset,
+        )
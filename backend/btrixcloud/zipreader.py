@@ -0,0 +1,388 @@
+"""
+Read zip (WACZ) central directory and members with range requests
+"""
+
+import asyncio
+import struct
+import zlib
+from contextlib import aclosing
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import aiohttp
+
+from .models import ZipMember
+
+
+# max size of end of central directory record, including max comment
+EOCD_MAX_SIZE = 22 + 65535
+
+# extra bytes requested after local file header for its extra field,
+# to read header and data in a single request
+LOCAL_EXTRA_PADDING = 1024
+
+CHUNK_SIZE = 1024 * 256
+
+# number of chunks read ahead of consumer when streaming a member
+DEFAULT_READ_AHEAD_CHUNKS = 4
+
+EOCD_SIG = b"PK\x05\x06"
+EOCD_STRUCT = struct.Struct("<4s4H2LH")
+
+ZIP64_LOCATOR_SIG = b"PK\x06\x07"
+ZIP64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+
+ZIP64_EOCD_SIG = b"PK\x06\x06"
+ZIP64_EOCD_STRUCT = struct.Struct("<4sQ2H2L4Q")
+
+CENTRAL_DIR_SIG = b"PK\x01\x02"
+CENTRAL_DIR_STRUCT = struct.Struct("<4s6H3L5H2L")
+
+LOCAL_HEADER_SIG = b"PK\x03\x04"
+LOCAL_HEADER_STRUCT = struct.Struct("<4s5H3L2H")
+
+ZIP64_EXTRA_ID = 0x0001
+UTF8_FLAG = 0x800
+
+STORED = 0
+DEFLATED = 8
+
+
+# ============================================================================
+class ZipFormatError(Exception):
+    """invalid or unsupported zip file"""
+
+
+# ============================================================================
+async def read_zip_members(
+    fetch_range: Callable[[int, int], Awaitable[bytes]], size: int
+) -> List[ZipMember]:
+    """Read list of members from central directory of zip file of given size.
+
+    fetch_range(offset, length) should return 'length' bytes at 'offset'.
+    Usually one request for the end of the file is enough, followed
+    by one more for the central directory if it does not fit in it."""
+    tail_offset = max(0, size - EOCD_MAX_SIZE - ZIP64_LOCATOR_STRUCT.size)
+    tail = await fetch_range(tail_offset, size - tail_offset)
+
+    cd_offset, cd_size, zip64_eocd_offset = find_end_of_central_dir(tail)
+
+    if zip64_eocd_offset is not None:
+        if zip64_eocd_offset >= tail_offset:
+            start = zip64_eocd_offset - tail_offset
+            zip64_eocd = tail[start : start + ZIP64_EOCD_STRUCT.size]
+        else:
+            zip64_eocd = await fetch_range(zip64_eocd_offset, ZIP64_EOCD_STRUCT.size)
+
+        cd_offset, cd_size = parse_zip64_end_of_central_dir(zip64_eocd)
+
+    if cd_offset >= tail_offset:
+        start = cd_offset - tail_offset
+        central_dir = tail[start : start + cd_size]
+    else:
+        central_dir = await fetch_range(cd_offset, cd_size)
+
+    return parse_central_dir(central_dir)
+
+
+def find_end_of_central_dir(tail: bytes):
+    """return (central dir offset, central dir size, zip64 eocd offset or None)
+    from the end of a zip file"""
+    pos = tail.rfind(EOCD_SIG)
+    if pos < 0 or pos + EOCD_STRUCT.size > len(tail):
+        raise ZipFormatError("end of central directory not found")
+
+    fields = EOCD_STRUCT.unpack_from(tail, pos)
+    cd_size = fields[5]
+    cd_offset = fields[6]
+
+    zip64_eocd_offset = None
+
+    locator_pos = pos - ZIP64_LOCATOR_STRUCT.size
+    if locator_pos >= 0 and tail[locator_pos : locator_pos + 4] == ZIP64_LOCATOR_SIG:
+        zip64_eocd_offset = ZIP64_LOCATOR_STRUCT.unpack_from(tail, locator_pos)[2]
+
+    return cd_offset, cd_size, zip64_eocd_offset
+
+
+def parse_zip64_end_of_central_dir(data: bytes):
+    """return (central dir offset, central dir size) from zip64 eocd record"""
+    if len(data) < ZIP64_EOCD_STRUCT.size or data[:4] != ZIP64_EOCD_SIG:
+        raise ZipFormatError("invalid zip64 end of central directory")
+
+    fields = ZIP64_EOCD_STRUCT.unpack_from(data)
+    return fields[9], fields[8]
+
+
+def parse_central_dir(data: bytes) -> List[ZipMember]:
+    """parse all file headers in central directory"""
+    # pylint: disable=too-many-locals
+    members = []
+    pos = 0
+
+    while pos + CENTRAL_DIR_STRUCT.size <= len(data):
+        fields = CENTRAL_DIR_STRUCT.unpack_from(data, pos)
+        if fields[0] != CENTRAL_DIR_SIG:
+            raise ZipFormatError("invalid central directory file header")
+
+        flags = fields[3]
+        method = fields[4]
+        compressed_size = fields[8]
+        size = fields[9]
+        name_len, extra_len, comment_len = fields[10:13]
+        offset = fields[16]
+
+        pos += CENTRAL_DIR_STRUCT.size
+        name_bytes = data[pos : pos + name_len]
+        pos += name_len
+        extra = data[pos : pos + extra_len]
+        pos += extra_len + comment_len
+
+        name = name_bytes.decode("utf-8" if flags & UTF8_FLAG else "cp437")
+
+        # sizes and offset stored in zip64 extra field if too large
+        zip64 = _get_zip64_extra(extra)
+        if size == 0xFFFFFFFF:
+            size = zip64.pop(0)
+        if compressed_size == 0xFFFFFFFF:
+            compressed_size = zip64.pop(0)
+        if offset == 0xFFFFFFFF:
+            offset = zip64.pop(0)
+
+        if name.endswith("/"):
+            continue
+
+        members.append(
+            ZipMember(
+                name=name,
+                offset=offset,
+                compressedSize=compressed_size,
+                size=size,
+                method=method,
+            )
+        )
+
+    return members
+
+
+def _get_zip64_extra(extra: bytes) -> List[int]:
+    pos = 0
+    while pos + 4 <= len(extra):
+        header_id, data_size = struct.unpack_from("<2H", extra, pos)
+        pos += 4
+        if header_id == ZIP64_EXTRA_ID:
+            return list(struct.unpack_from(f"<{data_size // 8}Q", extra, pos))
+
+        pos += data_size
+
+    return []
+
+
+def get_member_range(member: ZipMember) -> tuple[int, int]:
+    """return (offset, length) of range likely to include the local header
+    and all data of a member"""
+    length = (
+        LOCAL_HEADER_STRUCT.size
+        + len(member.name.encode("utf-8"))
+        + LOCAL_EXTRA_PADDING
+        + member.compressedSize
+    )
+    return member.offset, length
+
+
+def parse_local_header(data: bytes) -> Optional[int]:
+    """return size of local file header starting data,
+    or None if not enough data to determine it"""
+    if len(data) < LOCAL_HEADER_STRUCT.size:
+        return None
+
+    fields = LOCAL_HEADER_STRUCT.unpack_from(data)
+    if fields[0] != LOCAL_HEADER_SIG:
+        raise ZipFormatError("invalid local file header")
+
+    return LOCAL_HEADER_STRUCT.size + fields[9] + fields[10]
+
+
+def get_decompressor(member: ZipMember):
+    """return decompressor for member, or None if stored"""
+    if member.method == STORED:
+        return None
+
+    if member.method == DEFLATED:
+        return zlib.decompressobj(-zlib.MAX_WBITS)
+
+    raise ZipFormatError(f"unsupported compression method: {member.method}")
+
+
+# ============================================================================
+class AsyncZipReader:
+    """Read members of a remote zip file at url with range requests,
+    using a shared aiohttp session for connection reuse"""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        size: int,
+        read_ahead: int = DEFAULT_READ_AHEAD_CHUNKS,
+    ):
+        self.session = session
+        self.url = url
+        self.size = size
+        self.read_ahead = read_ahead
+
+        # offsets of member data, after local file header, by member name
+        self.data_offsets: Dict[str, int] = {}
+
+    async def fetch_range(self, offset: int, length: int) -> bytes:
+        """return 'length' bytes at 'offset'"""
+        async with self._get_range(offset, length) as resp:
+            return await resp.read()
+
+    async def get_members(self) -> List[ZipMember]:
+        """read member listing from central directory"""
+        return await read_zip_members(self.fetch_range, self.size)
+
+    async def get_data_offset(self, member: ZipMember) -> int:
+        """return offset of member data, reading local file header if needed"""
+        data_offset = self.data_offsets.get(member.name)
+        if data_offset is None:
+            header = await self.fetch_range(member.offset, LOCAL_HEADER_STRUCT.size)
+            header_size = parse_local_header(header)
+            if header_size is None:
+                raise ZipFormatError("truncated local file header")
+
+            data_offset = member.offset + header_size
+            self.data_offsets[member.name] = data_offset
+
+        return data_offset
+
+    async def iter_member_lines(
+        self, member: ZipMember, ranges: Optional[List[Tuple[int, int]]] = None
+    ) -> AsyncIterator[bytes]:
+        """Iterate over lines in member as bytes.
+
+        If ranges, a sorted list of (start, end) uncompressed offsets aligned
+        to line boundaries, is provided, only lines in those ranges are returned.
+        Stored members are read with a range request per range.
+
+        Deflated members can't be read starting mid-stream, as zlib does not
+        support resuming inflate at an arbitrary bit offset, so they are still
+        fetched and inflated from the start up to the end of the last range.
+        Only reading past the last range, and members with no ranges,
+        is avoided for them"""
+        # pylint: disable=too-many-locals
+        if ranges is not None and member.method == STORED:
+            data_offset = await self.get_data_offset(member)
+            for start, end in ranges:
+                async with self._get_range(data_offset + start, end - start) as resp:
+                    async with aclosing(self._read_lines(resp, end - start)) as lines:
+                        async for line in lines:
+                            yield line
+            return
+
+        decompressor = get_decompressor(member)
+        offset, length = get_member_range(member)
+
+        async with self._get_range(offset, length) as resp:
+            header = await resp.content.readexactly(LOCAL_HEADER_STRUCT.size)
+            header_size = parse_local_header(header)
+            if header_size is None or header_size + member.compressedSize > length:
+                raise ZipFormatError("invalid local file header size")
+
+            await resp.content.readexactly(header_size - len(header))
+            self.data_offsets[member.name] = member.offset + header_size
+
+            pos = 0
+            range_inx = 0
+
+            async with aclosing(
+                self._read_lines(resp, member.compressedSize, decompressor)
+            ) as lines:
+                async for line in lines:
+                    line_pos = pos
+                    pos += len(line)
+
+                    if ranges is None:
+                        yield line
+                        continue
+
+                    while range_inx < len(ranges) and line_pos >= ranges[range_inx][1]:
+                        range_inx += 1
+
+                    if range_inx == len(ranges):
+                        break
+
+                    if line_pos >= ranges[range_inx][0]:
+                        yield line
+
+    def _get_range(self, offset: int, length: int):
+        return self.session.get(
+            self.url,
+            headers={"Range": f"bytes={offset}-{offset + length - 1}"},
+            raise_for_status=True,
+        )
+
+    async def _read_lines(
+        self, resp: aiohttp.ClientResponse, length: int, decompressor=None
+    ) -> AsyncGenerator[bytes, None]:
+        """read 'length' bytes from response, decompressing if needed,
+        and iterate over lines. Up to 'read_ahead' chunks are fetched
+        ahead of the consumer"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.read_ahead)
+
+        async def read_chunks():
+            try:
+                remaining = length
+                while remaining > 0:
+                    chunk = await resp.content.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise ZipFormatError("truncated zip member")
+
+                    remaining -= len(chunk)
+                    await queue.put(chunk)
+
+                await queue.put(None)
+
+            # pylint: disable=broad-exception-caught
+            except Exception as exc:
+                await queue.put(exc)
+
+        read_task = asyncio.create_task(read_chunks())
+
+        try:
+            buff = b""
+
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+
+                if isinstance(chunk, Exception):
+                    raise chunk
+
+                if decompressor:
+                    chunk = decompressor.decompress(chunk)
+
+                lines = (buff + chunk).split(b"\n")
+                buff = lines.pop()
+                for line in lines:
+                    yield line + b"\n"
+
+            if decompressor:
+                buff += decompressor.flush()
+
+            for line in buff.splitlines(keepends=True):
+                yield line
+
+        finally:
+            read_task.cancel()
+            await asyncio.gather(read_task, return_exceptions=True)
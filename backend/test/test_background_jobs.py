@@ -0,0 +1,64 @@
+"""background job tests"""
+
+from datetime import datetime
+from uuid import uuid4
+
+from btrixcloud.background_jobs import get_job_remaining_crawl_ids
+from btrixcloud.models import DeleteCrawlsJob, ReAddPagesJob
+
+
+def test_re_add_pages_job_remaining_crawl_ids():
+    # attempt interrupted after one crawl completed and one failed,
+    # remaining crawls were never attempted
+    job = ReAddPagesJob(
+        id="readd-pages-test",
+        oid=uuid4(),
+        started=datetime.now(),
+        crawl_ids=["crawl-1", "crawl-2", "crawl-3", "crawl-4"],
+        crawls_total=4,
+        completed_crawl_ids=["crawl-1"],
+        failed_crawl_ids=["crawl-2"],
+    )
+
+    assert get_job_remaining_crawl_ids(job) == ["crawl-2", "crawl-3", "crawl-4"]
+
+    job.completed_crawl_ids = job.crawl_ids
+    job.failed_crawl_ids = []
+    assert get_job_remaining_crawl_ids(job) == []
+
+
+def test_re_add_pages_job_remaining_crawl_ids_without_crawl_list():
+    # jobs created before full list of crawls was stored
+    job = ReAddPagesJob(
+        id="readd-pages-test",
+        oid=uuid4(),
+        started=datetime.now(),
+        crawls_total=3,
+        completed_crawl_ids=["crawl-1"],
+        failed_crawl_ids=["crawl-2", "crawl-3"],
+    )
+
+    assert get_job_remaining_crawl_ids(job) == ["crawl-2", "crawl-3"]
+
+
+def test_delete_crawls_job_remaining_crawl_ids():
+    crawl_ids = [f"crawl-{inx}" for inx in range(250)]
+
+    # attempt interrupted after first batch was deleted, with one failure
+    job = DeleteCrawlsJob(
+        id="delete-crawls-test",
+        oid=uuid4(),
+        started=datetime.now(),
+        crawl_ids=crawl_ids,
+        crawls_total=len(crawl_ids),
+        completed_crawl_ids=crawl_ids[:99],
+        failed_crawl_ids=crawl_ids[99:100],
+    )
+
+    # failed crawl and all crawls in batches never attempted remain
+    assert get_job_remaining_crawl_ids(job) == crawl_ids[99:]
+
+    # retry deleted all but one crawl
+    job.completed_crawl_ids = crawl_ids[:99] + crawl_ids[100:]
+    job.failed_crawl_ids = crawl_ids[99:100]
+    assert get_job_remaining_crawl_ids(job) == ["crawl-99"]
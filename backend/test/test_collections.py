@@ -405,6 +405,46 @@ def test_download_streaming_collection(crawler_auth_headers, default_org_id):
                 assert zip_file.getinfo(filename).compress_type == ZIP_STORED
 
 
+def test_download_streaming_collection_range(crawler_auth_headers, default_org_id):
+    url = f"{API_PREFIX}/orgs/{default_org_id}/collections/{_coll_id}/download"
+
+    r = requests.get(url, headers=crawler_auth_headers)
+    assert r.status_code == 200
+    assert r.headers["Accept-Ranges"] == "bytes"
+    assert int(r.headers["Content-Length"]) == len(r.content)
+    full = r.content
+    etag = r.headers["ETag"]
+
+    # resume from middle of download
+    start = len(full) // 3
+    r = requests.get(
+        url,
+        headers={**crawler_auth_headers, "Range": f"bytes={start}-", "If-Range": etag},
+    )
+    assert r.status_code == 206
+    assert r.headers["Content-Range"] == f"bytes {start}-{len(full) - 1}/{len(full)}"
+    assert r.content == full[start:]
+
+    # last bytes, including central directory
+    r = requests.get(url, headers={**crawler_auth_headers, "Range": "bytes=-100"})
+    assert r.status_code == 206
+    assert r.content == full[-100:]
+
+    # changed download is sent in full
+    r = requests.get(
+        url,
+        headers={**crawler_auth_headers, "Range": "bytes=0-9", "If-Range": '"old"'},
+    )
+    assert r.status_code == 200
+    assert r.content == full
+
+    r = requests.get(
+        url, headers={**crawler_auth_headers, "Range": f"bytes={len(full)}-"}
+    )
+    assert r.status_code == 416
+    assert r.json()["detail"] == "range_not_satisfiable"
+
+
 def test_list_collections(
     crawler_auth_headers, default_org_id, crawler_crawl_id, admin_crawl_id
 ):
@@ -0,0 +1,199 @@
+"""crawl operator redis draining tests"""
+
+import asyncio
+import json
+from uuid import uuid4
+
+from btrixcloud.models import StorageRef
+from btrixcloud.operator.crawls import CrawlOperator
+from btrixcloud.operator.models import CrawlSpec, CrawlStatus
+
+
+CRAWL_ID = "test-crawl"
+
+
+class InMemoryRedis:
+    """minimal async redis with only the commands used when draining"""
+
+    def __init__(self, lists, hashes):
+        self.lists = lists
+        self.hashes = hashes
+        self.values = {}
+
+    async def lrange(self, key, start, end):
+        return self.lists.get(key, [])[start : end + 1]
+
+    async def ltrim(self, key, start, _):
+        self.lists[key] = self.lists.get(key, [])[start:]
+
+    async def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value):
+        self.values[key] = value
+
+    async def incr(self, key):
+        self.values[key] = int(self.values.get(key) or 0) + 1
+
+    async def hgetall(self, key):
+        return self.hashes.get(key, {})
+
+    async def scard(self, _):
+        return 0
+
+
+class RecordingOps:
+    """records items added to db by operator"""
+
+    def __init__(self):
+        self.pages = []
+        self.errors = []
+
+    async def add_pages_to_db(self, pages, *_):
+        self.pages.extend(pages)
+
+    async def add_crawl_errors(self, _, __, errors):
+        self.errors.extend(errors)
+
+    async def add_live_log_lines(self, *_):
+        pass
+
+    async def update_running_crawl_stats(self, *_):
+        pass
+
+
+def _init_operator(max_per_sync, batch_size):
+    op = CrawlOperator.__new__(CrawlOperator)
+    op.done_key = "crawls-done"
+    op.pages_key = "pages"
+    op.errors_key = "e"
+    op.fast_retry_secs = 5
+    op.redis_drain_batch_size = batch_size
+    op.redis_drain_max_per_sync = max_per_sync
+
+    recorder = RecordingOps()
+    op.crawl_ops = recorder
+    op.page_ops = recorder
+
+    op.files = []
+    op.finished = []
+    op.fail_files = set()
+
+    async def add_file_to_crawl(msg, *_):
+        if msg["filename"] in op.fail_files:
+            op.fail_files.remove(msg["filename"])
+            raise ConnectionError("db unavailable")
+
+        op.files.append(msg)
+
+    async def is_crawl_stopping(*_):
+        return None
+
+    async def mark_finished(_, __, state, *___):
+        op.finished.append(state)
+
+    op.add_file_to_crawl = add_file_to_crawl
+    op.is_crawl_stopping = is_crawl_stopping
+    op.mark_finished = mark_finished
+    return op, recorder
+
+
+def _init_crawl():
+    return CrawlSpec(
+        id=CRAWL_ID,
+        cid=uuid4(),
+        oid=uuid4(),
+        storage=StorageRef(name="default"),
+        started="",
+        crawler_channel="default",
+    )
+
+
+def test_crawl_not_finished_until_redis_lists_drained():
+    op, recorder = _init_operator(max_per_sync=3, batch_size=2)
+
+    num_items = 10
+    redis = InMemoryRedis(
+        lists={
+            "crawls-done": [
+                json.dumps({"filename": f"file-{i}.wacz"}) for i in range(num_items)
+            ],
+            f"{CRAWL_ID}:pages": [
+                json.dumps({"url": f"https://example.com/{i}"})
+                for i in range(num_items)
+            ],
+            f"{CRAWL_ID}:e": [f"error {i}" for i in range(num_items)],
+        },
+        # all crawler pods already done
+        hashes={f"{CRAWL_ID}:status": {f"crawl-{CRAWL_ID}-0": "done"}},
+    )
+
+    crawl = _init_crawl()
+    status = CrawlStatus(state="running")
+
+    syncs = 0
+    while not op.finished:
+        status.resync_after = None
+        status = asyncio.run(
+            op.drain_and_update_crawl_state(redis, crawl, status, {}, 1)
+        )
+        syncs += 1
+
+        if not op.finished:
+            # not finished while items remain, resync quickly to drain rest
+            assert status.resync_after == op.fast_retry_secs
+
+        assert syncs <= num_items
+
+    # budget smaller than number of items, so several syncs needed
+    assert syncs == 4
+    assert op.finished == ["complete"]
+
+    assert len(op.files) == num_items
+    assert len(recorder.pages) == num_items
+    assert len(recorder.errors) == num_items
+    assert not any(redis.lists.values())
+
+
+def test_failed_entries_kept_in_redis_for_next_sync():
+    op, recorder = _init_operator(max_per_sync=100, batch_size=10)
+    op.fail_files = {"file-2.wacz"}
+
+    redis = InMemoryRedis(
+        lists={
+            "crawls-done": [
+                json.dumps({"filename": f"file-{i}.wacz"}) for i in range(5)
+            ],
+            f"{CRAWL_ID}:pages": [
+                json.dumps({"url": "https://example.com/1"}),
+                "not json",
+                json.dumps({"url": "https://example.com/2"}),
+            ],
+        },
+        hashes={f"{CRAWL_ID}:status": {f"crawl-{CRAWL_ID}-0": "done"}},
+    )
+
+    crawl = _init_crawl()
+    status = CrawlStatus(state="running")
+
+    status = asyncio.run(op.drain_and_update_crawl_state(redis, crawl, status, {}, 1))
+
+    # files after failed one are not lost, but kept for next sync
+    assert not op.finished
+    assert status.resync_after == op.fast_retry_secs
+    assert [msg["filename"] for msg in op.files] == ["file-0.wacz", "file-1.wacz"]
+    assert len(redis.lists["crawls-done"]) == 3
+
+    # invalid page entry skipped without dropping rest of batch
+    assert len(recorder.pages) == 2
+    assert not redis.lists[f"{CRAWL_ID}:pages"]
+
+    status.resync_after = None
+    status = asyncio.run(op.drain_and_update_crawl_state(redis, crawl, status, {}, 1))
+
+    assert op.finished == ["complete"]
+    assert [msg["filename"] for msg in op.files] == [f"file-{i}.wacz" for i in range(5)]
+    assert not any(redis.lists.values())
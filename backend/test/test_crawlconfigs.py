@@ -478,3 +478,53 @@ def test_get_crawler_channels(crawler_auth_headers, default_org_id):
     for crawler_channel in crawler_channels:
         assert crawler_channel["id"]
         assert crawler_channel["image"]
+
+
+def test_list_workflows_next_token(crawler_auth_headers, default_org_id):
+    r = requests.get(
+        f"{API_PREFIX}/orgs/{default_org_id}/crawlconfigs",
+        headers=crawler_auth_headers,
+    )
+    assert r.status_code == 200
+    total = r.json()["total"]
+    assert total > 1
+
+    ids = []
+    next_token = ""
+    pages = 0
+
+    while next_token is not None:
+        r = requests.get(
+            f"{API_PREFIX}/orgs/{default_org_id}/crawlconfigs?pageSize=1&next={next_token}",
+            headers=crawler_auth_headers,
+        )
+        assert r.status_code == 200
+        data = r.json()
+        assert data["total"] is None
+        assert len(data["items"]) <= 1
+        ids.extend([item["id"] for item in data["items"]])
+        next_token = data["next"]
+
+        pages += 1
+        assert pages <= total + 1
+
+    assert len(ids) == total
+    assert len(set(ids)) == total
+
+    r = requests.get(
+        f"{API_PREFIX}/orgs/{default_org_id}/crawlconfigs?pageSize=1&next=&includeTotal=true",
+        headers=crawler_auth_headers,
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["total"] == total
+    assert data["next"]
+
+
+def test_list_workflows_invalid_next_token(crawler_auth_headers, default_org_id):
+    r = requests.get(
+        f"{API_PREFIX}/orgs/{default_org_id}/crawlconfigs?next=invalid!",
+        headers=crawler_auth_headers,
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "invalid_next_token"
@@ -0,0 +1,122 @@
+"""crawl and qa run file deletion tests, with some files failing to delete"""
+
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from btrixcloud.basecrawls import BaseCrawlOps
+from btrixcloud.models import BaseCrawl, CrawlFile, QARun, StorageRef
+
+
+CRAWL_ID = "test-crawl"
+
+
+class Recorder:
+    """records calls to any async method"""
+
+    def __init__(self, results=None):
+        self.calls = []
+        self.results = results or {}
+
+    def __getattr__(self, name):
+        async def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self.results.get(name)
+
+        return record
+
+
+def _init_ops(errors):
+    ops = BaseCrawlOps.__new__(BaseCrawlOps)
+    ops.storage_ops = Recorder({"delete_crawl_file_objects": errors})
+    ops.background_job_ops = Recorder()
+    ops.crawls = Recorder()
+    ops.orgs = Recorder()
+    ops.crawl_configs = Recorder()
+    return ops
+
+
+def _init_files(prefix, count):
+    return [
+        CrawlFile(
+            filename=f"{prefix}-{inx}.wacz",
+            hash="",
+            size=100,
+            storage=StorageRef(name="default"),
+        )
+        for inx in range(count)
+    ]
+
+
+def _init_org():
+    org = Recorder()
+    org.id = uuid4()
+    return org
+
+
+def test_partial_crawl_file_deletion_updates_workflow():
+    files = _init_files("crawl", 3)
+    ops = _init_ops({files[1].filename: "AccessDenied"})
+    org = _init_org()
+
+    crawl = BaseCrawl(
+        id=CRAWL_ID,
+        type="crawl",
+        oid=org.id,
+        cid=uuid4(),
+        userid=uuid4(),
+        started=datetime.now(),
+        state="complete",
+        files=files,
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        # pylint: disable=protected-access
+        asyncio.run(ops._delete_crawl_files(crawl, org))
+
+    assert exc.value.detail == "file_deletion_error"
+
+    # only the two deleted files are removed and subtracted
+    name, args, _ = ops.crawls.calls[0]
+    assert name == "find_one_and_update"
+    assert args[1]["$inc"] == {"fileCount": -2, "fileSize": -200}
+
+    assert ops.orgs.calls == [("inc_org_bytes_stored", (org.id, -200, "crawl"), {})]
+    assert ops.crawl_configs.calls == [
+        ("stats_recompute_last", (crawl.cid, -200, 0), {})
+    ]
+
+
+def test_partial_qa_file_deletion_pulls_deleted_files():
+    qa_runs = {
+        qa_run_id: QARun(
+            id=qa_run_id,
+            userid=uuid4(),
+            started=datetime.now(),
+            state="complete",
+            files=_init_files(qa_run_id, 2),
+        )
+        for qa_run_id in ("qa-1", "qa-2", "qa-3")
+    }
+
+    # qa-2 files partially deleted, qa-3 files not deleted at all
+    failed = [qa_runs["qa-2"].files[0], *qa_runs["qa-3"].files]
+    ops = _init_ops({file_.filename: "AccessDenied" for file_ in failed})
+    org = _init_org()
+
+    with pytest.raises(HTTPException) as exc:
+        # pylint: disable=protected-access
+        asyncio.run(ops._delete_qa_run_files(CRAWL_ID, qa_runs, org))
+
+    assert exc.value.detail == "file_deletion_error"
+
+    name, args, _ = ops.crawls.calls[0]
+    assert name == "find_one_and_update"
+    assert args[0] == {"_id": CRAWL_ID, "oid": org.id}
+    assert set(args[1]["$pull"]) == {"qaFinished.qa-1.files", "qaFinished.qa-2.files"}
+    assert sorted(
+        args[1]["$pull"]["qaFinished.qa-2.files"]["filename"]["$nin"]
+    ) == sorted(file_.filename for file_ in failed)
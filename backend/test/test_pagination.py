@@ -0,0 +1,45 @@
+"""pagination tests"""
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from btrixcloud.pagination import (
+    decode_next_token,
+    encode_next_token,
+    keyset_match,
+)
+
+
+def test_next_token_round_trip():
+    values = [datetime(2024, 3, 1, 12, 30, 5), uuid4(), "https://example.com/", 5, None]
+    assert decode_next_token(encode_next_token(values)) == values
+
+
+@pytest.mark.parametrize("token", ["invalid!", "e30=", "bm90IGpzb24="])
+def test_invalid_next_token(token):
+    with pytest.raises(HTTPException) as exc:
+        keyset_match([("finished", -1), ("_id", -1)], token)
+
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "invalid_next_token"
+
+
+def test_keyset_match():
+    token = encode_next_token([10, "abc"])
+    assert keyset_match([("fileSize", -1), ("_id", -1)], token) == {
+        "$or": [
+            {"$or": [{"fileSize": {"$lt": 10}}, {"fileSize": None}]},
+            {"fileSize": 10, "$or": [{"_id": {"$lt": "abc"}}, {"_id": None}]},
+        ]
+    }
+
+    token = encode_next_token([None, "abc"])
+    assert keyset_match([("name", 1), ("_id", 1)], token) == {
+        "$or": [
+            {"name": {"$ne": None}},
+            {"name": None, "_id": {"$gt": "abc"}},
+        ]
+    }
@@ -0,0 +1,139 @@
+"""QA run score histogram tests"""
+
+import asyncio
+from uuid import uuid4
+
+from btrixcloud.models import PageQACompare
+from btrixcloud.pages import PageOps, get_qa_histogram_bucket
+
+
+CRAWL_ID = "test-crawl"
+QA_RUN_ID = "test-qa-run"
+OID = uuid4()
+
+
+class UpsertResult:
+    """bulk write result with upserted ids only"""
+
+    def __init__(self, upserted_ids):
+        self.upserted_ids = upserted_ids
+
+
+class InMemoryCollection:
+    """minimal async mongo collection with only the operations used
+    when adding QA run data for pages"""
+
+    def __init__(self, docs=None):
+        self.docs = docs or []
+
+    @staticmethod
+    def _matches(doc, query):
+        for key, value in query.items():
+            if isinstance(value, dict) and "$in" in value:
+                if doc.get(key) not in value["$in"]:
+                    return False
+            elif isinstance(value, dict) and "$ne" in value:
+                if doc.get(key) == value["$ne"]:
+                    return False
+            elif doc.get(key) != value:
+                return False
+        return True
+
+    async def _iter(self, query):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                yield dict(doc)
+
+    def find(self, query, projection=None):
+        # pylint: disable=unused-argument
+        return self._iter(query)
+
+    async def find_one(self, query, projection=None):
+        # pylint: disable=unused-argument
+        async for doc in self._iter(query):
+            return doc
+        return None
+
+    async def count_documents(self, query):
+        return len([doc for doc in self.docs if self._matches(doc, query)])
+
+    async def insert_one(self, doc):
+        self.docs.append(doc)
+
+    async def update_one(self, query, update, upsert=False):
+        # pylint: disable=unused-argument
+        doc = await self._find_doc(query)
+        for path, count in update["$inc"].items():
+            parent = doc
+            *keys, last = path.split(".")
+            for key in keys:
+                parent = parent.setdefault(key, {})
+            parent[last] = parent.get(last, 0) + count
+
+    async def _find_doc(self, query):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                return doc
+        return None
+
+    async def bulk_write(self, updates, ordered=True):
+        # pylint: disable=unused-argument
+        upserted_ids = {}
+        for inx, update in enumerate(updates):
+            # pylint: disable=protected-access
+            query, doc_update = update._filter, update._doc
+            doc = await self._find_doc(query)
+            if not doc:
+                doc = {**query, **doc_update["$setOnInsert"]}
+                self.docs.append(doc)
+                upserted_ids[inx] = doc["_id"]
+            doc.update(doc_update["$set"])
+
+        return UpsertResult(upserted_ids)
+
+
+def _init_page_ops(page_ids):
+    ops = PageOps.__new__(PageOps)
+    ops.pages = InMemoryCollection(
+        [{"_id": page_id, "crawl_id": CRAWL_ID, "oid": OID} for page_id in page_ids]
+    )
+    ops.page_qa = InMemoryCollection()
+    ops.qa_histograms = InMemoryCollection()
+    return ops
+
+
+def _add_qa_run_for_page(ops, page_id, score):
+    compare = PageQACompare(screenshotMatch=score, textMatch=score)
+    return asyncio.run(ops.add_qa_run_for_page(page_id, OID, QA_RUN_ID, compare))
+
+
+def _get_histogram(ops, key):
+    histogram = asyncio.run(ops.get_qa_run_histogram(CRAWL_ID, QA_RUN_ID))
+    return {bucket: count for bucket, count in histogram[key].items() if count}
+
+
+def test_resent_page_moves_histogram_bucket():
+    page_ids = [uuid4(), uuid4()]
+    ops = _init_page_ops(page_ids)
+
+    _add_qa_run_for_page(ops, page_ids[0], 0.5)
+    _add_qa_run_for_page(ops, page_ids[1], 0.5)
+
+    low = get_qa_histogram_bucket(0.5)
+    high = get_qa_histogram_bucket(0.9)
+
+    for key in ("screenshotMatch", "textMatch"):
+        assert _get_histogram(ops, key) == {low: 2}
+
+    # page re-sent with changed scores, replacing existing entry
+    _add_qa_run_for_page(ops, page_ids[0], 0.9)
+
+    assert len(ops.page_qa.docs) == 2
+    for key in ("screenshotMatch", "textMatch"):
+        assert _get_histogram(ops, key) == {low: 1, high: 1}
+
+    # re-sending unchanged scores leaves counts as they are
+    _add_qa_run_for_page(ops, page_ids[0], 0.9)
+
+    for key in ("screenshotMatch", "textMatch"):
+        assert _get_histogram(ops, key) == {low: 1, high: 1}
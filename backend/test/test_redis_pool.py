@@ -0,0 +1,53 @@
+"""redis client pool tests"""
+
+import asyncio
+
+from btrixcloud.redis_pool import RedisClientPool
+
+
+URL_1 = "redis://redis-crawl-1/0"
+URL_2 = "redis://redis-crawl-2/0"
+
+
+def test_held_client_not_evicted():
+    async def run():
+        pool = RedisClientPool()
+        pool.idle_secs = 0
+
+        async with pool.hold(URL_1) as client:
+            await asyncio.sleep(0.01)
+
+            # unrelated get evicts idle clients, but not held client
+            await pool.get(URL_2)
+            assert pool.clients[URL_1][0] is client
+            assert pool.evictions == 0
+
+        await asyncio.sleep(0.01)
+
+        # once released and idle, client is evicted
+        await pool.get(URL_2)
+        assert URL_1 not in pool.clients
+        assert URL_2 in pool.clients
+
+        await pool.close_all()
+        assert not pool.clients
+
+    asyncio.run(run())
+
+
+def test_stats_logged_periodically(capsys):
+    async def run():
+        pool = RedisClientPool()
+        pool.stats_log_secs = 0
+
+        await pool.get(URL_1)
+        await pool.get(URL_1)
+
+        await pool.close_all()
+
+    asyncio.run(run())
+
+    lines = [line for line in capsys.readouterr().out.split("\n") if line]
+    assert lines[-1] == (
+        "Redis client pool: {'size': 1, 'hits': 1, 'misses': 1, 'evictions': 0}"
+    )
@@ -142,7 +142,7 @@ def test_crawls_exclude_errors(admin_auth_headers, default_org_id, admin_crawl_i
     )
     assert r.status_code == 200
     data = r.json()
-    assert data.get("errors") == []
+    assert "errors" not in data
 
     # replay.json endpoint
     r = requests.get(
@@ -151,7 +151,7 @@ def test_crawls_exclude_errors(admin_auth_headers, default_org_id, admin_crawl_i
     )
     assert r.status_code == 200
     data = r.json()
-    assert data.get("errors") == []
+    assert "errors" not in data
 
     # List endpoint
     r = requests.get(
@@ -161,7 +161,7 @@ def test_crawls_exclude_errors(admin_auth_headers, default_org_id, admin_crawl_i
     assert r.status_code == 200
     crawls = r.json()["items"]
     for crawl in crawls:
-        assert data.get("errors") == []
+        assert "errors" not in crawl
 
 
 def test_crawls_exclude_full_seeds(admin_auth_headers, default_org_id, admin_crawl_id):
@@ -242,6 +242,80 @@ def test_verify_wacz():
     assert len(pages.strip().split("\n")) == 4
 
 
+def test_download_crawl_as_single_wacz_range(
+    admin_auth_headers, default_org_id, admin_crawl_id
+):
+    url = f"{API_PREFIX}/orgs/{default_org_id}/all-crawls/{admin_crawl_id}/download"
+
+    r = requests.get(url, headers=admin_auth_headers)
+    assert r.status_code == 200
+    assert r.headers["Accept-Ranges"] == "bytes"
+    assert int(r.headers["Content-Length"]) == len(r.content)
+    full = r.content
+    etag = r.headers["ETag"]
+
+    with zipfile.ZipFile(io.BytesIO(full)) as zip_file:
+        names = zip_file.namelist()
+        assert "datapackage.json" in names
+        assert any(name.endswith(".wacz") for name in names)
+
+    # resume from middle of download
+    start = len(full) // 3
+    r = requests.get(
+        url,
+        headers={**admin_auth_headers, "Range": f"bytes={start}-", "If-Range": etag},
+    )
+    assert r.status_code == 206
+    assert r.headers["Content-Range"] == f"bytes {start}-{len(full) - 1}/{len(full)}"
+    assert r.headers["ETag"] == etag
+    assert r.content == full[start:]
+
+    # changed download is sent in full
+    r = requests.get(
+        url,
+        headers={**admin_auth_headers, "Range": "bytes=0-9", "If-Range": '"old"'},
+    )
+    assert r.status_code == 200
+    assert r.content == full
+
+
+def test_crawl_log_counts_and_filter(
+    admin_auth_headers, default_org_id, admin_crawl_id
+):
+    # log index is built in the background after crawl finishes
+    max_attempts = 30
+    attempts = 1
+    while attempts <= max_attempts:
+        r = requests.get(
+            f"{API_PREFIX}/orgs/{default_org_id}/crawls/{admin_crawl_id}/logs/counts",
+            headers=admin_auth_headers,
+        )
+        if r.status_code == 200:
+            break
+        assert r.json()["detail"] == "log_index_not_found"
+        time.sleep(2)
+        attempts += 1
+
+    assert r.status_code == 200
+    counts = r.json()
+    assert counts["total"] > 0
+    assert sum(counts["logLevels"].values()) == counts["total"]
+    assert sum(counts["contexts"].values()) == counts["total"]
+
+    log_level = list(counts["logLevels"].keys())[0]
+
+    r = requests.get(
+        f"{API_PREFIX}/orgs/{default_org_id}/crawls/{admin_crawl_id}/logs?logLevel={log_level}",
+        headers=admin_auth_headers,
+    )
+    assert r.status_code == 200
+
+    lines = [line for line in r.text.split("\n") if line]
+    assert len(lines) == counts["logLevels"][log_level]
+    for line in lines:
+        assert f'"logLevel": "{log_level}"' in line
+
+
 def test_update_crawl(
     admin_auth_headers,
     default_org_id,
@@ -661,10 +735,28 @@ def test_re_add_crawl_pages(crawler_auth_headers, default_org_id, crawler_crawl_
         headers=crawler_auth_headers,
     )
     assert r.status_code == 200
-    assert r.json()["started"]
+    data = r.json()
+    assert data["started"]
+    job_id = data["id"]
+    assert job_id
 
     time.sleep(10)
 
+    # Check progress is tracked in background job
+    r = requests.get(
+        f"{API_PREFIX}/orgs/{default_org_id}/jobs/{job_id}",
+        headers=crawler_auth_headers,
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["type"] == "readd-pages"
+    assert data["crawl_id"] == crawler_crawl_id
+    assert data["crawls_total"] == 1
+    assert data["completed_crawl_ids"] == [crawler_crawl_id]
+    assert data["failed_crawl_ids"] == []
+    assert data["success"]
+    assert data["finished"]
+
     r = requests.get(
         f"{API_PREFIX}/orgs/{default_org_id}/crawls/{crawler_crawl_id}/pages",
         headers=crawler_auth_headers,
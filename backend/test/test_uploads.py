@@ -203,7 +203,7 @@ def test_get_upload_replay_json(
     assert data["resources"][0]["path"]
     assert data["resources"][0]["size"]
     assert data["resources"][0]["hash"]
-    assert data["errors"] == []
+    assert "errors" not in data
     assert "files" not in data
 
 
@@ -226,7 +226,7 @@ def test_get_upload_replay_json_admin(
     assert data["resources"][0]["path"]
     assert data["resources"][0]["size"]
     assert data["resources"][0]["hash"]
-    assert data["errors"] == []
+    assert "errors" not in data
     assert "files" not in data
 
 
@@ -812,7 +812,7 @@ def test_get_upload_replay_json_from_all_crawls(
     assert data["resources"][0]["path"]
     assert data["resources"][0]["size"]
     assert data["resources"][0]["hash"]
-    assert data["errors"] == []
+    assert "errors" not in data
     assert "files" not in data
 
 
@@ -833,7 +833,7 @@ def test_get_upload_replay_json_admin_from_all_crawls(
     assert data["resources"][0]["path"]
     assert data["resources"][0]["size"]
     assert data["resources"][0]["hash"]
-    assert data["errors"] == []
+    assert "errors" not in data
     assert "files" not in data
 
 
@@ -937,6 +937,9 @@ def test_delete_form_upload_and_crawls_from_all_crawls(
     org_bytes = data["storageUsedBytes"]
     org_crawl_bytes = data["storageUsedCrawls"]
     org_upload_bytes = data["storageUsedUploads"]
+    org_item_count = data["archivedItemCount"]
+    org_crawl_count = data["crawlCount"]
+    org_upload_count = data["uploadCount"]
 
     # Get workflow and crawl sizes
     r = requests.get(
@@ -977,6 +980,15 @@ def test_delete_form_upload_and_crawls_from_all_crawls(
     assert r.status_code == 403
     assert r.json()["detail"] == "not_allowed"
 
+    # Verify nothing is deleted if any item is not found
+    r = requests.post(
+        f"{API_PREFIX}/orgs/{default_org_id}/all-crawls/delete",
+        headers=admin_auth_headers,
+        json={"crawl_ids": crawls_to_delete + ["nonexistent"]},
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"] == "crawl_not_found"
+
     # Delete mixed type archived items
     r = requests.post(
         f"{API_PREFIX}/orgs/{default_org_id}/all-crawls/delete",
@@ -1007,6 +1019,15 @@ def test_delete_form_upload_and_crawls_from_all_crawls(
         if data["storageUsedUploads"] != org_upload_bytes - upload_size:
             all_good = False
 
+        if data["archivedItemCount"] != org_item_count - 3:
+            all_good = False
+
+        if data["crawlCount"] != org_crawl_count - 2:
+            all_good = False
+
+        if data["uploadCount"] != org_upload_count - 1:
+            all_good = False
+
         if all_good:
             break
 
@@ -1030,3 +1051,81 @@ def test_delete_form_upload_and_crawls_from_all_crawls(
 
         time.sleep(5)
         count += 1
+
+
+def test_delete_uploads_in_background_job(
+    admin_auth_headers, crawler_auth_headers, default_org_id
+):
+    with open(os.path.join(curr_dir, "data", "example.wacz"), "rb") as fh:
+        r = requests.put(
+            f"{API_PREFIX}/orgs/{default_org_id}/uploads/stream?filename=test.wacz&name=Delete%20Job%20Upload",
+            headers=admin_auth_headers,
+            data=read_in_chunks(fh),
+        )
+
+    assert r.status_code == 200
+    upload_id = r.json()["id"]
+
+    # Verify non-admin user can't delete another's items
+    r = requests.post(
+        f"{API_PREFIX}/orgs/{default_org_id}/all-crawls/deleteJob",
+        headers=crawler_auth_headers,
+        json={"crawl_ids": [upload_id]},
+    )
+    assert r.status_code == 403
+    assert r.json()["detail"] == "not_allowed"
+
+    r = requests.post(
+        f"{API_PREFIX}/orgs/{default_org_id}/all-crawls/deleteJob",
+        headers=admin_auth_headers,
+        json={"crawl_ids": ["nonexistent"]},
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"] == "crawl_not_found"
+
+    r = requests.post(
+        f"{API_PREFIX}/orgs/{default_org_id}/all-crawls/deleteJob",
+        headers=admin_auth_headers,
+        json={"crawl_ids": []},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "nothing_to_delete"
+
+    r = requests.post(
+        f"{API_PREFIX}/orgs/{default_org_id}/all-crawls/deleteJob",
+        headers=admin_auth_headers,
+        json={"crawl_ids": [upload_id]},
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["started"]
+    job_id = data["id"]
+
+    count = 0
+    while count < MAX_ATTEMPTS:
+        r = requests.get(
+            f"{API_PREFIX}/orgs/{default_org_id}/jobs/{job_id}",
+            headers=admin_auth_headers,
+        )
+        assert r.status_code == 200
+        job = r.json()
+        if job["finished"]:
+            break
+
+        if count + 1 == MAX_ATTEMPTS:
+            assert False
+
+        time.sleep(5)
+        count += 1
+
+    assert job["type"] == "delete-crawls"
+    assert job["success"]
+    assert job["crawls_total"] == 1
+    assert job["completed_crawl_ids"] == [upload_id]
+    assert job["failed_crawl_ids"] == []
+
+    r = requests.get(
+        f"{API_PREFIX}/orgs/{default_org_id}/all-crawls/{upload_id}",
+        headers=admin_auth_headers,
+    )
+    assert r.status_code == 404
@@ -0,0 +1,57 @@
+"""zip layout tests"""
+
+import io
+import zipfile
+import zlib
+
+from btrixcloud.ziplayout import get_zip_layout, iter_segment_ranges
+
+
+FILES = {
+    "first.wacz": b"a" * 1000,
+    "empty.wacz": b"",
+    "second.wacz": b"b" * 5000,
+}
+
+
+def _get_layout():
+    members = [
+        (name, len(data), zlib.crc32(data), None) for name, data in FILES.items()
+    ]
+    members.append(("datapackage.json", 2, zlib.crc32(b"{}"), b"{}"))
+    return get_zip_layout(members)
+
+
+def _read_range(segments, start, end):
+    data = b""
+    for segment, seg_start, seg_end in iter_segment_ranges(segments, start, end):
+        if segment.data is not None:
+            data += segment.data[seg_start:seg_end]
+        else:
+            data += FILES[segment.name][seg_start:seg_end]
+
+    return data
+
+
+def test_zip_layout():
+    segments, size = _get_layout()
+    data = _read_range(segments, 0, size)
+    assert len(data) == size
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == [*FILES.keys(), "datapackage.json"]
+
+        for name, contents in FILES.items():
+            assert zip_file.getinfo(name).compress_type == zipfile.ZIP_STORED
+            assert zip_file.read(name) == contents
+
+        assert zip_file.read("datapackage.json") == b"{}"
+
+
+def test_zip_layout_ranges():
+    segments, size = _get_layout()
+    data = _read_range(segments, 0, size)
+
+    for start, end in ((0, 10), (25, 1100), (1500, size), (size - 1, size)):
+        assert _read_range(segments, start, end) == data[start:end]
@@ -0,0 +1,84 @@
+"""zip reader tests"""
+
+import asyncio
+import io
+import zipfile
+
+from btrixcloud.zipreader import (
+    get_decompressor,
+    get_member_range,
+    parse_local_header,
+    read_zip_members,
+)
+
+
+def _make_zip(num_extra_files=0):
+    buff = io.BytesIO()
+    with zipfile.ZipFile(buff, "w") as zip_file:
+        zip_file.writestr("archive/", b"")
+        zip_file.writestr(
+            "logs/crawl.log",
+            b'{"logLevel": "info"}\n' * 100,
+            compress_type=zipfile.ZIP_DEFLATED,
+        )
+        zip_file.writestr("pages/pages.jsonl", b'{"url": "https://example.com/"}\n')
+
+        for inx in range(num_extra_files):
+            zip_file.writestr(f"extra/{inx}", b"")
+
+    return buff.getvalue()
+
+
+def _read_members(data):
+    requests = []
+
+    async def fetch_range(offset, length):
+        requests.append((offset, length))
+        return data[offset : offset + length]
+
+    return asyncio.run(read_zip_members(fetch_range, len(data))), requests
+
+
+def test_read_zip_members():
+    data = _make_zip()
+    members, requests = _read_members(data)
+
+    # central directory included in single request for end of file
+    assert len(requests) == 1
+
+    zip_file = zipfile.ZipFile(io.BytesIO(data))
+
+    assert [member.name for member in members] == [
+        "logs/crawl.log",
+        "pages/pages.jsonl",
+    ]
+
+    for member in members:
+        info = zip_file.getinfo(member.name)
+        assert member.offset == info.header_offset
+        assert member.compressedSize == info.compress_size
+        assert member.size == info.file_size
+        assert member.method == info.compress_type
+
+        offset, length = get_member_range(member)
+        member_data = data[offset : offset + length]
+        header_size = parse_local_header(member_data)
+        compressed = member_data[header_size : header_size + member.compressedSize]
+
+        decompressor = get_decompressor(member)
+        if decompressor:
+            contents = decompressor.decompress(compressed) + decompressor.flush()
+        else:
+            contents = compressed
+
+        assert contents == zip_file.read(member.name)
+
+
+def test_read_zip64_members():
+    # more than 65535 entries requires zip64 end of central directory
+    data = _make_zip(num_extra_files=66000)
+    members, requests = _read_members(data)
+
+    assert len(requests) == 2
+    assert len(members) == 66002
+    assert members[-1].name == "extra/65999"
@@ -12,3 +12,25 @@ def test_get_crawl_errors(admin_auth_headers, default_org_id, error_crawl_id):
     data = r.json()
     assert data["total"] > 0
     assert data["items"]
+
+
+def test_get_crawl_errors_filter_no_match(
+    admin_auth_headers, default_org_id, error_crawl_id
+):
+    r = requests.get(
+        f"{API_PREFIX}/orgs/{default_org_id}/crawls/{error_crawl_id}/errors?logLevel=nonexistent",
+        headers=admin_auth_headers,
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["total"] == 0
+    assert data["items"] == []
+
+    r = requests.get(
+        f"{API_PREFIX}/orgs/{default_org_id}/crawls/{error_crawl_id}/errors?context=nonexistent",
+        headers=admin_auth_headers,
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["total"] == 0
+    assert data["items"] == []